@@ -0,0 +1,208 @@
+"""
+로또 645 분석 번들
+데이터 탐색 / 번호 분석 / 그리드 패턴 / 이미지 패턴 페이지가 표시하는 통계를
+데이터 버전(LottoDataLoader.data_fingerprint)마다 한 번만 계산해 묶어 둔다.
+
+모든 통계는 로더의 컬럼형 배열(draws, incidence)과 grid_geometry 테이블로 한 번에 계산하며,
+각 값은 기존 페이지/분석 클래스(GridPatternAnalysis, ImagePatternAnalysis)의 결과와 같다.
+반환값은 pickle 가능한 dict라 Streamlit st.cache_data에 그대로 저장할 수 있다.
+"""
+from collections import Counter
+import numpy as np
+import pandas as pd
+
+import grid_geometry as geo
+from cooccurrence import get_cooccurrence_index
+
+
+def _longest_consecutive(draws):
+    """회차별 최장 연속 번호 길이 (연속이 없으면 0, 웹 페이지 연속 패턴 분류 기준)"""
+    steps = np.diff(draws, axis=1) == 1
+    run = np.zeros(len(draws), dtype=np.int64)
+    longest = np.zeros(len(draws), dtype=np.int64)
+    for j in range(steps.shape[1]):
+        run = np.where(steps[:, j], run + 1, 0)
+        longest = np.maximum(longest, run)
+    return np.where(longest > 0, longest + 1, 0)
+
+
+def _exploration_stats(loader):
+    """데이터 탐색 페이지: 빈도, 구간/홀짝, 핫/콜드, 미출현 기간, 연속 패턴"""
+    draws = loader.draws
+    present = loader.incidence.astype(bool)
+    n_rounds = len(loader.df)
+    numbers = np.arange(1, 46)
+
+    # 1. 번호별 출현 빈도
+    frequency = present.sum(axis=0)
+    freq_df = pd.DataFrame({
+        '번호': numbers,
+        '출현횟수': frequency,
+        '출현율(%)': frequency / n_rounds * 100,
+    })
+
+    # 2. 구간 / 홀짝
+    low, mid, high = (int(frequency[start:start + 15].sum()) for start in (0, 15, 30))
+    section_total = low + mid + high
+    section_df = pd.DataFrame({
+        '구간': ['저구간(1-15)', '중구간(16-30)', '고구간(31-45)'],
+        '출현횟수': [low, mid, high],
+        '비율(%)': [low/section_total*100, mid/section_total*100, high/section_total*100]
+    })
+
+    odd = int(frequency[0::2].sum())
+    even = int(frequency.sum()) - odd
+    odd_even_df = pd.DataFrame({
+        '구분': ['홀수', '짝수'],
+        '출현횟수': [odd, even],
+        '비율(%)': [odd/(odd+even)*100, even/(odd+even)*100]
+    })
+
+    # 3. 최근 50회 핫/콜드 넘버 (최신 회차부터 순회한 Counter와 같은 동점 순서)
+    recent_freq = Counter(draws[:50].ravel().tolist())
+    hot_df = pd.DataFrame(recent_freq.most_common(10), columns=['번호', '출현횟수'])
+    hot_df['출현율(%)'] = (hot_df['출현횟수'] / 50 * 100).round(1)
+    cold_df = pd.DataFrame(sorted(recent_freq.items(), key=lambda x: x[1])[:10], columns=['번호', '출현횟수'])
+    cold_df['출현율(%)'] = (cold_df['출현횟수'] / 50 * 100).round(1)
+
+    # 4. 미출현 기간 (최신 회차부터 첫 출현 위치, 미출현 시 전체 회차 수)
+    absence = np.where(frequency > 0, present.argmax(axis=0), len(draws))
+    absence_df = pd.DataFrame({'번호': numbers, '미출현 기간': absence})
+
+    # 5. 연속 번호 패턴 (최장 연속 길이: 없음 / 2 / 3 / 4 이상)
+    longest = _longest_consecutive(draws)
+    cons_df = pd.DataFrame({
+        '패턴': ['연속 없음', '연속 2개', '연속 3개', '연속 4개 이상'],
+        '출현횟수': [int((longest == 0).sum()), int((longest == 2).sum()),
+                     int((longest == 3).sum()), int((longest >= 4).sum())],
+    })
+    cons_df['비율(%)'] = (cons_df['출현횟수'] / n_rounds * 100).round(2)
+
+    return {
+        'frequency': freq_df,
+        'sections': section_df,
+        'odd_even': odd_even_df,
+        'hot_numbers': hot_df,
+        'cold_numbers': cold_df,
+        'absence': absence_df,
+        'consecutive': cons_df,
+    }
+
+
+def _number_stats(loader, history_size=10):
+    """번호 분석 페이지: 번호별 최근 출현 이력, 동반 출현 번호 TOP 10"""
+    present = loader.incidence.astype(bool)
+    numbers_df = loader.numbers_df
+    index = get_cooccurrence_index(loader)
+
+    history = {}
+    companions = {}
+    for num in range(1, 46):
+        rows = np.flatnonzero(present[:, num - 1])[:history_size]
+        history[num] = pd.DataFrame({
+            '회차': numbers_df['회차'].to_numpy()[rows],
+            '일자': numbers_df['일자'].to_numpy()[rows],
+            '당첨번호': [', '.join(map(str, loader.draws[i].tolist())) for i in rows],
+        })
+        companions[num] = index.companions(num, top_n=10)
+
+    return {'appearance_history': history, 'companions': companions}
+
+
+def _grid_stats(loader):
+    """그리드 패턴 페이지: 위치별 빈도 히트맵, 구역별 분포, 대각선/같은 줄 패턴, 군집도"""
+    draws = loader.draws
+    frequency = loader.incidence.astype(bool).sum(axis=0)
+
+    # 1. 위치별 출현 빈도 (GridPatternAnalysis.analyze_position_frequency)
+    heatmap = np.zeros((geo.GRID_ROWS, geo.GRID_COLS))
+    heatmap[geo.GRID_ROW[1:], geo.GRID_COL[1:]] = frequency
+
+    # 2. 구역별 출현 횟수
+    zone_totals = np.bincount(geo.ZONE[1:], weights=frequency, minlength=len(geo.ZONE_NAMES))
+    zone_counts = {zone: int(zone_totals[i]) for i, zone in enumerate(geo.ZONE_NAMES)}
+
+    # 3. 대각선 평균 / 같은 가로줄·세로줄 3개 이상 발생 횟수
+    rows = geo.GRID_ROW[draws]
+    cols = geo.GRID_COL[draws]
+    diagonal_main = float(np.mean((rows == cols).sum(axis=1)))
+    diagonal_anti = float(np.mean((rows + cols == 6).sum(axis=1)))
+    line_counts = lambda lines: np.stack([(lines == k).sum(axis=1) for k in range(7)], axis=1)
+    horizontal = int((line_counts(rows) >= 3).sum())
+    vertical = int((line_counts(cols) >= 3).sum())
+
+    # 4. 회차별 번호 간 평균 맨해튼 거리
+    avg_distances = np.mean(geo.pairwise_distances(draws, geo.MANHATTAN_DISTANCE), axis=1)
+
+    return {
+        'grid_heatmap': heatmap,
+        'grid_zone_counts': zone_counts,
+        'grid_diagonal_avg': (diagonal_main, diagonal_anti),
+        'grid_line_totals': (horizontal, vertical),
+        'grid_avg_distances': avg_distances,
+    }
+
+
+def _image_stats(loader):
+    """이미지 패턴 페이지: 시각적 밀도, 4분면 패턴, 무게중심, 대칭 패턴"""
+    draws = loader.draws
+    round_numbers = loader.numbers_df['회차'].to_numpy()
+    rows = geo.GRID_ROW[draws]
+    cols = geo.GRID_COL[draws]
+
+    # 1. 시각적 밀도 (번호쌍 유클리드 거리 평균)
+    # 행 단위 연속 배열로 바꿔 회차별 np.mean과 같은 합산 순서 유지
+    distances = np.ascontiguousarray(geo.pairwise_distances(draws, geo.EUCLIDEAN_DISTANCE))
+    avg_distance = np.mean(distances, axis=1)
+    density_df = pd.DataFrame({'회차': round_numbers, '평균_거리': avg_distance, '밀도': 1 / avg_distance})
+
+    # 2. 4분면 분포 패턴 (최신 회차부터 처음 등장한 순서)
+    quadrants = np.stack([(geo.QUADRANT[draws] == q).sum(axis=1) for q in range(4)], axis=1)
+    quadrant_patterns = Counter('-'.join(map(str, counts)) for counts in quadrants.tolist())
+
+    # 3. 무게중심 및 이상 중심 (3, 3) 편차
+    center_row = rows.mean(axis=1)
+    center_col = cols.mean(axis=1)
+    balance_df = pd.DataFrame({
+        '회차': round_numbers,
+        '중심_row': center_row,
+        '중심_col': center_col,
+        '이상중심_편차': np.sqrt((center_row - 3) ** 2 + (center_col - 3) ** 2),
+    })
+
+    # 4. 대칭 패턴
+    lr_symmetric = np.abs((cols < 3).sum(axis=1) - (cols > 3).sum(axis=1)) <= 1
+    tb_symmetric = np.abs((rows < 3).sum(axis=1) - (rows > 3).sum(axis=1)) <= 1
+    diag_symmetric = np.abs(rows - cols).sum(axis=1) < 6
+    symmetry = {
+        '좌우_대칭': int(lr_symmetric.sum()),
+        '상하_대칭': int(tb_symmetric.sum()),
+        '대각선_대칭': int(diag_symmetric.sum()),
+        '비대칭': int((~(lr_symmetric | tb_symmetric)).sum()),
+    }
+
+    return {
+        'image_density': density_df,
+        'image_quadrant_patterns': quadrant_patterns,
+        'image_balance': balance_df,
+        'image_symmetry': symmetry,
+    }
+
+
+def build_analytics_bundle(loader):
+    """페이지 표시용 분석 통계 묶음 생성
+
+    Args:
+        loader: 당첨번호가 추출된 LottoDataLoader
+
+    Returns:
+        dict: 'data_version', 'n_rounds' 및 페이지별 통계
+            (데이터 탐색: frequency, sections, odd_even, hot_numbers, cold_numbers, absence, consecutive /
+             번호 분석: appearance_history, companions / 그리드: grid_* / 이미지: image_*)
+    """
+    bundle = {'data_version': loader.data_fingerprint(), 'n_rounds': len(loader.df)}
+    bundle.update(_exploration_stats(loader))
+    bundle.update(_number_stats(loader))
+    bundle.update(_grid_stats(loader))
+    bundle.update(_image_stats(loader))
+    return bundle
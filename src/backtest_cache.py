@@ -0,0 +1,255 @@
+"""
+로또 645 백테스팅 결과 캐시
+회차별 결과를 (가중치, 전략, 시드, 조합 수, 최적 모드, 일치 기준, 데이터 지문)의
+해시로 저장하여 가중치 시도 간/세션 간 재사용
+"""
+import hashlib
+import json
+import sqlite3
+from contextlib import contextmanager
+from datetime import datetime
+import numpy as np
+from pathlib import Path
+
+
+# 추천 알고리즘이 바뀌어 과거 결과를 재사용할 수 없을 때 올림
+CACHE_VERSION = 3
+
+
+def _hash_key(data_fingerprint, weights, strategy, seed, n_combinations, best_only, match_threshold, **scope):
+    """정규화한 캐시 입력의 sha256 (round_result_key / job_key 공용)
+
+    가중치는 반올림 없이 전체 정밀도로 반영한다 (json은 float를 왕복 가능한 repr로 기록).
+
+    Args:
+        scope: 키 범위 (round: 목표 회차 또는 rounds: 작업 전체 회차 목록)
+        (나머지 인자는 round_result_key와 동일)
+
+    Returns:
+        str: 64자리 16진수 키
+    """
+    payload = {
+        'version': CACHE_VERSION,
+        'data': data_fingerprint,
+        'weights': {key: float(value) for key, value in sorted(weights.items())},
+        'strategy': strategy,
+        'seed': seed,
+        'n_combinations': int(n_combinations),
+        'best_only': bool(best_only),
+        'match_threshold': int(match_threshold),
+        **scope,
+    }
+    canonical = json.dumps(payload, sort_keys=True, separators=(',', ':'), ensure_ascii=True)
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+
+def round_result_key(round_num, data_fingerprint, weights, strategy, seed, n_combinations,
+                     best_only, match_threshold):
+    """회차 결과의 캐시 키 (정규화한 입력의 sha256)
+
+    Args:
+        round_num: 목표 회차
+        data_fingerprint: 목표 회차까지의 누적 데이터 지문 (LottoDataLoader.cumulative_fingerprints)
+        weights: 가중치 딕셔너리
+        strategy: 추천 전략
+        seed: 랜덤 시드
+        n_combinations: 추천 조합 개수
+        best_only: 최적 조합 모드 여부
+        match_threshold: 일치 기준
+
+    Returns:
+        str: 64자리 16진수 키
+    """
+    return _hash_key(data_fingerprint, weights, strategy, seed, n_combinations, best_only, match_threshold,
+                     round=int(round_num))
+
+
+def job_key(rounds, data_fingerprint, weights, strategy, seed, n_combinations, best_only, match_threshold):
+    """백테스팅 작업 키 (회차 목록 + round_result_key와 같은 입력의 sha256)
+
+    같은 작업을 다시 실행하면 같은 키가 되어 중단된 지점의 진행 상황을 찾을 수 있다.
+
+    Args:
+        rounds: 작업 전체 회차 리스트
+        data_fingerprint: 마지막 회차까지의 누적 데이터 지문
+        (나머지 인자는 round_result_key와 동일)
+
+    Returns:
+        str: 64자리 16진수 키
+    """
+    return _hash_key(data_fingerprint, weights, strategy, seed, n_combinations, best_only, match_threshold,
+                     rounds=sorted(int(r) for r in rounds))
+
+
+@contextmanager
+def _transaction(path):
+    """SQLite 트랜잭션 (정상 종료 시 커밋, 예외 시 롤백) 후 연결 종료"""
+    conn = sqlite3.connect(path, timeout=30)
+    try:
+        with conn:
+            yield conn
+    finally:
+        conn.close()
+
+
+class BacktestResultCache:
+    """내용 주소 기반(content-addressed) 회차 결과 저장소 (SQLite, 추가 전용)
+
+    결과 1개 = 행 1개이며 키(sha256 32바이트)가 기본 키, 회차에 인덱스가 있다.
+    조합은 번호당 1바이트(uint8)로 묶어 BLOB으로 저장한다 (조합 M개 = 6M 바이트).
+    새 결과는 INSERT OR IGNORE로 추가만 하므로 쓰기 비용은 신규 행 수에 비례한다.
+
+    긴 작업은 완료된 회차를 중간중간 저장(체크포인트)하며, 작업 키별 진행 상황
+    (완료 회차 수, 마지막 완료 회차)을 같은 트랜잭션으로 기록한다 (backtest_jobs).
+    """
+
+    DB_NAME = 'backtest_results.sqlite'
+    _BATCH = 500  # IN (...) 조회 1회당 키 수
+
+    def __init__(self, cache_dir):
+        """
+        Args:
+            cache_dir: 캐시 디렉토리 경로
+        """
+        self.path = Path(cache_dir) / self.DB_NAME
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+        with self._connect() as conn:
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS round_results (
+                    key BLOB PRIMARY KEY,
+                    round INTEGER NOT NULL,
+                    predicted BLOB NOT NULL,
+                    actual BLOB NOT NULL,
+                    matches BLOB NOT NULL,
+                    max_match INTEGER NOT NULL,
+                    match_threshold INTEGER NOT NULL,
+                    has_match INTEGER NOT NULL
+                )
+            """)
+            conn.execute('CREATE INDEX IF NOT EXISTS idx_round_results_round ON round_results(round)')
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS backtest_jobs (
+                    job_key TEXT PRIMARY KEY,
+                    total INTEGER NOT NULL,
+                    completed INTEGER NOT NULL,
+                    last_round INTEGER,
+                    finished INTEGER NOT NULL,
+                    updated_at TEXT NOT NULL
+                )
+            """)
+
+    def _connect(self):
+        """호출마다 새 연결 (스레드/프로세스 간 공유하지 않음)"""
+        return _transaction(self.path)
+
+    @staticmethod
+    def _pack(result):
+        threshold = next(int(k[4:-4]) for k in result if k.startswith('has_') and k.endswith('plus'))
+        return (
+            np.asarray(result['predicted'], dtype=np.uint8).tobytes(),
+            np.asarray(result['actual'], dtype=np.uint8).tobytes(),
+            np.asarray(result['matches'], dtype=np.uint8).tobytes(),
+            int(result['max_match']),
+            threshold,
+            int(bool(result[f'has_{threshold}plus'])),
+        )
+
+    @staticmethod
+    def _unpack(round_num, predicted, actual, matches, max_match, threshold, has_match):
+        return {
+            'round': round_num,
+            'predicted': np.frombuffer(predicted, dtype=np.uint8).reshape(-1, 6).tolist(),
+            'actual': np.frombuffer(actual, dtype=np.uint8).tolist(),
+            'matches': np.frombuffer(matches, dtype=np.uint8).tolist(),
+            'max_match': max_match,
+            f'has_{threshold}plus': bool(has_match),
+        }
+
+    def get(self, key):
+        """저장된 결과 반환 (없으면 None)"""
+        return self.get_many([key]).get(key)
+
+    def get_many(self, keys):
+        """여러 키 조회
+
+        Returns:
+            dict: {키: 결과} (저장된 키만 포함)
+        """
+        keys = list(keys)
+        found = {}
+        with self._connect() as conn:
+            for i in range(0, len(keys), self._BATCH):
+                batch = [bytes.fromhex(key) for key in keys[i:i + self._BATCH]]
+                placeholders = ','.join('?' * len(batch))
+                rows = conn.execute(
+                    f"SELECT key, round, predicted, actual, matches, max_match, match_threshold, has_match "
+                    f"FROM round_results WHERE key IN ({placeholders})", batch
+                )
+                for key, *fields in rows:
+                    found[key.hex()] = self._unpack(*fields)
+        return found
+
+    def get_round(self, round_num):
+        """회차별 저장된 결과 목록 (회차 인덱스 조회)"""
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT round, predicted, actual, matches, max_match, match_threshold, has_match "
+                "FROM round_results WHERE round = ?", (int(round_num),)
+            ).fetchall()
+        return [self._unpack(*row) for row in rows]
+
+    def put(self, key, result):
+        """결과 저장"""
+        self.put_many([(key, result)])
+
+    def put_many(self, items, job=None):
+        """여러 결과를 한 트랜잭션으로 추가 (이미 있는 키는 유지)
+
+        Args:
+            items: (키, 결과) 목록
+            job: 작업 진행 상황 (작업 키, 전체 회차 수, 완료 회차 수, 마지막 완료 회차) - 결과와 함께 기록
+        """
+        rows = [(bytes.fromhex(key), int(result['round'])) + self._pack(result) for key, result in items]
+        if not rows and job is None:
+            return
+        with self._connect() as conn:
+            conn.executemany(
+                "INSERT OR IGNORE INTO round_results "
+                "(key, round, predicted, actual, matches, max_match, match_threshold, has_match) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)", rows
+            )
+            if job is not None:
+                self._update_job(conn, *job)
+
+    @staticmethod
+    def _update_job(conn, key, total, completed, last_round):
+        conn.execute(
+            "INSERT OR REPLACE INTO backtest_jobs (job_key, total, completed, last_round, finished, updated_at) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (key, int(total), int(completed), None if last_round is None else int(last_round),
+             int(completed >= total), datetime.now().isoformat())
+        )
+
+    def get_job(self, key):
+        """작업 진행 상황 조회
+
+        Returns:
+            dict or None: {'total', 'completed', 'last_round', 'finished', 'updated_at'} (기록이 없으면 None)
+        """
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT total, completed, last_round, finished, updated_at FROM backtest_jobs WHERE job_key = ?",
+                (key,)
+            ).fetchone()
+        if row is None:
+            return None
+        total, completed, last_round, finished, updated_at = row
+        return {'total': total, 'completed': completed, 'last_round': last_round,
+                'finished': bool(finished), 'updated_at': updated_at}
+
+    def __len__(self):
+        with self._connect() as conn:
+            return conn.execute("SELECT COUNT(*) FROM round_results").fetchone()[0]
+
@@ -3,19 +3,29 @@
 과거 데이터로 예측 후 실제 당첨번호와 비교하여 알고리즘 성능 검증
 """
 import os
-import json
+import sys
 import numpy as np
 from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from tqdm import tqdm
 from collections import defaultdict
 from data_loader import LottoDataLoader
 from prediction_model import LottoPredictionModel
-from recommendation_system import LottoRecommendationSystem
+from recommendation_system import LottoRecommendationSystem, get_recommendation_tables
+from incremental_model import walk_forward
+from backtest_cache import BacktestResultCache, job_key, round_result_key
+from match_evaluation import evaluate_paired, match_matrix, prize_returns
 
 
 class BacktestingSystem:
     """백테스팅 엔진"""
 
+    # 1게임 구매 비용 (원)
+    TICKET_PRICE = 1000
+
+    # 긴 백테스팅의 중간 저장 간격 (순차 실행 기준 회차 수, 병렬 실행은 구간 완료마다)
+    CHECKPOINT_EVERY = 10
+
     def __init__(self, data_path, cache_dir="Data/backtesting_cache", match_threshold=3):
         """
         Args:
@@ -36,6 +46,10 @@ class BacktestingSystem:
 
         # 캐시 디렉토리 생성
         self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.result_cache = BacktestResultCache(self.cache_dir)
+
+        # 회차별 누적 데이터 지문 (캐시 키용)
+        self.data_fingerprints = self.full_loader.cumulative_fingerprints()
 
         print(f"✓ 백테스팅 시스템 초기화 완료 (총 {len(self.full_loader.df)}회차)")
 
@@ -61,12 +75,12 @@ class BacktestingSystem:
         return trainable_rounds
 
     def backtest_single_round(self, target_round, weights, strategy='score',
-                              n_combinations=10, seed=42, best_only=False):
+                              n_combinations=10, seed=42, best_only=False, training_state=None):
         """단일 회차 백테스팅
 
         프로세스:
-        1. target_round - 1까지 데이터 로드
-        2. 모델 학습
+        1. target_round - 1까지 데이터 준비 (전체 데이터를 복사 없이 참조)
+        2. 모델 학습 (증분 학습 상태가 있으면 재학습 없이 구성)
         3. 번호 추천
         4. 실제 당첨번호와 비교
 
@@ -77,6 +91,7 @@ class BacktestingSystem:
             n_combinations: 추천 조합 개수
             seed: 랜덤 시드
             best_only: 최적 조합만 선택 여부 (랜덤 요소 제거)
+            training_state: target_round - 1까지 반영된 IncrementalTrainingState (옵션)
 
         Returns:
             dict: {
@@ -88,35 +103,90 @@ class BacktestingSystem:
                 'has_3plus': 3개 이상 일치 여부
             }
         """
-        # 1. 직전 회차까지 로드
-        train_loader = LottoDataLoader(self.data_path)
-        train_loader.load_data_until_round(target_round - 1)
+        # 1. 직전 회차까지 데이터 및 데이터 분석 테이블
+        train_loader, tables = self._training_data(target_round, training_state)
 
         # 2. 모델 학습
         model = LottoPredictionModel(train_loader, weights=weights)
-        model.train_all_patterns()
+        if training_state is not None:
+            model.train_from_state(training_state)
+        else:
+            model.train_all_patterns()
+
+        # 3. 추천 및 4~5. 실제 당첨번호와 비교
+        predicted = self._generate_predictions(LottoRecommendationSystem(model, tables), strategy,
+                                               n_combinations, seed, best_only)
+        return self._round_result(target_round, predicted)
+
+    def backtest_population_round(self, target_round, weights_list, strategy='score',
+                                  n_combinations=10, seed=42, best_only=False, training_state=None):
+        """여러 가중치 후보의 단일 회차 백테스팅 (학습 1회, 후보별 점수는 한 번에 계산)
+
+        특징/패턴 학습과 데이터 분석 테이블은 후보 전체가 공유하고, 가중치별 번호 점수는
+        (46, 4) 성분 비율 x (K, 4) 가중치로 한 번에 계산한다. 후보별 결과는
+        backtest_single_round(target_round, weights, ...)와 같다.
+
+        Args:
+            target_round: 목표 회차
+            weights_list: 가중치 딕셔너리 리스트
+            (나머지 인자는 backtest_single_round와 동일)
+
+        Returns:
+            list: 가중치 후보별 결과 (입력 순서)
+        """
+        train_loader, tables = self._training_data(target_round, training_state)
 
-        # 3. 추천
-        recommender = LottoRecommendationSystem(model)
+        base_model = LottoPredictionModel(train_loader)
+        if training_state is not None:
+            base_model.train_from_state(training_state)
+        else:
+            base_model.train_all_patterns()
+
+        results = []
+        for model in base_model.reweighted_many(weights_list):
+            predicted = self._generate_predictions(LottoRecommendationSystem(model, tables), strategy,
+                                                   n_combinations, seed, best_only)
+            results.append(self._round_result(target_round, predicted))
+        return results
 
+    def _training_data(self, target_round, training_state=None):
+        """target_round - 1까지의 학습용 로더와 데이터 분석 테이블
+
+        로더는 전체 데이터를 복사 없이 참조하는 prefix_view이고, 증분 학습 상태가 있으면
+        지문은 회차별 누적 지문을 그대로 쓰고 테이블은 상태의 누적 집계로 만든다
+        (회차마다 데이터를 다시 해시/순회하지 않음).
+
+        Returns:
+            (LottoDataLoader, RecommendationDataTables)
+        """
+        fingerprint = None
+        if training_state is not None:
+            fingerprint = self.data_fingerprints.get(training_state.last_round)
+
+        train_loader = self.full_loader.prefix_view(target_round - 1, fingerprint)
+        return train_loader, get_recommendation_tables(train_loader, training_state)
+
+    def _generate_predictions(self, recommender, strategy, n_combinations, seed, best_only):
+        """전략별 추천 조합 생성"""
         if strategy == 'score':
-            predicted = recommender.generate_by_score(n_combinations, seed=seed, best_only=best_only)
+            return recommender.generate_by_score(n_combinations, seed=seed, best_only=best_only)
         elif strategy == 'probability':
-            predicted = recommender.generate_by_probability(n_combinations, seed=seed)
+            return recommender.generate_by_probability(n_combinations, seed=seed)
         elif strategy == 'pattern':
-            predicted = recommender.generate_by_pattern(n_combinations, seed=seed)
+            return recommender.generate_by_pattern(n_combinations, seed=seed)
         elif strategy == 'hybrid':
-            predicted = recommender.generate_hybrid(n_combinations, seed=seed, best_only=best_only)
+            return recommender.generate_hybrid(n_combinations, seed=seed, best_only=best_only)
         elif strategy == 'safe':
-            predicted = recommender.generate_safe_strategy(n_combinations, seed=seed)
+            return recommender.generate_safe_strategy(n_combinations, seed=seed)
         else:
-            predicted = recommender.generate_by_score(n_combinations, seed=seed, best_only=best_only)
+            return recommender.generate_by_score(n_combinations, seed=seed, best_only=best_only)
 
-        # 4. 실제 당첨번호
+    def _round_result(self, target_round, predicted):
+        """추천 조합과 실제 당첨번호 비교 결과"""
         actual = self.full_loader.get_round_data(target_round)
 
-        # 5. 일치 개수 계산
-        matches = [len(set(combo) & set(actual)) for combo in predicted]
+        # 일치 개수 계산 (조합 M개 x 당첨번호 1회)
+        matches = match_matrix(predicted, [actual])[:, 0].tolist()
         max_match = max(matches)
         has_match = max_match >= self.match_threshold
 
@@ -132,7 +202,139 @@ class BacktestingSystem:
             match_key: has_match
         }
 
-    def backtest_fixed_mode(self, start_round, end_round, weights, strategy='hybrid', progress_callback=None, best_only=False):
+    def _backtest_fixed_round(self, target_round, weights, strategy='hybrid', best_only=False, training_state=None):
+        """고정 모드 단일 회차: 1개 조합 추천
+
+        등수/당첨금은 모든 회차의 추천이 끝난 뒤 evaluate_fixed_predictions로 한 번에 계산한다
+        (_fill_fixed_results 참고).
+        """
+        # 1개 조합 생성 (n_combinations=1)
+        # 시드는 회차 번호를 사용하여 재현성 확보
+        seed = target_round
+
+        step_result = self.backtest_single_round(
+            target_round, weights, strategy, n_combinations=1, seed=seed, best_only=best_only,
+            training_state=training_state
+        )
+
+        return {
+            'round': target_round,
+            'prediction': step_result['predicted'][0],  # 1개 조합
+            'actual': step_result['actual']  # 6개 번호
+        }
+
+    @staticmethod
+    def _fill_fixed_results(results, curve):
+        """회차별 고정 모드 결과에 컬럼형 평가 결과(보너스, 일치 개수, 등수, 당첨금, 수익) 채우기"""
+        columns = {key: curve[key].tolist()
+                   for key in ('bonus', 'match_count', 'rank', 'prize', 'profit', 'cumulative_profit')}
+        for i, result in enumerate(results):
+            result.update({key: values[i] for key, values in columns.items()})
+
+    def evaluate_fixed_predictions(self, rounds, predictions):
+        """회차별 1게임 추천 조합을 실제 당첨번호/당첨금과 한 번에 비교 (컬럼형 결과)
+
+        Args:
+            rounds: (N,) 회차 목록
+            predictions: (N, 6) 회차별 추천 조합, 또는 여러 전략을 한 번에 평가할 때 (S, N, 6)
+
+        Returns:
+            dict: 'round', 'bonus' (N,) 및 'match_count', 'rank', 'prize', 'profit',
+                'cumulative_profit' (..., N), 'total_prize', 'total_cost', 'net_profit', 'roi' (...)
+                (당첨금은 회차별 실제 1게임 당첨금, prize_returns 참고)
+        """
+        loader = self.full_loader
+        rows = loader.round_rows(rounds)
+        bonuses = loader.bonus_numbers[rows]
+
+        matches, ranks = evaluate_paired(predictions, loader.draws[rows], bonuses)
+        evaluation = prize_returns(ranks, loader.prize_amounts[rows], self.TICKET_PRICE)
+        evaluation.update({
+            'round': loader.round_numbers[rows],
+            'bonus': bonuses.astype(np.int64),
+            'match_count': matches,
+            'rank': ranks,
+        })
+        return evaluation
+
+    def _run_rounds(self, mode, rounds, params, n_jobs=1, progress_callback=None, desc=None, checkpoint=None):
+        """회차별 백테스팅 실행 (순차 또는 병렬), 결과는 회차 순
+
+        Args:
+            mode: 'single' (backtest_single_round), 'fixed' (_backtest_fixed_round)
+                또는 'population' (backtest_population_round, params['weights_by_round']: 회차별 후보 목록)
+            rounds: 회차 리스트
+            params: 회차 함수에 전달할 인자 (weights, strategy 등)
+            n_jobs: 프로세스 수 (1: 순차, None/-1: CPU 코어 수)
+            progress_callback: 진행률 콜백 함수 (0.0 ~ 1.0)
+            desc: tqdm 진행바 설명 (None이면 진행바 미표시)
+            checkpoint: 완료된 결과 묶음을 받는 함수 (중간 저장용, 순차: CHECKPOINT_EVERY회마다,
+                병렬: 구간 완료마다, 마지막에 남은 결과 포함) - 중단되어도 그 전까지의 결과는 보존됨
+
+        Returns:
+            list: 회차 순 결과 리스트
+        """
+        rounds = sorted(rounds)
+        total_steps = len(rounds)
+        if n_jobs is None or n_jobs < 1:
+            n_jobs = os.cpu_count() or 1
+        n_jobs = min(n_jobs, total_steps) if total_steps else 1
+
+        progress = tqdm(total=total_steps, desc=desc) if desc else None
+
+        # 1. 순차 실행: 워크포워드 학습 상태를 한 회차씩 전진시키며 재사용
+        if n_jobs == 1:
+            results = []
+            saved = 0
+            for idx, (target_round, state) in enumerate(walk_forward(self.full_loader, rounds)):
+                if progress_callback:
+                    progress_callback(idx / total_steps)
+                results.append(_run_round(self, mode, target_round, state, params))
+                if progress:
+                    progress.update(1)
+                if checkpoint and len(results) - saved >= self.CHECKPOINT_EVERY:
+                    checkpoint(results[saved:])
+                    saved = len(results)
+            if checkpoint and saved < len(results):
+                checkpoint(results[saved:])
+            if progress:
+                progress.close()
+            return results
+
+        # 2. 병렬 실행: 연속 회차 구간으로 나눠 프로세스마다 워크포워드
+        # 회차별 시드는 회차 결과에만 의존하므로 실행 순서와 무관하게 결과가 같음
+        chunk_size = max(1, -(-total_steps // (n_jobs * 4)))
+        chunks = [rounds[i:i + chunk_size] for i in range(0, total_steps, chunk_size)]
+
+        chunk_results = {}
+        done_steps = 0
+        if progress_callback:
+            progress_callback(0.0)
+
+        with ProcessPoolExecutor(max_workers=n_jobs, initializer=_init_backtest_worker,
+                                 initargs=(self.data_path, str(self.cache_dir), self.match_threshold)) as executor:
+            futures = {
+                executor.submit(_run_backtest_chunk, mode, chunk, params): i
+                for i, chunk in enumerate(chunks)
+            }
+            for future in as_completed(futures):
+                i = futures[future]
+                chunk_results[i] = future.result()
+                if checkpoint:
+                    checkpoint(chunk_results[i])
+                done_steps += len(chunks[i])
+                if progress_callback:
+                    progress_callback(done_steps / total_steps)
+                if progress:
+                    progress.update(len(chunks[i]))
+
+        if progress:
+            progress.close()
+
+        return [result for i in range(len(chunks)) for result in chunk_results[i]]
+
+    def backtest_fixed_mode(self, start_round, end_round, weights, strategy='hybrid', progress_callback=None,
+                            best_only=False, n_jobs=1):
         """고정 모드(1게임) 백테스팅: 수익률 분석
 
         Args:
@@ -142,90 +344,83 @@ class BacktestingSystem:
             strategy: 전략
             progress_callback: 진행률 콜백 함수 (옵션)
             best_only: 최적 조합만 선택 여부
+            n_jobs: 병렬 프로세스 수 (1: 순차, None/-1: CPU 코어 수)
 
         Returns:
             dict: 수익률 분석 결과
         """
-        results = []
-        total_cost = 0
-        total_prize = 0
-        
-        # 당첨금 기준 (대략적 평균값)
-        prizes = {
-            1: 2000000000, # 1등 (6개)
-            2: 50000000,   # 2등 (5개 + 보너스)
-            3: 1500000,    # 3등 (5개)
-            4: 50000,      # 4등 (4개)
-            5: 5000,       # 5등 (3개)
-            0: 0
-        }
+        rounds = list(range(start_round, end_round + 1))
+        params = {'weights': weights, 'strategy': strategy, 'best_only': best_only}
+        results = self._run_rounds('fixed', rounds, params, n_jobs=n_jobs, progress_callback=progress_callback)
+
+        # 등수/당첨금/누적 수익 (회차 순, 컬럼형으로 한 번에 계산)
+        curve = self.evaluate_fixed_predictions([r['round'] for r in results], [r['prediction'] for r in results])
+        self._fill_fixed_results(results, curve)
 
+        if progress_callback:
+            progress_callback(1.0)
+
+        return self._fixed_mode_summary(results, curve)
+
+    def backtest_fixed_strategies(self, start_round, end_round, weights, strategies, progress_callback=None,
+                                  best_only=False, n_jobs=1):
+        """여러 전략의 고정 모드(1게임) 수익률을 한 번에 비교
+
+        전략별로 회차마다 1개 조합을 추천한 뒤, (전략 S x 회차 N) 조합 전체를
+        실제 당첨번호/당첨금과 한 번에 비교한다.
+
+        Args:
+            strategies: 전략 이름 목록 (예: ['score', 'hybrid'])
+            (나머지 인자는 backtest_fixed_mode와 동일)
+
+        Returns:
+            dict: {전략: backtest_fixed_mode와 같은 형식의 결과}
+        """
         rounds = list(range(start_round, end_round + 1))
-        total_steps = len(rounds)
-        
-        for idx, target_round in enumerate(rounds):
+
+        all_results = []
+        for i, strategy in enumerate(strategies):
+            params = {'weights': weights, 'strategy': strategy, 'best_only': best_only}
+            callback = None
             if progress_callback:
-                progress_callback((idx) / total_steps)
-
-            # 1. 1개 조합 생성 (n_combinations=1)
-            # 시드는 회차 번호를 사용하여 재현성 확보
-            seed = target_round 
-            
-            step_result = self.backtest_single_round(
-                target_round, weights, strategy, n_combinations=1, seed=seed, best_only=best_only
-            )
-            
-            prediction = step_result['predicted'][0] # 1개 조합
-            actual_nums = step_result['actual'] # 6개 번호
-            
-            # 보너스 번호 가져오기
-            row = self.full_loader.numbers_df[self.full_loader.numbers_df['회차'] == target_round]
-            bonus_num = int(row.iloc[0]['보너스번호']) if not row.empty else 0
-            
-            # 등수 및 당첨금 계산
-            match_cnt = len(set(prediction) & set(actual_nums))
-            is_bonus = bonus_num in prediction
-            
-            rank = 0
-            if match_cnt == 6: rank = 1
-            elif match_cnt == 5 and is_bonus: rank = 2
-            elif match_cnt == 5: rank = 3
-            elif match_cnt == 4: rank = 4
-            elif match_cnt == 3: rank = 5
-                
-            prize = prizes.get(rank, 0)
-            cost = 1000
-            
-            total_cost += cost
-            total_prize += prize
-            
-            results.append({
-                'round': target_round,
-                'prediction': prediction,
-                'actual': actual_nums,
-                'bonus': bonus_num,
-                'match_count': match_cnt,
-                'rank': rank,
-                'prize': prize,
-                'profit': prize - cost,
-                'cumulative_profit': total_prize - total_cost
-            })
-            
+                callback = lambda p, i=i: progress_callback((i + p) / len(strategies))
+            all_results.append(self._run_rounds('fixed', rounds, params, n_jobs=n_jobs, progress_callback=callback))
+
+        curves = self.evaluate_fixed_predictions(
+            rounds, [[r['prediction'] for r in results] for results in all_results])
+
+        summaries = {}
+        for i, (strategy, results) in enumerate(zip(strategies, all_results)):
+            curve = {key: (value[i] if key not in ('round', 'bonus') else value) for key, value in curves.items()}
+            self._fill_fixed_results(results, curve)
+            summaries[strategy] = self._fixed_mode_summary(results, curve)
+
         if progress_callback:
             progress_callback(1.0)
 
+        return summaries
+
+    @staticmethod
+    def _fixed_mode_summary(results, curve):
+        """고정 모드 결과 요약 (회차별 결과 + 컬럼형 수익 곡선)"""
         return {
             'results': results,
-            'total_cost': total_cost,
-            'total_prize': total_prize,
-            'net_profit': total_prize - total_cost,
-            'roi': (total_prize / total_cost * 100) if total_cost > 0 else 0
+            'curve': {key: np.asarray(curve[key]).tolist() for key in ('round', 'prize', 'profit', 'cumulative_profit')},
+            'total_cost': int(curve['total_cost']),
+            'total_prize': int(curve['total_prize']),
+            'net_profit': int(curve['net_profit']),
+            'roi': float(curve['roi'])
         }
 
     def backtest_multiple_rounds(self, rounds, weights, strategy='score',
-                                  n_combinations=10, seed=42, use_cache=True):
+                                  n_combinations=10, seed=42, use_cache=True, n_jobs=1, progress_callback=None,
+                                  best_only=False):
         """여러 회차 백테스팅 (캐싱 지원)
 
+        회차별 결과는 (가중치 전체 정밀도, 전략, 시드, 조합 수, 최적 모드, 일치 기준,
+        해당 회차까지의 데이터 지문)의 해시 키로 한 번만 저장되어 다른 가중치 시도나
+        다음 실행에서도 그대로 재사용된다.
+
         Args:
             rounds: 백테스팅할 회차 리스트
             weights: 가중치 딕셔너리
@@ -233,47 +428,142 @@ class BacktestingSystem:
             n_combinations: 추천 조합 개수
             seed: 랜덤 시드
             use_cache: 캐시 사용 여부
+            n_jobs: 병렬 프로세스 수 (1: 순차, None/-1: CPU 코어 수)
+            progress_callback: 진행률 콜백 함수 (옵션)
+            best_only: 최적 조합만 선택 여부
 
         Returns:
             list: 백테스팅 결과 리스트
         """
         results = []
 
-        # 캐시 키 생성 (기준 포함)
-        cache_key = f"{strategy}_w{weights['freq_weight']:.0f}-{weights['trend_weight']:.0f}-{weights['absence_weight']:.0f}-{weights['hotness_weight']:.0f}_{self.match_threshold}plus"
-        cache_file = self.cache_dir / f"{cache_key}.json"
+        # 회차별 캐시 키 생성
+        keys = {
+            r: round_result_key(r, self.data_fingerprints.get(r), weights, strategy, seed,
+                                n_combinations, best_only, self.match_threshold)
+            for r in rounds
+        }
 
-        # 캐시 로드
-        cached_rounds = set()
-        if use_cache and cache_file.exists():
-            with open(cache_file, 'r', encoding='utf-8') as f:
-                cached_data = json.load(f)
+        # 캐시 로드 (중단된 같은 작업이 있으면 저장된 회차 이후부터 이어서 계산)
+        if use_cache:
+            job = job_key(rounds, self.data_fingerprints.get(max(rounds)) if rounds else None,
+                          weights, strategy, seed, n_combinations, best_only, self.match_threshold)
+            previous = self.result_cache.get_job(job)
+            if previous and not previous['finished']:
+                print(f"♻️ 중단된 작업 이어서 실행: {previous['completed']}/{previous['total']}회 완료 "
+                      f"(마지막 {previous['last_round']}회, {previous['updated_at']})")
 
-            cached_rounds = {r['round'] for r in cached_data}
-            remaining_rounds = [r for r in rounds if r not in cached_rounds]
+            cached = self.result_cache.get_many(keys.values())
+            results.extend(cached[keys[r]] for r in rounds if keys[r] in cached)
+            remaining_rounds = [r for r in rounds if keys[r] not in cached]
 
-            results.extend(cached_data)
-            print(f"✓ 캐시: {len(cached_data)}회, 신규: {len(remaining_rounds)}회")
+            print(f"✓ 캐시: {len(results)}회, 신규: {len(remaining_rounds)}회")
             rounds = remaining_rounds
 
-        # 신규 계산
-        if rounds:
-            for target_round in tqdm(rounds, desc="백테스팅"):
-                result = self.backtest_single_round(
-                    target_round, weights, strategy, n_combinations, seed
-                )
-                results.append(result)
+            if previous and not previous['finished'] and not rounds:
+                self.result_cache.put_many([], job=(job, len(keys), len(keys), max(keys)))
 
-            # 캐시 저장
+        # 신규 계산 (완료된 회차는 진행 상황과 함께 중간 저장)
+        if rounds:
+            checkpoint = None
             if use_cache:
-                with open(cache_file, 'w', encoding='utf-8') as f:
-                    json.dump(results, f, ensure_ascii=False, indent=2)
+                total = len(keys)
+                completed = [len(results)]
+
+                def checkpoint(new_results):
+                    completed[0] += len(new_results)
+                    self.result_cache.put_many(
+                        ((keys[result['round']], result) for result in new_results),
+                        job=(job, total, completed[0], new_results[-1]['round'])
+                    )
+
+            params = {'weights': weights, 'strategy': strategy, 'n_combinations': n_combinations,
+                      'seed': seed, 'best_only': best_only}
+            new_results = self._run_rounds('single', rounds, params, n_jobs=n_jobs,
+                                           progress_callback=progress_callback, desc="백테스팅",
+                                           checkpoint=checkpoint)
+            results.extend(new_results)
+
+        if progress_callback:
+            progress_callback(1.0)
 
         # 회차 순으로 정렬
         results.sort(key=lambda x: x['round'])
 
         return results
 
+    def backtest_weight_trials(self, weights_list, rounds, strategy='score', n_combinations=10, seed=42,
+                               use_cache=True, n_jobs=1, progress_callback=None):
+        """여러 가중치 후보를 같은 회차들로 백테스팅 (회차 단위로 후보 전체를 한 번에 평가)
+
+        회차마다 학습은 한 번만 하고 후보 K개의 번호 점수를 한 번에 계산한다
+        (backtest_population_round). 병렬 실행 시에는 회차 구간을 나눠 처리한다.
+
+        Args:
+            weights_list: 가중치 딕셔너리 리스트
+            rounds: 백테스팅할 회차 리스트
+            strategy: 추천 전략
+            n_combinations: 추천 조합 개수
+            seed: 랜덤 시드
+            use_cache: 캐시 사용 여부 (backtest_multiple_rounds와 같은 결과 캐시 공유)
+            n_jobs: 병렬 프로세스 수 (1: 순차, None/-1: CPU 코어 수)
+            progress_callback: 진행률 콜백 함수 (옵션)
+
+        Returns:
+            list: 가중치 후보별 백테스팅 결과 리스트 (입력 순서, 각 리스트는 회차 순)
+        """
+        rounds = sorted(rounds)
+
+        # 후보 x 회차별 캐시 키 (backtest_multiple_rounds와 같은 키)
+        keys = [
+            {r: round_result_key(r, self.data_fingerprints.get(r), weights, strategy, seed,
+                                 n_combinations, False, self.match_threshold)
+             for r in rounds}
+            for weights in weights_list
+        ]
+
+        cached = {}
+        if use_cache:
+            cached = self.result_cache.get_many(key for trial_keys in keys for key in trial_keys.values())
+
+        # 회차별로 결과가 없는 후보만 모아서 한 번에 계산
+        missing = {}
+        for r in rounds:
+            trials = [k for k in range(len(weights_list)) if keys[k][r] not in cached]
+            if trials:
+                missing[r] = trials
+
+        n_total = len(weights_list) * len(rounds)
+        n_missing = sum(len(trials) for trials in missing.values())
+        print(f"✓ 가중치 후보 {len(weights_list)}개 x {len(rounds)}회: 캐시 {n_total - n_missing}건, 신규 {n_missing}건")
+
+        computed = {}
+        if missing:
+            params = {
+                'weights_by_round': {r: [weights_list[k] for k in trials] for r, trials in missing.items()},
+                'strategy': strategy, 'n_combinations': n_combinations, 'seed': seed, 'best_only': False
+            }
+            checkpoint = None
+            if use_cache:
+                def checkpoint(round_results):
+                    self.result_cache.put_many(
+                        (keys[k][result['round']], result)
+                        for results in round_results for k, result in zip(missing[results[0]['round']], results)
+                    )
+
+            round_results = self._run_rounds('population', list(missing), params, n_jobs=n_jobs,
+                                             progress_callback=progress_callback, desc="가중치 후보 백테스팅",
+                                             checkpoint=checkpoint)
+            for r, results in zip(sorted(missing), round_results):
+                for k, result in zip(missing[r], results):
+                    computed[keys[k][r]] = result
+
+        if progress_callback:
+            progress_callback(1.0)
+
+        return [[cached.get(keys[k][r]) or computed[keys[k][r]] for r in rounds]
+                for k in range(len(weights_list))]
+
     def calculate_metrics(self, results):
         """백테스팅 결과 메트릭 계산
 
@@ -372,6 +662,36 @@ class BacktestingSystem:
         print("="*70 + "\n")
 
 
+def _run_round(system, mode, target_round, training_state, params):
+    """회차 1개 실행 (mode: 'single' 또는 'fixed')"""
+    if mode == 'fixed':
+        return system._backtest_fixed_round(target_round, training_state=training_state, **params)
+    if mode == 'population':
+        params = dict(params)
+        weights_list = params.pop('weights_by_round')[target_round]
+        return system.backtest_population_round(target_round, weights_list, training_state=training_state, **params)
+    return system.backtest_single_round(target_round, training_state=training_state, **params)
+
+
+# 병렬 백테스팅 작업 프로세스별 시스템 (프로세스당 1회 데이터 로드)
+_worker_system = None
+
+
+def _init_backtest_worker(data_path, cache_dir, match_threshold):
+    """작업 프로세스 초기화: 전체 데이터 로드 (추천 과정 출력은 생략)"""
+    global _worker_system
+    sys.stdout = open(os.devnull, 'w', encoding='utf-8')
+    _worker_system = BacktestingSystem(data_path, cache_dir=cache_dir, match_threshold=match_threshold)
+
+
+def _run_backtest_chunk(mode, rounds, params):
+    """연속 회차 구간을 워크포워드로 실행"""
+    return [
+        _run_round(_worker_system, mode, target_round, state, params)
+        for target_round, state in walk_forward(_worker_system.full_loader, rounds)
+    ]
+
+
 def main():
     """테스트용 메인 함수"""
     data_path = "../Data/645_251227.csv"
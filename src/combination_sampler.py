@@ -0,0 +1,202 @@
+"""
+조합 일괄 샘플러
+가중치 비복원 추출(Gumbel-top-k)로 수천 개의 번호 조합을 한 번에 뽑고,
+유효성 검사와 중복 제거를 배열/64비트 마스크 연산으로 처리
+구간/홀짝 패턴 조합은 조건을 만족하는 조합만 직접 추출 (기각 없음)
+"""
+from itertools import chain, combinations, product
+from math import comb, prod
+
+import numpy as np
+
+from match_evaluation import combination_masks
+
+
+# 조합 1개씩 뽑던 기존 루프의 최대 시도 횟수와 같은 추출 상한
+MAX_DRAWS = 10000
+
+# 한 번에 뽑는 최대 조합 수
+BATCH_SIZE = 4096
+
+# 구간 크기 (저 1-15 / 중 16-30 / 고 31-45)
+SECTION_SIZE = 15
+
+
+def make_rng(seed=None):
+    """호출마다 독립적인 난수 생성기 (seed가 같으면 같은 결과, 전역 random 상태와 무관)"""
+    return np.random.default_rng(seed)
+
+
+def sample_combinations(pool, n_combinations, rng, weights=None, fixed=(), valid_mask_func=None,
+                        max_draws=MAX_DRAWS, batch_size=BATCH_SIZE):
+    """번호 풀에서 서로 다른 6개 번호 조합 일괄 추출
+
+    조합마다 풀에서 (6 - 고정 번호 수)개를 가중치 비례 비복원 추출한다.
+    가중치 w인 번호의 키를 log(U) / w로 두고 키가 큰 k개를 고르면
+    (Efraimidis-Spirakis, Gumbel-top-k와 같은 분포) np.random.choice(replace=False, p=...)와
+    같은 분포가 되며, 이를 (batch, 풀 크기) 배열 하나로 계산한다.
+
+    Args:
+        pool: 후보 번호 목록 (고정 번호 제외)
+        n_combinations: 필요한 조합 수
+        rng: numpy Generator (make_rng)
+        weights: 풀 번호별 가중치 (None이면 균등, 0인 번호는 뽑지 않음)
+        fixed: 모든 조합에 포함할 고정 번호
+        valid_mask_func: (M, 6) 조합 -> (M,) 유효 여부 (None이면 모두 유효)
+        max_draws: 최대 추출 조합 수 (유효/중복 조합 포함)
+        batch_size: 한 번에 추출하는 최대 조합 수
+
+    Returns:
+        np.ndarray: (K, 6) 정렬된 조합 (K <= n_combinations, 추출 순서)
+    """
+    pool = np.asarray(pool, dtype=np.int64)
+    fixed = np.asarray(fixed, dtype=np.int64)
+    k = 6 - len(fixed)
+
+    if weights is not None:
+        weights = np.asarray(weights, dtype=np.float64)
+        pool = pool[weights > 0]
+        weights = weights[weights > 0]
+
+    if n_combinations <= 0 or k < 0 or len(pool) < k:
+        return np.empty((0, 6), dtype=np.int64)
+
+    def draw_batch(size):
+        keys = rng.random((size, len(pool)))
+        if weights is not None:
+            keys = np.log(keys) / weights
+        picked = pool[np.argpartition(-keys, k - 1, axis=1)[:, :k]] if k else np.empty((size, 0), np.int64)
+        combos = np.sort(np.concatenate([np.broadcast_to(fixed, (size, len(fixed))), picked], axis=1), axis=1)
+
+        if valid_mask_func is not None:
+            combos = combos[valid_mask_func(combos)]
+        return combos
+
+    return _collect_unique(draw_batch, n_combinations, max_draws, batch_size)
+
+
+def _collect_unique(draw_batch, n_combinations, max_draws, batch_size):
+    """draw_batch(size) -> (M, 6) 정렬된 조합을 반복 호출해 서로 다른 조합을 추출 순서대로 모음"""
+    found = []
+    seen = np.empty(0, dtype=np.uint64)
+    n_found = 0
+    drawn = 0
+
+    while n_found < n_combinations and drawn < max_draws:
+        # 남은 개수 + 여유분만 추출 (중복/무효 조합이 많으면 다음 배치에서 보충)
+        needed = n_combinations - n_found
+        size = int(min(needed + needed // 4 + 64, batch_size, max_draws - drawn))
+        drawn += size
+
+        combos = draw_batch(size)
+
+        # 배치 내 첫 등장 + 이전 배치와 중복 제거 (64비트 마스크 비교)
+        masks = combination_masks(combos)
+        _, first = np.unique(masks, return_index=True)
+        first.sort()
+        first = first[~np.isin(masks[first], seen)]
+
+        first = first[:n_combinations - n_found]
+        found.append(combos[first])
+        seen = np.concatenate([seen, masks[first]])
+        n_found += len(first)
+
+    return np.concatenate(found) if found else np.empty((0, 6), dtype=np.int64)
+
+
+def _pattern_cells(pool):
+    """풀을 (구간, 홀짝) 6칸으로 분할 - [저홀, 저짝, 중홀, 중짝, 고홀, 고짝]"""
+    pool = np.unique(np.asarray(pool, dtype=np.int64))
+    pool = pool[(pool >= 1) & (pool <= 45)]
+    section = (pool - 1) // SECTION_SIZE
+    odd = pool % 2
+    return [pool[(section == s) & (odd == o)] for s in range(3) for o in (1, 0)]
+
+
+def pattern_allocations(pool, section_pattern, odd_counts):
+    """구간/홀짝 조건을 만족하는 칸별 번호 개수 배분 나열
+
+    Args:
+        pool: 후보 번호 목록
+        section_pattern: (저, 중, 고) 구간별 번호 개수
+        odd_counts: 허용하는 홀수 개수 목록
+
+    Returns:
+        tuple: (칸별 번호 배열 6개, (A, 6) 칸별 개수 배분, (A,) 배분별 조합 수)
+    """
+    cells = _pattern_cells(pool)
+    odd_counts = set(odd_counts)
+    allocations = []
+    counts = []
+
+    for low_odd in range(section_pattern[0] + 1):
+        for mid_odd in range(section_pattern[1] + 1):
+            for high_odd in range(section_pattern[2] + 1):
+                if low_odd + mid_odd + high_odd not in odd_counts:
+                    continue
+                allocation = (low_odd, section_pattern[0] - low_odd,
+                              mid_odd, section_pattern[1] - mid_odd,
+                              high_odd, section_pattern[2] - high_odd)
+                count = prod(comb(len(cell), a) for cell, a in zip(cells, allocation))
+                if count:
+                    allocations.append(allocation)
+                    counts.append(count)
+
+    return cells, np.array(allocations, dtype=np.int64).reshape(-1, 6), np.array(counts, dtype=np.int64)
+
+
+def count_pattern_combinations(pool, section_pattern, odd_counts):
+    """구간/홀짝 조건을 만족하는 조합 수"""
+    return int(pattern_allocations(pool, section_pattern, odd_counts)[2].sum())
+
+
+def sample_pattern_combinations(pool, section_pattern, odd_counts, n_combinations, rng,
+                                batch_size=BATCH_SIZE):
+    """구간/홀짝 조건을 만족하는 조합을 기각 없이 균등 추출
+
+    만족하는 조합 전체를 (구간, 홀짝) 칸별 개수 배분으로 나누고, 배분을 조합 수에 비례해 고른 뒤
+    칸마다 균등 비복원 추출하므로 모든 조합이 같은 확률로 뽑힌다. 조건에 맞지 않는 조합은 만들지 않으며,
+    만족하는 조합이 요청 수의 2배 이하이면 전부 나열해서 섞는다 (중복 재추출 없이 끝남).
+
+    Args:
+        pool: 후보 번호 목록
+        section_pattern: (저, 중, 고) 구간별 번호 개수
+        odd_counts: 허용하는 홀수 개수 목록
+        n_combinations: 필요한 조합 수
+        rng: numpy Generator (make_rng)
+        batch_size: 한 번에 추출하는 최대 조합 수
+
+    Returns:
+        np.ndarray: (K, 6) 정렬된 조합, K = min(n_combinations, 만족하는 조합 수)
+    """
+    cells, allocations, counts = pattern_allocations(pool, section_pattern, odd_counts)
+    total = int(counts.sum())
+    n_combinations = min(n_combinations, total)
+
+    if n_combinations <= 0:
+        return np.empty((0, 6), dtype=np.int64)
+
+    if total <= 2 * n_combinations:
+        combos = np.array([list(chain.from_iterable(parts))
+                           for allocation in allocations
+                           for parts in product(*(combinations(cell.tolist(), a)
+                                                  for cell, a in zip(cells, allocation)))], dtype=np.int64)
+        return np.sort(combos[rng.permutation(total)[:n_combinations]], axis=1)
+
+    probs = counts / total
+
+    def draw_batch(size):
+        combos = np.empty((size, 6), dtype=np.int64)
+        picks = rng.choice(len(allocations), size=size, p=probs)
+        for idx in np.unique(picks):
+            rows = np.flatnonzero(picks == idx)
+            col = 0
+            for cell, a in zip(cells, allocations[idx]):
+                if a:
+                    keys = rng.random((len(rows), len(cell)))
+                    combos[rows, col:col + a] = cell[np.argpartition(-keys, a - 1, axis=1)[:, :a]]
+                    col += a
+        return np.sort(combos, axis=1)
+
+    # 만족하는 조합이 요청 수의 2배를 넘으므로 새 조합이 나올 확률이 항상 1/2 이상
+    return _collect_unique(draw_batch, n_combinations, np.inf, batch_size)
@@ -0,0 +1,368 @@
+"""
+조합 일괄 점수 계산 커널
+(M, 6) 번호 배열 전체를 번호별/번호쌍별 조회 테이블로 한 번에 점수화
+"""
+import numpy as np
+from itertools import combinations
+import grid_geometry as geo
+
+
+# 6개 번호 조합 내 15개 번호쌍의 열 인덱스 (i < j, itertools.combinations 순서)
+PAIR_I, PAIR_J = geo.pair_indices(6)
+
+
+def as_combination_array(combos):
+    """조합 목록을 (M, 6) int64 배열로 변환 (번호 순서 유지)"""
+    array = np.asarray(combos, dtype=np.int64)
+    return array.reshape(-1, 6)
+
+
+class CombinationScorer:
+    """LottoRecommendationSystem 점수 계산의 일괄(batch) 버전
+
+    _calculate_combination_score / _calculate_grid_score /
+    ImagePatternAnalysis.calculate_image_score / _check_phase3_constraints를
+    (M, 6) 배열에 대해 벡터 연산으로 계산한다. 덧셈 순서까지 스칼라 버전과 같게 맞춰
+    조합별 점수가 스칼라 버전과 정확히 일치한다.
+    """
+
+    def __init__(self, recommender):
+        """
+        Args:
+            recommender: LottoRecommendationSystem 인스턴스 (모델 학습 완료 상태)
+        """
+        model = recommender.model
+        self.version = recommender._score_version()
+
+        numbers = np.arange(46)
+
+        # 1. 번호별 테이블 (인덱스 = 번호, 0번은 사용하지 않음)
+        self.number_score = np.zeros(46)
+        for num in range(1, 46):
+            self.number_score[num] = model.number_scores[num]['total_score']
+
+        self.grid_unit = np.zeros(46)
+        for num in range(1, 46):
+            self.grid_unit[num] = recommender.grid_weights.get(recommender._get_grid_zone(num), 1.0) * 10
+
+        self.is_middle = np.isin(numbers, recommender.grid_zones['middle'])
+        self.is_anti_diagonal = np.isin(numbers, recommender.grid_zones['anti_diagonal'])
+        self.is_corner = np.isin(numbers, recommender.grid_zones['corner'])
+        self.is_prime = np.isin(numbers, sorted(recommender.primes))
+        self.is_overheated = np.isin(numbers, sorted(recommender.overheated_numbers))
+
+        # 2. 번호쌍 테이블 (상극수 페널티, 궁합수 보너스)
+        # (a < b 위치만 사용, 데이터 버전별 공유 동시 출현 인덱스의 번호쌍 행렬)
+        pair_matrix = np.triu(recommender.tables.cooccurrence.pair_matrix, k=1)
+        upper = np.triu(np.ones((46, 46), dtype=bool), k=1)
+        upper[0, :] = False
+        self.never_appeared = upper & (pair_matrix == 0)
+        self.pair_bonus = np.where(pair_matrix >= 5, pair_matrix * 0.5, 0.0)
+
+        # 상한 계산용 대칭 번호쌍 기여도 (궁합수 보너스 - 상극수 페널티)
+        pair_value = self.pair_bonus - np.where(self.never_appeared, 10, 0)
+        self.pair_value = pair_value + pair_value.T
+
+        # 3. 패턴 테이블
+        self.prime_bonus = np.array([recommender.prime_score_map.get(k, 0) * 0.5 for k in range(7)])
+        self.sum_mean = model.patterns['sum']['mean']
+        self.sum_std = model.patterns['sum']['std']
+
+    def is_valid(self, combos):
+        """기본 유효성 (6개, 1-45 범위, 중복 없음) - _is_valid_combination(strict=False)"""
+        combos = as_combination_array(combos)
+        nums = np.sort(combos, axis=1)
+        in_range = (nums >= 1).all(axis=1) & (nums <= 45).all(axis=1)
+        return in_range & (np.diff(nums, axis=1) > 0).all(axis=1)
+
+    def phase3_mask(self, combos):
+        """Phase 3 제외수 필터 통과 여부 - _check_phase3_constraints"""
+        combos = as_combination_array(combos)
+        nums = np.sort(combos, axis=1)
+
+        # 1. 과열 번호
+        ok = ~self.is_overheated[nums].any(axis=1)
+
+        # 2. 상극수 쌍
+        ok &= ~self.never_appeared[nums[:, PAIR_I], nums[:, PAIR_J]].any(axis=1)
+
+        # 3. 4연속 번호
+        step = np.diff(nums, axis=1) == 1
+        ok &= ~(step[:, :-2] & step[:, 1:-1] & step[:, 2:]).any(axis=1)
+
+        return ok
+
+    def grid_scores(self, combos):
+        """그리드 패턴 점수 - _calculate_grid_score"""
+        combos = as_combination_array(combos)
+        score = np.zeros(len(combos))
+
+        # 1. 위치 기반 가중치 (입력 순서대로 누적)
+        for k in range(6):
+            score += self.grid_unit[combos[:, k]]
+
+        # 2~4. 중간 영역 / 반대 대각선 / 모서리
+        middle_count = self.is_middle[combos].sum(axis=1)
+        score += np.where((middle_count >= 3) & (middle_count <= 4), 20, 0)
+
+        anti_diag_count = self.is_anti_diagonal[combos].sum(axis=1)
+        score += np.where((anti_diag_count >= 1) & (anti_diag_count <= 2), 15, 0)
+
+        corner_count = self.is_corner[combos].sum(axis=1)
+        score -= np.where(corner_count >= 2, 15, 0)
+
+        # 5. 공간적 군집도 (평균 맨해튼 거리)
+        avg_distance = self.spatial_distances(combos)
+        score += np.where((avg_distance >= 4.0) & (avg_distance <= 5.5), 20,
+                          np.where((avg_distance < 3.0) | (avg_distance > 6.0), -10, 0))
+
+        return score
+
+    def spatial_distances(self, combos):
+        """번호들 간 평균 맨해튼 거리 - _calculate_spatial_distance"""
+        return geo.mean_manhattan_distance(as_combination_array(combos))
+
+    def image_scores(self, combos):
+        """이미지 패턴 총점 - ImagePatternAnalysis.calculate_image_score()['total_score']"""
+        combos = as_combination_array(combos)
+
+        # 1. 시각적 밀도 (입력 순서 기준 15쌍 유클리드 거리 평균)
+        avg_distance = geo.mean_euclidean_distance(combos)
+        density_score = np.where((avg_distance >= 3.0) & (avg_distance <= 4.5), 25,
+                                 np.where((avg_distance >= 2.5) & (avg_distance <= 5.0), 15, 5))
+
+        # 2. 4분면 균형
+        quadrant_balance = (geo.quadrant_counts(combos) > 0).sum(axis=1)
+        quadrant_score = np.where(quadrant_balance == 4, 25, np.where(quadrant_balance == 3, 15, 5))
+
+        # 3. 무게중심 균형
+        deviation = geo.center_deviation(*geo.center_of_mass(combos))
+        balance_score = np.where(deviation < 1.0, 25, np.where(deviation < 1.5, 15, 5))
+
+        # 4. 좌우 대칭
+        left_count, right_count = geo.side_counts(combos)
+        symmetry_score = np.where(np.abs(left_count - right_count) <= 1, 25, 10)
+
+        return density_score + quadrant_score + balance_score + symmetry_score
+
+    def scores(self, combos):
+        """조합 종합 점수 - _calculate_combination_score (번호 순서와 무관, 정렬된 조합으로 계산)"""
+        combos = np.sort(as_combination_array(combos), axis=1)
+        nums = combos
+        score = np.zeros(len(combos))
+
+        # 1. 개별 번호 점수 합 (번호 오름차순으로 누적)
+        for k in range(6):
+            score += self.number_score[combos[:, k]]
+
+        # 2. 패턴 보너스 (연속 / 구간 균형 / 홀짝 균형 / 합계 범위)
+        score += np.where((np.diff(nums, axis=1) == 1).any(axis=1), 10, 0)
+
+        sections = (nums - 1) // 15
+        low = (sections == 0).sum(axis=1)
+        mid = (sections == 1).sum(axis=1)
+        high = (sections == 2).sum(axis=1)
+        balanced = (low >= 1) & (low <= 3) & (mid >= 1) & (mid <= 3) & (high >= 1) & (high <= 3)
+        score += np.where(balanced, 15, 0)
+
+        odd = (nums % 2 == 1).sum(axis=1)
+        score += np.where((odd >= 2) & (odd <= 4), 10, 0)
+
+        total = nums.sum(axis=1)
+        in_range = (self.sum_mean - self.sum_std <= total) & (total <= self.sum_mean + self.sum_std)
+        score += np.where(in_range, 10, 0)
+
+        # 3. 그리드 패턴 보너스 (50%)
+        score += self.grid_scores(combos) * 0.5
+
+        # 4. 이미지 패턴 보너스 (30%)
+        score += self.image_scores(combos) * 0.3
+
+        # 5. 궁합수/상극수 (정렬된 조합의 15쌍 순서대로)
+        for i, j in zip(PAIR_I, PAIR_J):
+            a, b = nums[:, i], nums[:, j]
+            score -= np.where(self.never_appeared[a, b], 10, 0)
+            score += self.pair_bonus[a, b]
+
+        # 6. 소수/합성수 패턴 보너스
+        score += self.prime_bonus[self.is_prime[nums].sum(axis=1)]
+
+        return score
+
+    def weighted_scores(self, combos, weights):
+        """가중 합산 점수 (종합 점수 * w_score + 그리드 점수 * w_grid + 이미지 점수 * w_image)
+
+        Args:
+            combos: (M, 6) 번호 배열
+            weights: (w_score, w_grid, w_image)
+        """
+        w_score, w_grid, w_image = weights
+        combos = as_combination_array(combos)
+        total = np.zeros(len(combos))
+        if w_score:
+            total += self.scores(combos) * w_score
+        if w_grid:
+            total += self.grid_scores(combos) * w_grid
+        if w_image:
+            total += self.image_scores(combos) * w_image
+        return total
+
+    def prefix_upper_bounds(self, candidates, prefixes, weights):
+        """부분 조합(prefix)을 완성했을 때 얻을 수 있는 weighted_scores의 상한
+
+        Args:
+            candidates: (n,) 후보 번호 배열 (탐색 순서)
+            prefixes: (P, d) 후보 인덱스 배열 (오름차순), 나머지 6-d개는 마지막 인덱스 뒤에서 선택
+            weights: (w_score, w_grid, w_image)
+
+        Returns:
+            (P,) 상한 (완성 가능한 조합이 없으면 -inf)
+        """
+        w_score, w_grid, w_image = weights
+        candidates = np.asarray(candidates, dtype=np.int64)
+        n = len(candidates)
+        n_prefix, depth = prefixes.shape
+        remaining = 6 - depth
+        nums = candidates[prefixes]
+
+        # 그리드 위치 가중치는 종합 점수에 50% 반영
+        unit_weight = w_score * 0.5 + w_grid
+
+        # 1. 이미 정해진 번호/번호쌍 기여도
+        bounds = w_score * self.number_score[nums].sum(axis=1) + unit_weight * self.grid_unit[nums].sum(axis=1)
+        i, j = geo.pair_indices(depth)
+        bounds += w_score * self.pair_value[nums[:, i], nums[:, j]].sum(axis=1)
+
+        # 2. 추가할 번호의 기여도 (번호 점수 + 그리드 가중치 + prefix 번호와의 쌍) 상위 remaining개
+        value = w_score * self.number_score[candidates] + unit_weight * self.grid_unit[candidates]
+        value = value[None, :] + w_score * self.pair_value[nums][:, :, candidates].sum(axis=1)
+        available = np.arange(n)[None, :] > prefixes[:, -1:]
+        value = np.where(available, value, -np.inf)
+        bounds += -np.sort(-value, axis=1)[:, :remaining].sum(axis=1)
+
+        # 3. 추가할 번호끼리의 쌍: 남은 후보 중 최대 번호쌍 기여도
+        pair_table = self.pair_value[candidates][:, candidates]
+        upper = np.triu(np.ones((n, n), dtype=bool), k=1)
+        suffix_max = np.full(n, -np.inf)
+        for t in range(n - 2):
+            suffix_max[t] = pair_table[t + 1:, t + 1:][upper[t + 1:, t + 1:]].max()
+        n_new_pairs = remaining * (remaining - 1) // 2
+        if n_new_pairs:
+            bounds += w_score * n_new_pairs * np.maximum(suffix_max[prefixes[:, -1]], -1e9)
+
+        # 4. 조합 단위 보너스 상한
+        # 패턴 보너스 45 (연속 10 + 구간 15 + 홀짝 10 + 합계 10), 이미지 100, 소수 보너스 최댓값
+        bounds += w_score * (45 + 100 * 0.3 + self.prime_bonus.max())
+        # 그리드 보너스 55 (중간 20 + 대각선 15 + 군집도 20), prefix에 모서리 2개 이상이면 -15 확정
+        corner_penalty = np.where(self.is_corner[nums].sum(axis=1) >= 2, 15, 0)
+        bounds += (w_score * 0.5 + w_grid) * (55 - corner_penalty)
+        bounds += w_image * 100
+
+        return bounds
+
+    def prefix_phase3_mask(self, candidates, prefixes):
+        """prefix만으로 Phase 3 필터 탈락이 확정되지 않는지 여부 (과열 번호, 상극수 쌍)"""
+        nums = np.asarray(candidates, dtype=np.int64)[prefixes]
+        i, j = geo.pair_indices(nums.shape[1])
+        a = np.minimum(nums[:, i], nums[:, j])
+        b = np.maximum(nums[:, i], nums[:, j])
+        return ~self.is_overheated[nums].any(axis=1) & ~self.never_appeared[a, b].any(axis=1)
+
+
+def top_k_order(index_combos, scores, k):
+    """점수 내림차순, 동점은 탐색 순서(후보 인덱스 사전순) 우선인 상위 k개 위치"""
+    keys = tuple(index_combos.T[::-1]) + (-scores,)
+    return np.lexsort(keys)[:k]
+
+
+def search_top_combinations(scorer, candidates, n_combinations, weights=(1.0, 0.0, 0.0),
+                            leaf_mask_func=None, prefix_mask_func=None, prefix_depth=3, chunk_size=20000):
+    """분기 한정(branch-and-bound) 상위 K개 조합 탐색
+
+    후보 인덱스의 앞 prefix_depth개(prefix)마다 완성 조합 점수의 상한을 구해
+    상한이 높은 prefix부터 완성 조합을 일괄 채점하고, 상한이 현재 K번째 점수보다
+    낮은 prefix는 버린다. 결과(동점 순서 포함)는 combinations(candidates, 6) 전체를
+    채점해 안정 정렬한 결과와 같다.
+
+    Args:
+        scorer: CombinationScorer
+        candidates: 후보 번호 리스트 (탐색 순서)
+        n_combinations: 반환할 조합 수 (K)
+        weights: (w_score, w_grid, w_image) - CombinationScorer.weighted_scores 가중치
+        leaf_mask_func: (M, 6) 번호 배열 -> (M,) bool, 완성 조합 필터 (옵션)
+        prefix_mask_func: (candidates, prefixes) -> (P,) bool, prefix 단계 필터 (옵션)
+        prefix_depth: prefix 길이
+        chunk_size: 한 번에 채점할 완성 조합 수
+
+    Returns:
+        list: 상위 조합 (번호 리스트), 점수 내림차순
+    """
+    candidates = np.asarray(candidates, dtype=np.int64)
+    n = len(candidates)
+    if n < 6 or n_combinations <= 0:
+        return []
+
+    depth = min(prefix_depth, n - 6 + 1, 5)
+    prefixes = np.fromiter(
+        (i for combo in combinations(range(n), depth) for i in combo), dtype=np.int64
+    ).reshape(-1, depth)
+
+    # 점수가 정수(이미지 점수만 사용)이면 상한이 정확하므로 부동소수점 여유값 불필요
+    margin = 1e-6 if weights[0] or weights[1] else 0.0
+    bounds = scorer.prefix_upper_bounds(candidates, prefixes, weights) + margin
+
+    keep = np.isfinite(bounds)
+    if prefix_mask_func is not None:
+        keep &= prefix_mask_func(candidates, prefixes)
+    prefixes, bounds = prefixes[keep], bounds[keep]
+
+    # 상한 내림차순, 동점은 prefix 사전순
+    order = np.lexsort(tuple(prefixes.T[::-1]) + (-bounds,))
+
+    suffix_cache = {}
+
+    def suffixes(last):
+        if last not in suffix_cache:
+            suffix_cache[last] = np.array(list(combinations(range(last + 1, n), 6 - depth)),
+                                          dtype=np.int64).reshape(-1, 6 - depth)
+        return suffix_cache[last]
+
+    top_index = np.empty((0, 6), dtype=np.int64)
+    top_scores = np.empty(0)
+    pending = []
+    pending_size = 0
+
+    def flush():
+        nonlocal top_index, top_scores, pending, pending_size
+        if not pending:
+            return
+        leaves = np.concatenate(pending)
+        pending, pending_size = [], 0
+
+        combos = candidates[leaves]
+        if leaf_mask_func is not None:
+            mask = leaf_mask_func(combos)
+            leaves, combos = leaves[mask], combos[mask]
+
+        merged_index = np.concatenate([top_index, leaves])
+        merged_scores = np.concatenate([top_scores, scorer.weighted_scores(combos, weights)])
+        best = top_k_order(merged_index, merged_scores, n_combinations)
+        top_index, top_scores = merged_index[best], merged_scores[best]
+
+    for pos in order:
+        prefix = prefixes[pos]
+        if len(top_scores) == n_combinations:
+            kth_score = top_scores[-1]
+            if bounds[pos] < kth_score:
+                break  # 이후 prefix의 상한은 모두 더 낮음
+            if bounds[pos] == kth_score and tuple(prefix) > tuple(top_index[-1, :depth]):
+                continue  # 동점이어도 탐색 순서가 뒤라 순위에 들 수 없음
+
+        tail = suffixes(int(prefix[-1]))
+        pending.append(np.hstack([np.broadcast_to(prefix, (len(tail), depth)), tail]))
+        pending_size += len(tail)
+        if pending_size >= chunk_size:
+            flush()
+
+    flush()
+    return candidates[top_index].tolist()
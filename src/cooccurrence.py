@@ -0,0 +1,218 @@
+"""
+당첨번호 동시 출현(co-occurrence) 인덱스
+45x45 번호쌍 출현 횟수 행렬과 C(45,3)=14,190개 3개 조합 출현 횟수 배열을
+데이터 버전(LottoDataLoader.data_fingerprint)별로 한 번만 계산해 공유
+(PatternAnalysis, TripleRecommendation, LottoPredictionModel, LottoRecommendationSystem 공용)
+"""
+from collections import Counter, OrderedDict
+from itertools import combinations
+import numpy as np
+
+
+# 1-45 번호쌍 / 3개 조합 (itertools.combinations 순서) 및 역방향 인덱스
+PAIRS = np.array(list(combinations(range(1, 46), 2)), dtype=np.int64)
+TRIPLETS = np.array(list(combinations(range(1, 46), 3)), dtype=np.int64)
+
+PAIR_INDEX = np.full((46, 46), -1, dtype=np.int64)
+PAIR_INDEX[PAIRS[:, 0], PAIRS[:, 1]] = np.arange(len(PAIRS))
+
+TRIPLET_INDEX = np.full((46, 46, 46), -1, dtype=np.int64)
+TRIPLET_INDEX[TRIPLETS[:, 0], TRIPLETS[:, 1], TRIPLETS[:, 2]] = np.arange(len(TRIPLETS))
+
+# 6개 번호 내 위치 조합 (회차별 15개 쌍, 20개 3개 조합)
+_DRAW_PAIRS = np.array(list(combinations(range(6), 2)), dtype=np.int64)
+_DRAW_TRIPLETS = np.array(list(combinations(range(6), 3)), dtype=np.int64)
+
+for _table in (PAIRS, TRIPLETS, PAIR_INDEX, TRIPLET_INDEX):
+    _table.setflags(write=False)
+
+
+def draw_pair_ids(draws):
+    """(N, 6) 오름차순 당첨번호 -> (N, 15) 회차별 번호쌍 인덱스 (PAIRS 행 번호)"""
+    draws = np.asarray(draws, dtype=np.int64)
+    return PAIR_INDEX[draws[:, _DRAW_PAIRS[:, 0]], draws[:, _DRAW_PAIRS[:, 1]]]
+
+
+def draw_triplet_ids(draws):
+    """(N, 6) 오름차순 당첨번호 -> (N, 20) 회차별 3개 조합 인덱스 (TRIPLETS 행 번호)"""
+    draws = np.asarray(draws, dtype=np.int64)
+    return TRIPLET_INDEX[draws[:, _DRAW_TRIPLETS[:, 0]], draws[:, _DRAW_TRIPLETS[:, 1]],
+                         draws[:, _DRAW_TRIPLETS[:, 2]]]
+
+# 데이터 버전별 인덱스 캐시 (백테스팅처럼 회차별 데이터가 많을 때를 대비해 크기 제한)
+_INDEX_CACHE = OrderedDict()
+_INDEX_CACHE_SIZE = 64
+
+
+class CooccurrenceIndex:
+    """번호쌍 / 3개 조합 동시 출현 인덱스
+
+    Counter로 집계하던 기존 방식과 같은 결과를 내도록, 최신 회차부터 처음
+    등장한 순서(first_seen)를 함께 보관하여 동점 정렬 순서를 재현한다.
+    """
+
+    def __init__(self, incidence, draws):
+        """
+        Args:
+            incidence: (N, 45) 출현 행렬 (최신 회차 우선, LottoDataLoader.incidence)
+            draws: (N, 6) 행별 오름차순 정렬된 당첨번호 (LottoDataLoader.draws)
+        """
+        incidence = np.asarray(incidence, dtype=np.int64)
+        draws = np.asarray(draws, dtype=np.int64)
+
+        # 1. 번호별 출현 횟수 / 번호쌍 출현 횟수 (출현 행렬의 외적 합, 인덱스 = 번호)
+        number_counts = np.zeros(46, dtype=np.int64)
+        number_counts[1:] = incidence.sum(axis=0)
+
+        pair_matrix = np.zeros((46, 46), dtype=np.int64)
+        pair_matrix[1:, 1:] = incidence.T @ incidence
+        np.fill_diagonal(pair_matrix, 0)
+
+        # 2. 3개 조합 출현 횟수 (회차별 20개 조합의 압축 인덱스 집계)
+        pair_ids = draw_pair_ids(draws).ravel()
+        triplet_ids = draw_triplet_ids(draws).ravel()
+        triplet_counts = np.bincount(triplet_ids, minlength=len(TRIPLETS))
+
+        # 3. 최신 회차부터 순회할 때 처음 등장한 위치 (미출현 = 순회 길이)
+        pair_first_seen = self._first_seen(pair_ids, len(PAIRS))
+        triplet_first_seen = self._first_seen(triplet_ids, len(TRIPLETS))
+
+        # 4. 연속 번호 (n, n+1)를 포함한 회차 수
+        consecutive_rounds = int((incidence[:, :-1] & incidence[:, 1:]).any(axis=1).sum())
+
+        self._set_counts(len(draws), number_counts, pair_matrix, triplet_counts,
+                         pair_first_seen, triplet_first_seen, consecutive_rounds)
+
+    @classmethod
+    def from_counts(cls, n_rounds, number_counts, pair_matrix, triplet_counts,
+                    pair_first_seen, triplet_first_seen, consecutive_rounds):
+        """이미 집계된 횟수로 인덱스 구성 (IncrementalTrainingState.cooccurrence_index 용)
+
+        Args:
+            n_rounds: 회차 수
+            number_counts: (46,) 번호별 출현 횟수
+            pair_matrix: (46, 46) 대칭 번호쌍 출현 횟수 (대각선 0)
+            triplet_counts: (C(45,3),) 3개 조합 출현 횟수
+            pair_first_seen / triplet_first_seen: 최신 회차부터 순회할 때 처음 등장한 위치
+            consecutive_rounds: 연속 번호를 포함한 회차 수
+        """
+        index = cls.__new__(cls)
+        index._set_counts(n_rounds, number_counts, pair_matrix, triplet_counts,
+                          pair_first_seen, triplet_first_seen, consecutive_rounds)
+        return index
+
+    def _set_counts(self, n_rounds, number_counts, pair_matrix, triplet_counts,
+                    pair_first_seen, triplet_first_seen, consecutive_rounds):
+        self.n_rounds = n_rounds
+        self.number_counts = np.asarray(number_counts, dtype=np.int64)
+        self.pair_matrix = np.asarray(pair_matrix, dtype=np.int64)
+        self.pair_counts = self.pair_matrix[PAIRS[:, 0], PAIRS[:, 1]]
+        self.triplet_counts = np.asarray(triplet_counts, dtype=np.int64)
+        self.pair_first_seen = np.asarray(pair_first_seen, dtype=np.int64)
+        self.triplet_first_seen = np.asarray(triplet_first_seen, dtype=np.int64)
+        self.consecutive_rounds = int(consecutive_rounds)
+
+        for array in (self.number_counts, self.pair_matrix, self.pair_counts, self.triplet_counts,
+                      self.pair_first_seen, self.triplet_first_seen):
+            array.setflags(write=False)
+
+    @staticmethod
+    def _first_seen(ids, size):
+        first_seen = np.full(size, len(ids), dtype=np.int64)
+        unique_ids, positions = np.unique(ids, return_index=True)
+        first_seen[unique_ids] = positions
+        return first_seen
+
+    @staticmethod
+    def _most_common(keys, counts, first_seen, top_n=None):
+        """Counter.most_common과 같은 순서 (횟수 내림차순, 동점은 처음 등장한 순서)"""
+        appeared = np.flatnonzero(counts > 0)
+        order = appeared[np.lexsort((first_seen[appeared], -counts[appeared]))]
+        if top_n is not None:
+            order = order[:top_n]
+        return [(tuple(int(n) for n in keys[i]), int(counts[i])) for i in order]
+
+    def pair_count(self, a, b):
+        """두 번호가 함께 나온 횟수"""
+        return int(self.pair_matrix[a, b])
+
+    def triplet_count(self, a, b, c):
+        """세 번호가 함께 나온 횟수"""
+        a, b, c = sorted((a, b, c))
+        return int(self.triplet_counts[TRIPLET_INDEX[a, b, c]])
+
+    def most_common_pairs(self, top_n=None):
+        """자주 함께 나온 번호쌍 [((a, b), 횟수), ...]"""
+        return self._most_common(PAIRS, self.pair_counts, self.pair_first_seen, top_n)
+
+    def most_common_triplets(self, top_n=None):
+        """자주 함께 나온 3개 조합 [((a, b, c), 횟수), ...]"""
+        return self._most_common(TRIPLETS, self.triplet_counts, self.triplet_first_seen, top_n)
+
+    def pair_counter(self):
+        """출현한 번호쌍의 Counter (삽입 순서 = 최신 회차부터 처음 등장한 순서)"""
+        appeared = np.flatnonzero(self.pair_counts > 0)
+        appeared = appeared[np.argsort(self.pair_first_seen[appeared], kind='stable')]
+        return Counter({(int(PAIRS[i, 0]), int(PAIRS[i, 1])): int(self.pair_counts[i]) for i in appeared})
+
+    def never_appeared_pairs(self):
+        """한 번도 함께 나오지 않은 번호쌍 목록 (번호 순)"""
+        return [(int(a), int(b)) for a, b in PAIRS[self.pair_counts == 0]]
+
+    def distinct_triplets(self):
+        """한 번 이상 출현한 3개 조합 수"""
+        return int(np.count_nonzero(self.triplet_counts))
+
+    def companions(self, target_number, top_n=None):
+        """특정 번호와 함께 나온 번호 [(번호, 횟수), ...]
+
+        순서는 최신 회차부터 순회하며 동반 번호를 집계한 Counter.most_common과 같다.
+        """
+        others = np.array([n for n in range(1, 46) if n != target_number])
+        lo = np.minimum(others, target_number)
+        hi = np.maximum(others, target_number)
+        pair_ids = PAIR_INDEX[lo, hi]
+        counts = self.pair_counts[pair_ids]
+        appeared = np.flatnonzero(counts > 0)
+        order = appeared[np.lexsort((self.pair_first_seen[pair_ids][appeared], -counts[appeared]))]
+        if top_n is not None:
+            order = order[:top_n]
+        return [(int(others[i]), int(counts[i])) for i in order]
+
+    def consecutive_counts(self):
+        """연속 번호 쌍 (n, n+1) / 3연속 (n, n+1, n+2) 출현 횟수
+
+        Returns:
+            (pairs, triplets): 최신 회차부터 처음 등장한 순서의 [(조합, 횟수), ...]
+        """
+        numbers = np.arange(1, 45)
+        pair_ids = PAIR_INDEX[numbers, numbers + 1]
+        pairs = [((int(numbers[i]), int(numbers[i] + 1)), int(self.pair_counts[pair_ids[i]]))
+                 for i in np.argsort(self.pair_first_seen[pair_ids], kind='stable')
+                 if self.pair_counts[pair_ids[i]] > 0]
+
+        numbers = np.arange(1, 44)
+        triplet_ids = TRIPLET_INDEX[numbers, numbers + 1, numbers + 2]
+        triplets = [((int(numbers[i]), int(numbers[i] + 1), int(numbers[i] + 2)),
+                     int(self.triplet_counts[triplet_ids[i]]))
+                    for i in np.argsort(self.triplet_first_seen[triplet_ids], kind='stable')
+                    if self.triplet_counts[triplet_ids[i]] > 0]
+        return pairs, triplets
+
+
+def get_cooccurrence_index(loader):
+    """데이터 버전별로 공유되는 CooccurrenceIndex 반환 (없으면 생성 후 캐시)
+
+    Args:
+        loader: extract_numbers()가 끝난 LottoDataLoader
+    """
+    key = loader.data_fingerprint()
+    index = _INDEX_CACHE.get(key)
+    if index is None:
+        index = CooccurrenceIndex(loader.incidence, loader.draws)
+        _INDEX_CACHE[key] = index
+        if len(_INDEX_CACHE) > _INDEX_CACHE_SIZE:
+            _INDEX_CACHE.popitem(last=False)
+    else:
+        _INDEX_CACHE.move_to_end(key)
+    return index
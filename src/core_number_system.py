@@ -5,6 +5,7 @@
 import numpy as np
 import random
 from itertools import combinations
+from combination_sampler import make_rng, sample_combinations
 
 
 class CoreNumberSystem:
@@ -105,10 +106,6 @@ class CoreNumberSystem:
         Returns:
             list: 조합 리스트
         """
-        if seed is not None:
-            random.seed(seed)
-            np.random.seed(seed)
-
         n_core = len(core_numbers)
         n_remaining = 6 - n_core
 
@@ -125,35 +122,15 @@ class CoreNumberSystem:
         else:
             candidate_pool = top_numbers
 
-        combinations_list = []
-        max_attempts = 10000
-        attempts = 0
+        # 코어 + 나머지 번호 조합 일괄 생성 (시드가 같으면 같은 결과)
+        combos = sample_combinations(candidate_pool, n_combinations, make_rng(seed), fixed=core_numbers,
+                                     valid_mask_func=self.recommender._get_combination_scorer().is_valid)
 
-        while len(combinations_list) < n_combinations and attempts < max_attempts:
-            # 나머지 번호 선택
-            remaining = random.sample(candidate_pool, n_remaining)
+        # 점수로 정렬 (동점은 생성 순서)
+        scores = self.recommender._cached_combination_scores(combos)
+        order = np.argsort(-scores, kind='stable')[:n_combinations]
 
-            # 코어 + 나머지 조합
-            selected = core_numbers + remaining
-
-            if self.recommender._is_valid_combination(selected):
-                sorted_selected = tuple(sorted(selected))
-                if sorted_selected not in combinations_list:
-                    combinations_list.append(sorted_selected)
-
-            attempts += 1
-
-        # 점수로 정렬
-        scored = []
-        for combo in combinations_list:
-            score = self.recommender._calculate_combination_score(combo)
-            scored.append((combo, score))
-
-        scored.sort(key=lambda x: x[1], reverse=True)
-
-        results = [list(combo) for combo, _ in scored[:n_combinations]]
-
-        return results
+        return combos[order].tolist()
 
     def generate_with_fixed(self, fixed_numbers, n_combinations=5, seed=None):
         """
@@ -209,15 +186,11 @@ class CoreNumberSystem:
 
             attempts += 1
 
-        # 점수로 정렬
-        scored = []
-        for combo in combinations_list:
-            score = self.recommender._calculate_combination_score(combo)
-            scored.append((combo, score))
-
-        scored.sort(key=lambda x: x[1], reverse=True)
+        # 점수로 정렬 (동점은 생성 순서)
+        scores = self.recommender._cached_combination_scores(combinations_list)
+        order = np.argsort(-scores, kind='stable')[:n_combinations]
 
-        results = [list(combo) for combo, _ in scored[:n_combinations]]
+        results = [list(combinations_list[i]) for i in order]
 
         return results
 
@@ -1,27 +1,68 @@
 """
 로또 645 데이터 로더 및 전처리 모듈
 """
+import hashlib
+import json
+import os
+import warnings
 import pandas as pd
 import numpy as np
 from pathlib import Path
 
 
+WINNING_NUMBER_COLUMNS = [f'당첨번호#{i}' for i in range(1, 7)]
+BONUS_NUMBER_COLUMN = '당첨번호#7'
+PRIZE_AMOUNT_COLUMNS = [f'{rank}등 당첨액' for rank in range(1, 6)]
+PRIZE_WINNER_COLUMNS = [f'{rank}등 당첨자수' for rank in range(1, 6)]
+
+# 5등은 1게임당 5,000원 고정 (5등 당첨액이 이보다 크면 1인당 금액이 아닌 등수별 총액으로 기록된 회차)
+FIFTH_PRIZE_AMOUNT = 5000
+
+# 당첨금 정보가 없는 회차에 사용할 등수별 평균 당첨금 (원)
+AVERAGE_PRIZE_AMOUNTS = {1: 2000000000, 2: 50000000, 3: 1500000, 4: 50000, 5: 5000}
+
+# 전처리 결과 스냅샷 형식 버전 (전처리 방식이 바뀌면 올림)
+SNAPSHOT_VERSION = 1
+
+
 class LottoDataLoader:
     """로또 데이터를 로드하고 전처리하는 클래스"""
 
-    def __init__(self, data_path):
+    def __init__(self, data_path, use_snapshot=True):
         """
         Args:
             data_path: CSV 파일 경로
+            use_snapshot: 전처리 결과 바이너리 스냅샷 사용 여부
+                (CSV와 같은 폴더의 <파일명>.snapshot.npy/.json, CSV가 바뀌면 자동 재생성)
         """
         self.data_path = Path(data_path)
+        self.use_snapshot = use_snapshot
         self.df = None
         self.numbers_df = None
+        self._preprocessed = False  # 스냅샷에서 로드하여 전처리가 끝난 상태
+
+        # 컬럼형 당첨번호 배열 (extract_numbers에서 생성, numbers_df와 같은 행 순서 = 최신 회차 우선)
+        self.draws = None           # (N, 6) uint8, 행별 오름차순 정렬된 당첨번호
+        self.incidence = None       # (N, 45) uint8, 번호 n 출현 시 [:, n-1] = 1
+        self.bonus_numbers = None   # (N,) uint8, 보너스 번호
+        self.round_numbers = None   # (N,) int64, 회차 번호
+        self.prize_amounts = None   # (N, 6) int64, [:, 등수] = 1게임 당첨금 (0열 = 낙첨 0원)
+        self._data_fingerprint = None
+        self._rounds_descending = None  # 회차가 최신 우선으로 정렬되어 있는지 (prefix_view용)
 
     def load_data(self):
-        """CSV 데이터 로드"""
+        """CSV 데이터 로드 (CSV가 바뀌지 않았으면 전처리된 스냅샷을 메모리 매핑으로 로드)"""
         print(f"데이터 로딩 중: {self.data_path}")
 
+        self._preprocessed = False
+        if self.use_snapshot:
+            snapshot_df = self._load_snapshot()
+            if snapshot_df is not None:
+                self.df = snapshot_df
+                self._preprocessed = True
+                print(f"✓ 데이터 로드 완료: {len(self.df)}개 회차 (스냅샷)")
+                return self.df
+
         # CSV 파일 읽기 (인코딩 처리)
         # 첫 번째 행은 깨진 헤더이므로 건너뛰고, 두 번째 행을 헤더로 사용
         try:
@@ -36,6 +77,11 @@ class LottoDataLoader:
         """데이터 전처리"""
         print("\n데이터 전처리 중...")
 
+        # 스냅샷에서 로드한 경우 이미 전처리된 상태
+        if self._preprocessed:
+            print(f"✓ 전처리 완료")
+            return self.df
+
         # 숫자 컬럼에서 쉼표 제거 및 숫자 변환
         numeric_columns = [
             '1등 당첨자수', '1등 당첨액', '2등 당첨자수', '2등 당첨액',
@@ -56,59 +102,197 @@ class LottoDataLoader:
         # 결측치 제거
         self.df = self.df.dropna(subset=['회차'])
 
+        self._preprocessed = True
+        if self.use_snapshot:
+            self._save_snapshot(self.df)
+
         print(f"✓ 전처리 완료")
         return self.df
 
+    def _snapshot_paths(self):
+        """스냅샷 데이터(.npy)와 메타데이터(.json) 경로"""
+        stem = self.data_path.stem
+        return (self.data_path.with_name(f"{stem}.snapshot.npy"),
+                self.data_path.with_name(f"{stem}.snapshot.json"))
+
+    def _csv_sha256(self):
+        digest = hashlib.sha256()
+        with open(self.data_path, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 20), b''):
+                digest.update(block)
+        return digest.hexdigest()
+
+    def _load_snapshot(self):
+        """CSV와 일치하는 스냅샷(.npy 구조화 배열)이 있으면 전처리된 DataFrame 반환 (없거나 오래되면 None)
+
+        CSV의 수정 시각/크기가 기록과 같으면 바로 사용하고, 수정 시각만 다르면
+        내용 해시(sha256)를 비교하여 같을 때 기록을 갱신한 뒤 사용한다.
+        """
+        data_file, meta_file = self._snapshot_paths()
+        if not data_file.exists() or not meta_file.exists():
+            return None
+
+        try:
+            with open(meta_file, 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+            stat = self.data_path.stat()
+
+            if meta.get('version') != SNAPSHOT_VERSION or meta.get('csv_size') != stat.st_size:
+                return None
+
+            if meta.get('csv_mtime_ns') != stat.st_mtime_ns:
+                if meta.get('csv_sha256') != self._csv_sha256():
+                    return None
+                meta['csv_mtime_ns'] = stat.st_mtime_ns
+                self._write_atomic(meta_file, lambda f: f.write(json.dumps(meta, ensure_ascii=False).encode('utf-8')))
+
+            # DataFrame은 컬럼별 연속 배열로 복사해 보관하므로 메모리 맵 없이 파일을 한 번에 읽는다
+            # (메모리 맵은 복사 후에도 파일을 열어 두어 스냅샷 교체를 막을 수 있음)
+            records = np.load(data_file, allow_pickle=False)
+            df = pd.DataFrame({column: records[column] for column in meta['columns']},
+                              index=pd.Index(records['__index__']))
+            return df
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def _save_snapshot(self, df):
+        """전처리된 DataFrame을 구조화 배열(.npy) + 메타데이터(.json)로 저장 (실패 시 무시)"""
+        if any(df[column].dtype == object for column in df.columns):
+            return  # 문자열 등 object 컬럼은 고정 크기 배열로 저장하지 않음
+
+        data_file, meta_file = self._snapshot_paths()
+        try:
+            columns = list(df.columns)
+            dtype = [('__index__', np.int64)] + [(column, df[column].dtype) for column in columns]
+            records = np.empty(len(df), dtype=dtype)
+            records['__index__'] = df.index.to_numpy(dtype=np.int64)
+            for column in columns:
+                records[column] = df[column].to_numpy()
+
+            stat = self.data_path.stat()
+            meta = {
+                'version': SNAPSHOT_VERSION,
+                'csv_size': stat.st_size,
+                'csv_mtime_ns': stat.st_mtime_ns,
+                'csv_sha256': self._csv_sha256(),
+                'columns': columns,
+            }
+
+            with warnings.catch_warnings():
+                # 한글 필드명은 .npy 3.0 형식으로 저장됨 (NumPy >= 1.17 필요 경고 무시)
+                warnings.simplefilter('ignore', UserWarning)
+                self._write_atomic(data_file, lambda f: np.save(f, records, allow_pickle=False))
+            self._write_atomic(meta_file, lambda f: f.write(json.dumps(meta, ensure_ascii=False).encode('utf-8')))
+        except (OSError, TypeError, ValueError):
+            pass
+
+    @staticmethod
+    def _write_atomic(path, write):
+        """임시 파일에 쓴 뒤 교체 (동시에 읽는 프로세스가 불완전한 파일을 보지 않음)"""
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        with open(tmp_path, 'wb') as f:
+            write(f)
+        os.replace(tmp_path, path)
+
     def extract_numbers(self):
-        """당첨번호 추출하여 별도 데이터프레임 생성"""
+        """당첨번호 추출하여 별도 데이터프레임 생성
+
+        numbers_df와 함께 분석 모듈이 공유하는 컬럼형 배열(draws, incidence,
+        bonus_numbers, round_numbers)을 한 번에 만든다.
+        """
         print("당첨번호 추출 중...")
 
-        numbers_data = []
-
-        for idx, row in self.df.iterrows():
-            round_num = row['회차']
-            date = row['일자']
-
-            # 당첨번호 6개
-            winning_numbers = [
-                int(row['당첨번호#1']),
-                int(row['당첨번호#2']),
-                int(row['당첨번호#3']),
-                int(row['당첨번호#4']),
-                int(row['당첨번호#5']),
-                int(row['당첨번호#6'])
-            ]
-
-            # 보너스 번호
-            bonus_number = int(row['당첨번호#7'])
-
-            numbers_data.append({
-                '회차': round_num,
-                '일자': date,
-                '당첨번호': sorted(winning_numbers),
-                '보너스번호': bonus_number,
-                '번호1': winning_numbers[0],
-                '번호2': winning_numbers[1],
-                '번호3': winning_numbers[2],
-                '번호4': winning_numbers[3],
-                '번호5': winning_numbers[4],
-                '번호6': winning_numbers[5],
-            })
+        # 당첨번호 6개 (CSV 원본 순서) 및 보너스 번호
+        raw_numbers = self.df[WINNING_NUMBER_COLUMNS].to_numpy(dtype=np.int64)
+        bonus_numbers = self.df[BONUS_NUMBER_COLUMN].to_numpy(dtype=np.int64)
+        sorted_numbers = np.sort(raw_numbers, axis=1)
+
+        numbers_data = {
+            '회차': self.df['회차'].to_numpy(),
+            '일자': self.df['일자'].to_numpy(),
+            '당첨번호': sorted_numbers.tolist(),
+            '보너스번호': bonus_numbers,
+        }
+        for i in range(6):
+            numbers_data[f'번호{i+1}'] = raw_numbers[:, i]
 
         self.numbers_df = pd.DataFrame(numbers_data)
+        self._build_draw_arrays(sorted_numbers, bonus_numbers, self._per_winner_prizes())
+
         print(f"✓ 당첨번호 추출 완료")
         return self.numbers_df
 
-    def get_all_numbers_flat(self, include_bonus=False):
-        """모든 당첨번호를 1차원 리스트로 반환"""
-        all_numbers = []
+    def _per_winner_prizes(self):
+        """회차별 등수당 1게임 당첨금 (N, 6) 배열 (0열은 낙첨 0원)
+
+        최근 업데이트된 일부 회차는 당첨액이 등수별 총액으로 기록되어 있어
+        당첨자 수로 나눠 1인당 금액으로 맞추고, 정보가 없으면 평균 당첨금을 사용한다.
+        """
+        n_rounds = len(self.df)
+        prizes = np.zeros((n_rounds, 6), dtype=np.int64)
+
+        if not all(col in self.df.columns for col in PRIZE_AMOUNT_COLUMNS):
+            for rank, amount in AVERAGE_PRIZE_AMOUNTS.items():
+                prizes[:, rank] = amount
+            return prizes
+
+        amounts = self.df[PRIZE_AMOUNT_COLUMNS].to_numpy(dtype=np.float64)
+        if all(col in self.df.columns for col in PRIZE_WINNER_COLUMNS):
+            winners = self.df[PRIZE_WINNER_COLUMNS].to_numpy(dtype=np.float64)
+            is_total = amounts[:, 4] > FIFTH_PRIZE_AMOUNT
+            divisor = np.where(is_total[:, None] & (winners > 0), winners, 1.0)
+            amounts = amounts / divisor
+
+        amounts = np.nan_to_num(amounts, nan=0.0)
+        for rank, amount in AVERAGE_PRIZE_AMOUNTS.items():
+            prizes[:, rank] = np.where(amounts[:, rank - 1] > 0, np.floor(amounts[:, rank - 1]), amount)
+        return prizes
+
+    def _build_draw_arrays(self, sorted_numbers, bonus_numbers, prize_amounts):
+        """numbers_df와 같은 행 순서의 읽기 전용 NumPy 배열 생성
+
+        배열은 읽기 전용으로 고정하여 여러 분석 모듈이 복사 없이 공유한다.
+        uint8 배열끼리의 덧셈은 오버플로우가 날 수 있으므로 합계는 np.sum 또는
+        int 형변환 후 계산한다.
+        """
+        n_rounds = len(sorted_numbers)
+
+        draws = np.ascontiguousarray(sorted_numbers, dtype=np.uint8)
+        incidence = np.zeros((n_rounds, 45), dtype=np.uint8)
+        incidence[np.arange(n_rounds)[:, None], sorted_numbers - 1] = 1
 
-        for _, row in self.numbers_df.iterrows():
-            all_numbers.extend(row['당첨번호'])
-            if include_bonus:
-                all_numbers.append(row['보너스번호'])
+        self.draws = draws
+        self.incidence = incidence
+        self.bonus_numbers = np.ascontiguousarray(bonus_numbers, dtype=np.uint8)
+        self.round_numbers = self.numbers_df['회차'].to_numpy(dtype=np.int64)
+        self.prize_amounts = np.ascontiguousarray(prize_amounts, dtype=np.int64)
 
-        return all_numbers
+        for array in (self.draws, self.incidence, self.bonus_numbers, self.round_numbers, self.prize_amounts):
+            array.setflags(write=False)
+
+        self._data_fingerprint = None
+        self._rounds_descending = None
+
+    def round_rows(self, rounds):
+        """회차 번호 목록 -> 컬럼형 배열(draws 등)의 행 인덱스
+
+        Raises:
+            KeyError: 데이터에 없는 회차가 포함된 경우
+        """
+        rounds = np.asarray(rounds, dtype=np.int64)
+        order = np.argsort(self.round_numbers, kind='stable')
+        pos = np.searchsorted(self.round_numbers, rounds, sorter=order)
+        rows = order[np.minimum(pos, len(order) - 1)]
+        missing = self.round_numbers[rows] != rounds
+        if missing.any():
+            raise KeyError(f"데이터에 없는 회차: {rounds[missing].tolist()}")
+        return rows
+
+    def get_all_numbers_flat(self, include_bonus=False):
+        """모든 당첨번호를 1차원 리스트로 반환"""
+        if include_bonus:
+            return np.column_stack([self.draws, self.bonus_numbers]).ravel().tolist()
+        return self.draws.ravel().tolist()
 
     def load_data_until_round(self, max_round):
         """특정 회차까지만 데이터 로드 (백테스팅용)
@@ -128,6 +312,93 @@ class LottoDataLoader:
         self.extract_numbers()
         return self
 
+    def slice_until_round(self, max_round):
+        """특정 회차까지만 포함하는 새 로더 반환 (CSV 재로딩 없이 현재 데이터에서 잘라냄)
+
+        load_data_until_round와 같은 데이터를 만들지만, 이미 전처리된 데이터를
+        재사용하므로 백테스팅처럼 회차마다 학습 데이터를 만드는 경우에 사용한다.
+
+        Args:
+            max_round: 최대 회차 번호 (포함)
+
+        Returns:
+            LottoDataLoader: 잘라낸 데이터를 가진 새 로더
+        """
+        mask = self.round_numbers <= max_round
+
+        sliced = LottoDataLoader(self.data_path)
+        sliced.df = self.df[self.df['회차'] <= max_round].copy()
+        sliced.numbers_df = self.numbers_df[mask].reset_index(drop=True)
+        sliced._build_draw_arrays(self.draws[mask], self.bonus_numbers[mask], self.prize_amounts[mask])
+        return sliced
+
+    def prefix_view(self, max_round, fingerprint=None):
+        """특정 회차까지만 포함하는 읽기 전용 로더 반환 (데이터 복사 없음)
+
+        slice_until_round와 같은 데이터를 가지지만, 회차가 최신 우선으로 정렬되어 있으면
+        배열/DataFrame의 뒷부분을 그대로 참조하므로 워크포워드 백테스팅처럼 회차마다
+        학습 데이터를 만드는 경우에 사용한다. 반환된 로더의 데이터는 수정하지 않는다.
+
+        Args:
+            max_round: 최대 회차 번호 (포함)
+            fingerprint: 잘라낸 데이터의 지문 (옵션, 예: cumulative_fingerprints()[마지막 회차])
+                - 주어지면 data_fingerprint()가 데이터를 다시 해시하지 않고 이 값을 사용
+
+        Returns:
+            LottoDataLoader: 잘라낸 데이터를 참조하는 새 로더
+        """
+        if self._rounds_descending is None:
+            self._rounds_descending = bool(np.all(np.diff(self.round_numbers) <= 0))
+        if not self._rounds_descending:
+            view = self.slice_until_round(max_round)
+        else:
+            start = int(np.searchsorted(-self.round_numbers, -max_round, side='left'))
+
+            view = LottoDataLoader(self.data_path)
+            view.df = self.df.iloc[start:]
+            view.numbers_df = self.numbers_df.iloc[start:]
+            view.numbers_df.index = pd.RangeIndex(len(view.numbers_df))
+            view.draws = self.draws[start:]
+            view.incidence = self.incidence[start:]
+            view.bonus_numbers = self.bonus_numbers[start:]
+            view.round_numbers = self.round_numbers[start:]
+            view.prize_amounts = self.prize_amounts[start:]
+            view._rounds_descending = True
+
+        view._data_fingerprint = fingerprint
+        return view
+
+    def data_fingerprint(self):
+        """현재 데이터 전체(회차/당첨번호/보너스번호)의 sha256 지문
+
+        같은 데이터로 만든 로더는 같은 지문을 가지므로, 데이터에만 의존하는
+        분석 결과를 여러 인스턴스가 공유할 때 캐시 키로 사용한다.
+        """
+        if self._data_fingerprint is None:
+            digest = hashlib.sha256()
+            for array in (self.round_numbers.astype('<i8'), self.draws, self.bonus_numbers):
+                digest.update(np.ascontiguousarray(array).tobytes())
+            self._data_fingerprint = digest.hexdigest()
+        return self._data_fingerprint
+
+    def cumulative_fingerprints(self):
+        """회차별 누적 데이터 지문 (첫 회차부터 해당 회차까지의 당첨번호/보너스번호 sha256 체인)
+
+        같은 회차까지의 데이터가 같으면 지문도 같으므로, 이후 회차가 추가되어도
+        이전 회차의 지문은 바뀌지 않는다. 백테스팅 결과 캐시 키에 사용한다.
+
+        Returns:
+            dict: {회차: 16진수 지문}
+        """
+        fingerprints = {}
+        digest = b''
+        for i in np.argsort(self.round_numbers, kind='stable'):
+            record = np.concatenate([self.round_numbers[i:i+1].astype('<i8').view(np.uint8),
+                                     self.draws[i], self.bonus_numbers[i:i+1]])
+            digest = hashlib.sha256(digest + record.tobytes()).digest()
+            fingerprints[int(self.round_numbers[i])] = digest.hex()
+        return fingerprints
+
     def get_round_data(self, round_num):
         """특정 회차의 당첨번호 반환
 
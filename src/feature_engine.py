@@ -0,0 +1,181 @@
+"""
+로또 645 번호별 특징 추출 엔진
+당첨번호 출현 행렬(incidence)에서 45개 번호의 특징을 한 번에 계산
+"""
+import numpy as np
+
+
+# 번호 점수 성분 (LottoPredictionModel.weights 키 순서)
+# 성분 점수 = min(특징 / 기준값 * 가중치, 가중치)  (트렌드 성분은 상한 없음)
+WEIGHT_KEYS = ('freq_weight', 'trend_weight', 'absence_weight', 'hotness_weight')
+SCORE_FEATURES = ('total_frequency', 'recent_50_frequency', 'absence_length', 'hotness_score')
+SCORE_SCALES = (100, 50, 20, 10)
+SCORE_CAPPED = np.array([True, False, True, True])
+
+
+def number_sections(numbers):
+    """번호 배열의 구간 반환 (0: 저구간 1-15, 1: 중구간 16-30, 2: 고구간 31-45)"""
+    return (np.asarray(numbers) - 1) // 15
+
+
+def compute_feature_arrays(incidence):
+    """번호별 특징을 (45,) 배열로 계산
+
+    Args:
+        incidence: (N, 45) 출현 행렬, 행 순서는 최신 회차 우선 (numbers_df와 동일)
+
+    Returns:
+        dict: 특징 이름 -> (45,) 배열
+            total_frequency, recent_100_frequency, recent_50_frequency,
+            absence_length, appearance_count, avg_interval, std_interval
+    """
+    incidence = np.asarray(incidence)
+    n_rounds = incidence.shape[0]
+    present = incidence.astype(bool)
+
+    # 1~3. 전체/최근 100회/최근 50회 출현 빈도
+    total_frequency = present.sum(axis=0)
+    recent_100_frequency = present[:100].sum(axis=0)
+    recent_50_frequency = present[:50].sum(axis=0)
+
+    # 4. 마지막 출현 이후 경과 회차 (최신 행부터 첫 출현 위치, 미출현 시 전체 회차 수)
+    first_seen = present.argmax(axis=0)
+    absence_length = np.where(total_frequency > 0, first_seen, n_rounds)
+
+    # 5. 출현 간격 (최신 -> 과거 순으로 나열한 출현 위치의 차이: a[i] - a[i+1])
+    # 번호별 출현 위치를 번호 순으로 이어 붙인 뒤 번호 경계에서 분할
+    # (각 그룹의 마지막 원소는 다음 번호와의 경계 차이이므로 앞의 k-1개만 사용)
+    _, row_idx = np.nonzero(present.T)
+    intervals = -np.diff(row_idx)
+    interval_groups = np.split(intervals, np.cumsum(total_frequency)[:-1])
+
+    avg_interval = np.zeros(45, dtype=np.float64)
+    std_interval = np.zeros(45, dtype=np.float64)
+    for i in range(45):
+        if total_frequency[i] > 1:
+            group = interval_groups[i][:total_frequency[i] - 1]
+            avg_interval[i] = np.mean(group)
+            std_interval[i] = np.std(group)
+
+    return {
+        'total_frequency': total_frequency,
+        'recent_100_frequency': recent_100_frequency,
+        'recent_50_frequency': recent_50_frequency,
+        'absence_length': absence_length,
+        'appearance_count': total_frequency,
+        'avg_interval': avg_interval,
+        'std_interval': std_interval,
+    }
+
+
+def build_number_features(feature_arrays):
+    """특징 배열을 LottoPredictionModel.number_features 형식의 딕셔너리로 변환
+
+    Args:
+        feature_arrays: compute_feature_arrays 반환값
+
+    Returns:
+        dict: {번호: {'number', 'total_frequency', ..., 'hotness_score'}}
+    """
+    features = {}
+
+    for num in range(1, 46):
+        i = num - 1
+        total_freq = int(feature_arrays['total_frequency'][i])
+        recent_freq = int(feature_arrays['recent_100_frequency'][i])
+        recent_50_freq = int(feature_arrays['recent_50_frequency'][i])
+        absence_length = int(feature_arrays['absence_length'][i])
+
+        if feature_arrays['appearance_count'][i] > 1:
+            avg_interval = feature_arrays['avg_interval'][i]
+            std_interval = feature_arrays['std_interval'][i]
+        else:
+            avg_interval = 0
+            std_interval = 0
+
+        features[num] = {
+            'number': num,
+            'total_frequency': total_freq,
+            'recent_100_frequency': recent_freq,
+            'recent_50_frequency': recent_50_freq,
+            'absence_length': absence_length,
+            'avg_interval': avg_interval,
+            'std_interval': std_interval,
+            'section': int(number_sections(num)),
+            'odd_even': num % 2,
+            'hotness_score': recent_50_freq / (absence_length + 1) * 100  # 핫넘버 점수
+        }
+
+    return features
+
+
+def extract_number_features(incidence):
+    """출현 행렬에서 번호별 특징 딕셔너리 생성"""
+    return build_number_features(compute_feature_arrays(incidence))
+
+
+def weight_matrix(weights_list):
+    """가중치 딕셔너리 목록을 (K, 4) 배열로 변환 (WEIGHT_KEYS 순서)"""
+    return np.array([[weights[key] for key in WEIGHT_KEYS] for weights in weights_list], dtype=np.float64)
+
+
+def score_ratio_matrix(number_features):
+    """가중치 적용 전 점수 성분 비율 (46, 4) 배열 (인덱스 = 번호, 0번 행은 0)
+
+    Args:
+        number_features: build_number_features 형식의 번호별 특징
+    """
+    ratios = np.zeros((46, 4), dtype=np.float64)
+    for num in range(1, 46):
+        features = number_features[num]
+        for k, (name, scale) in enumerate(zip(SCORE_FEATURES, SCORE_SCALES)):
+            ratios[num, k] = features[name] / scale
+    return ratios
+
+
+def weighted_score_components(ratios, weights):
+    """성분 비율에 가중치를 적용한 성분 점수
+
+    Args:
+        ratios: (..., 46, 4) 성분 비율 (score_ratio_matrix)
+        weights: (K, 4) 가중치 행렬
+
+    Returns:
+        (..., K, 46, 4) 성분 점수 (LottoPredictionModel.calculate_number_scores와 같은 계산식)
+    """
+    ratios = np.asarray(ratios, dtype=np.float64)[..., None, :, :]
+    weights = np.asarray(weights, dtype=np.float64)[:, None, :]
+    components = ratios * weights
+    return np.where(SCORE_CAPPED, np.minimum(components, weights), components)
+
+
+def weighted_number_scores(ratios, weights):
+    """여러 가중치 벡터로 번호별 총점을 한 번에 계산
+
+    (46, 4) 성분 비율과 (K, 4) 가중치의 곱을 성분 순서대로 더한다
+    (빈도 + 트렌드 + 부재 + 핫넘버, calculate_number_scores와 같은 덧셈 순서라 결과가 비트 단위로 같음).
+
+    Args:
+        ratios: (..., 46, 4) 성분 비율 (score_ratio_matrix)
+        weights: (K, 4) 가중치 행렬
+
+    Returns:
+        (..., K, 46) 번호별 총점 (0번 열은 0)
+    """
+    components = weighted_score_components(ratios, weights)
+    return ((components[..., 0] + components[..., 1]) + components[..., 2]) + components[..., 3]
+
+
+def rank_numbers(scores, n=None):
+    """총점 내림차순 번호 순위 (동점은 작은 번호 우선, get_top_numbers와 같은 순서)
+
+    Args:
+        scores: (..., 46) 번호별 총점 (weighted_number_scores)
+        n: 상위 개수 (None이면 45개 전체)
+
+    Returns:
+        (..., n) 번호 배열
+    """
+    scores = np.asarray(scores)[..., 1:]
+    order = np.argsort(-scores, axis=-1, kind='stable') + 1
+    return order if n is None else order[..., :n]
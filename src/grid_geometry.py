@@ -0,0 +1,99 @@
+"""
+복권 용지 7x7 그리드 기하 테이블
+번호 좌표, 4분면, 구역, 좌우 구분, 45x45 번호쌍 거리를 모듈 로드 시 한 번만 계산해 공유
+(LottoRecommendationSystem, ImagePatternAnalysis, GridPatternAnalysis, analytics_bundle 공용)
+"""
+from types import MappingProxyType
+
+import numpy as np
+
+
+GRID_ROWS = 7
+GRID_COLS = 7
+
+# 번호 <-> 그리드 좌표 (1-45, 행 우선 배치, 모든 모듈이 공유하므로 읽기 전용 매핑)
+NUMBER_TO_POSITION = MappingProxyType(
+    {num: ((num - 1) // GRID_COLS, (num - 1) % GRID_COLS) for num in range(1, 46)})
+POSITION_TO_NUMBER = MappingProxyType({pos: num for num, pos in NUMBER_TO_POSITION.items()})
+
+# 번호별 벡터 (인덱스 = 번호, 0번은 사용하지 않음)
+GRID_ROW = np.array([0] + [NUMBER_TO_POSITION[num][0] for num in range(1, 46)], dtype=np.int64)
+GRID_COL = np.array([0] + [NUMBER_TO_POSITION[num][1] for num in range(1, 46)], dtype=np.int64)
+
+# 4분면 (0: Q1 왼쪽 위, 1: Q2 오른쪽 위, 2: Q3 왼쪽 아래, 3: Q4 오른쪽 아래)
+QUADRANT = (GRID_ROW >= 3.5).astype(np.int64) * 2 + (GRID_COL >= 3.5)
+QUADRANT_NAMES = ['Q1', 'Q2', 'Q3', 'Q4']
+
+# 좌우 구분 (-1: 왼쪽 col < 3, 0: 가운데 열, 1: 오른쪽 col > 3)
+SIDE = np.sign(GRID_COL - 3)
+
+# 구역 (0: 모서리, 1: 가장자리, 2: 중간 영역, 3: 중앙부 - 2~4행 x 2~4열)
+ZONE_NAMES = ('corner', 'edge', 'middle', 'center')
+_rows, _cols = np.indices((GRID_ROWS, GRID_COLS))
+_outer_row = (_rows == 0) | (_rows == GRID_ROWS - 1)
+_outer_col = (_cols == 0) | (_cols == GRID_COLS - 1)
+_inner = (_rows >= 2) & (_rows <= 4) & (_cols >= 2) & (_cols <= 4)
+POSITION_ZONE = np.select([_outer_row & _outer_col, _outer_row | _outer_col, _inner], [0, 1, 3], default=2)
+ZONE = POSITION_ZONE[GRID_ROW, GRID_COL]  # 번호별 구역 (인덱스 = 번호)
+
+# 번호쌍 거리 테이블 (46 x 46)
+_row_diff = GRID_ROW[:, None] - GRID_ROW[None, :]
+_col_diff = GRID_COL[:, None] - GRID_COL[None, :]
+MANHATTAN_DISTANCE = np.abs(_row_diff) + np.abs(_col_diff)
+EUCLIDEAN_DISTANCE = np.sqrt(_row_diff ** 2 + _col_diff ** 2)
+
+for _table in (GRID_ROW, GRID_COL, QUADRANT, SIDE, POSITION_ZONE, ZONE, MANHATTAN_DISTANCE, EUCLIDEAN_DISTANCE):
+    _table.setflags(write=False)
+
+
+def pair_indices(k):
+    """k개 번호 내 번호쌍의 위치 인덱스 (i < j, itertools.combinations 순서)"""
+    return np.triu_indices(k, k=1)
+
+
+def pairwise_distances(numbers, table):
+    """번호 배열의 모든 번호쌍 거리
+
+    Args:
+        numbers: (k,) 또는 (M, k) 번호 배열 (입력 순서 기준으로 쌍 구성)
+        table: MANHATTAN_DISTANCE 또는 EUCLIDEAN_DISTANCE
+
+    Returns:
+        (k*(k-1)/2,) 또는 (M, k*(k-1)/2) 거리 배열
+    """
+    numbers = np.asarray(numbers, dtype=np.int64)
+    i, j = pair_indices(numbers.shape[-1])
+    return table[numbers[..., i], numbers[..., j]]
+
+
+def mean_manhattan_distance(numbers):
+    """번호들 간 평균 맨해튼 거리 ((k,) -> 스칼라, (M, k) -> (M,))"""
+    return np.mean(pairwise_distances(numbers, MANHATTAN_DISTANCE), axis=-1)
+
+
+def mean_euclidean_distance(numbers):
+    """번호들 간 평균 유클리드 거리 ((k,) -> 스칼라, (M, k) -> (M,))"""
+    return np.mean(pairwise_distances(numbers, EUCLIDEAN_DISTANCE), axis=-1)
+
+
+def quadrant_counts(numbers):
+    """4분면별 번호 개수 ((k,) -> (4,), (M, k) -> (M, 4))"""
+    quadrants = QUADRANT[np.asarray(numbers, dtype=np.int64)]
+    return np.stack([(quadrants == q).sum(axis=-1) for q in range(4)], axis=-1)
+
+
+def center_of_mass(numbers):
+    """번호들의 무게중심 (행 평균, 열 평균)"""
+    numbers = np.asarray(numbers, dtype=np.int64)
+    return np.mean(GRID_ROW[numbers], axis=-1), np.mean(GRID_COL[numbers], axis=-1)
+
+
+def center_deviation(center_row, center_col):
+    """무게중심과 이상적 중심 (3, 3) 사이의 거리"""
+    return np.sqrt((center_row - 3) ** 2 + (center_col - 3) ** 2)
+
+
+def side_counts(numbers):
+    """왼쪽(col < 3) / 오른쪽(col > 3) 번호 개수"""
+    sides = SIDE[np.asarray(numbers, dtype=np.int64)]
+    return (sides < 0).sum(axis=-1), (sides > 0).sum(axis=-1)
@@ -8,6 +8,8 @@ import matplotlib.pyplot as plt
 import seaborn as sns
 from collections import Counter, defaultdict
 from data_loader import LottoDataLoader
+from grid_geometry import (NUMBER_TO_POSITION, POSITION_TO_NUMBER, POSITION_ZONE, ZONE_NAMES, MANHATTAN_DISTANCE,
+                           pairwise_distances)
 import os
 
 
@@ -23,17 +25,11 @@ class GridPatternAnalysis:
         self.rows = 7
         self.cols = 7
 
-        # 번호를 그리드 좌표로 매핑 (1-45)
-        self.number_to_position = {}
-        number = 1
-        for row in range(self.rows):
-            for col in range(self.cols):
-                if number <= 45:
-                    self.number_to_position[number] = (row, col)
-                    number += 1
+        # 번호를 그리드 좌표로 매핑 (1-45, grid_geometry 공용 읽기 전용 테이블)
+        self.number_to_position = NUMBER_TO_POSITION
 
         # 역매핑
-        self.position_to_number = {v: k for k, v in self.number_to_position.items()}
+        self.position_to_number = POSITION_TO_NUMBER
 
         # 위치별 출현 빈도 초기화
         self.position_heatmap = np.zeros((self.rows, self.cols))
@@ -44,19 +40,8 @@ class GridPatternAnalysis:
         return self.number_to_position.get(number, None)
 
     def get_zone(self, row, col):
-        """그리드 위치의 구역 반환 (모서리, 가장자리, 중앙 등)"""
-        # 모서리
-        if (row, col) in [(0, 0), (0, 6), (6, 0), (6, 6)]:
-            return "corner"
-        # 가장자리
-        elif row == 0 or row == 6 or col == 0 or col == 6:
-            return "edge"
-        # 중앙부
-        elif 2 <= row <= 4 and 2 <= col <= 4:
-            return "center"
-        # 중간 영역
-        else:
-            return "middle"
+        """그리드 위치의 구역 반환 (모서리, 가장자리, 중앙 등, grid_geometry 공용 테이블)"""
+        return ZONE_NAMES[POSITION_ZONE[row, col]]
 
     def analyze_position_frequency(self):
         """위치별 출현 빈도 분석"""
@@ -219,28 +204,19 @@ class GridPatternAnalysis:
 
         clustering_scores = []
 
-        for idx, row in self.loader.numbers_df.iterrows():
-            winning_numbers = row['당첨번호']
-            positions = [self.get_position(num) for num in winning_numbers]
-
-            # 위치 간 거리 계산 (맨해튼 거리)
-            distances = []
-            for i in range(len(positions)):
-                for j in range(i+1, len(positions)):
-                    if positions[i] and positions[j]:
-                        r1, c1 = positions[i]
-                        r2, c2 = positions[j]
-                        dist = abs(r1 - r2) + abs(c1 - c2)
-                        distances.append(dist)
-
-            if distances:
-                avg_distance = np.mean(distances)
-                clustering_scores.append({
-                    'round': row['회차'],
-                    'avg_distance': avg_distance,
-                    'min_distance': min(distances),
-                    'max_distance': max(distances)
-                })
+        # 회차별 15쌍 맨해튼 거리 (N, 15)
+        distances = pairwise_distances(self.loader.draws, MANHATTAN_DISTANCE)
+        mean_distances = np.mean(distances, axis=1)
+        min_distances = distances.min(axis=1)
+        max_distances = distances.max(axis=1)
+
+        for i, round_num in enumerate(self.loader.numbers_df['회차']):
+            clustering_scores.append({
+                'round': round_num,
+                'avg_distance': mean_distances[i],
+                'min_distance': int(min_distances[i]),
+                'max_distance': int(max_distances[i])
+            })
 
         # 통계
         avg_distances = [s['avg_distance'] for s in clustering_scores]
@@ -8,6 +8,7 @@ from collections import Counter, defaultdict
 from PIL import Image
 import os
 import glob
+import grid_geometry as geo
 
 
 class ImagePatternAnalysis:
@@ -21,14 +22,9 @@ class ImagePatternAnalysis:
         self.loader = loader
         self.images_folder = "../images"
 
-        # 7x7 그리드 매핑
-        self.position_to_number = {}
-        self.number_to_position = {}
-        for num in range(1, 46):
-            row = (num - 1) // 7
-            col = (num - 1) % 7
-            self.position_to_number[(row, col)] = num
-            self.number_to_position[num] = (row, col)
+        # 7x7 그리드 매핑 (grid_geometry 공용 읽기 전용 테이블)
+        self.position_to_number = geo.POSITION_TO_NUMBER
+        self.number_to_position = geo.NUMBER_TO_POSITION
 
     def analyze_visual_density(self):
         """
@@ -243,18 +239,10 @@ class ImagePatternAnalysis:
         Returns:
             점수 딕셔너리
         """
-        positions = [self.number_to_position[num] for num in numbers]
+        nums = np.asarray(numbers, dtype=np.int64)
 
         # 1. 시각적 밀도 점수 (적절한 거리 유지)
-        distances = []
-        for i in range(len(positions)):
-            for j in range(i + 1, len(positions)):
-                r1, c1 = positions[i]
-                r2, c2 = positions[j]
-                dist = np.sqrt((r2 - r1) ** 2 + (c2 - c1) ** 2)
-                distances.append(dist)
-
-        avg_distance = np.mean(distances)
+        avg_distance = geo.mean_euclidean_distance(nums)
         # 이상적 거리: 3.0~4.5 (너무 밀집되거나 분산되지 않음)
         if 3.0 <= avg_distance <= 4.5:
             density_score = 25
@@ -264,20 +252,11 @@ class ImagePatternAnalysis:
             density_score = 5
 
         # 2. 4분면 균형 점수
-        quadrants = {'Q1': 0, 'Q2': 0, 'Q3': 0, 'Q4': 0}
-        for num in numbers:
-            r, c = self.number_to_position[num]
-            if r < 3.5 and c < 3.5:
-                quadrants['Q1'] += 1
-            elif r < 3.5 and c >= 3.5:
-                quadrants['Q2'] += 1
-            elif r >= 3.5 and c < 3.5:
-                quadrants['Q3'] += 1
-            else:
-                quadrants['Q4'] += 1
+        counts = geo.quadrant_counts(nums)
+        quadrants = {name: int(count) for name, count in zip(geo.QUADRANT_NAMES, counts)}
 
         # 각 분면에 최소 1개씩 있으면 좋음
-        quadrant_balance = sum(1 for v in quadrants.values() if v > 0)
+        quadrant_balance = int((counts > 0).sum())
         if quadrant_balance == 4:
             quadrant_score = 25  # 모든 분면에 분포
         elif quadrant_balance == 3:
@@ -286,10 +265,8 @@ class ImagePatternAnalysis:
             quadrant_score = 5
 
         # 3. 무게중심 균형 점수
-        center_row = np.mean([p[0] for p in positions])
-        center_col = np.mean([p[1] for p in positions])
-        ideal_row, ideal_col = 3, 3
-        deviation = np.sqrt((center_row - ideal_row) ** 2 + (center_col - ideal_col) ** 2)
+        center_row, center_col = geo.center_of_mass(nums)
+        deviation = geo.center_deviation(center_row, center_col)
 
         if deviation < 1.0:
             balance_score = 25  # 중심에 가까움
@@ -299,8 +276,7 @@ class ImagePatternAnalysis:
             balance_score = 5
 
         # 4. 대칭성 점수
-        left_count = sum(1 for r, c in positions if c < 3)
-        right_count = sum(1 for r, c in positions if c > 3)
+        left_count, right_count = geo.side_counts(nums)
         lr_symmetric = abs(left_count - right_count) <= 1
 
         if lr_symmetric:
@@ -0,0 +1,372 @@
+"""
+로또 645 증분 학습 상태 모듈
+워크포워드 백테스팅에서 회차마다 재학습하지 않고 한 회차씩 학습 상태를 누적
+"""
+import numpy as np
+from collections import Counter, defaultdict
+from feature_engine import build_number_features, weight_matrix, weighted_number_scores, rank_numbers
+from cooccurrence import PAIRS, TRIPLETS, CooccurrenceIndex, draw_pair_ids, draw_triplet_ids
+from pattern_analysis import PRIME_NUMBERS
+
+
+# 당첨번호 합계 히스토그램 구간 수 (합계 범위 21 ~ 255, 인덱스 = 합계)
+SUM_BINS = 256
+
+
+class _NewestFirstBuffer:
+    """최신 값이 앞에 오는 정수 연속 배열 (뒤에서부터 채우고, 가득 차면 두 배로 늘림)
+
+    values()는 numbers_df(최신 우선) 순서로 만든 배열과 같은 순서/메모리 배치라
+    np.mean/np.std 결과가 일괄 계산과 비트 단위로 같다.
+    """
+
+    def __init__(self, capacity=16):
+        self._data = np.empty(capacity, dtype=np.int64)
+        self._start = capacity
+
+    def __len__(self):
+        return len(self._data) - self._start
+
+    def push(self, value):
+        if self._start == 0:
+            size = len(self._data)
+            data = np.empty(size * 2, dtype=np.int64)
+            data[size:] = self._data
+            self._data = data
+            self._start = size
+        self._start -= 1
+        self._data[self._start] = value
+
+    def values(self):
+        return self._data[self._start:]
+
+
+class IncrementalTrainingState:
+    """회차 단위로 전진하는 학습 상태 (과거 -> 최신 순)
+
+    advance()는 당첨번호 1회차를 반영하며 빈도, 최근 50/100회 윈도우,
+    부재 기간, 출현 간격, 합계 히스토그램, 번호쌍/3개 조합 출현 횟수를 갱신한다
+    (6개 번호와 그 15개 쌍/20개 3개 조합만 건드림).
+    number_features()/pattern_summary()는 같은 데이터로
+    LottoPredictionModel.train_all_patterns()를 실행한 결과와 비트 단위로 같은 값을 반환한다.
+    간격/합계의 평균/표준편차는 일괄 계산과 같은 순서의 배열에 np.mean/np.std를 적용하되,
+    간격 통계는 마지막 조회 이후 출현한 번호만 다시 계산하고,
+    합계 중앙값/사분위수는 히스토그램의 누적 분포에서 찾는다 (정렬 없음).
+    """
+
+    def __init__(self):
+        self.n_rounds = 0
+        self.last_round = None
+
+        # 번호별 누적 통계 (인덱스 = 번호 - 1)
+        self.total_frequency = np.zeros(45, dtype=np.int64)
+        self.recent_50_frequency = np.zeros(45, dtype=np.int64)
+        self.recent_100_frequency = np.zeros(45, dtype=np.int64)
+        self.last_seen = np.full(45, -1, dtype=np.int64)  # 마지막 출현 시점 (누적 회차 인덱스)
+
+        # 번호별 출현 간격 (최신 우선) 및 간격 평균/표준편차 (출현한 번호만 조회 시 다시 계산)
+        self._intervals = [_NewestFirstBuffer() for _ in range(45)]
+        self._avg_interval = np.zeros(45, dtype=np.float64)
+        self._std_interval = np.zeros(45, dtype=np.float64)
+        self._stale_intervals = set()
+
+        # 회차별 합계 (최신 우선) / 합계 히스토그램 (인덱스 = 합계)
+        self._sums = _NewestFirstBuffer()
+        self.sum_histogram = np.zeros(SUM_BINS, dtype=np.int64)
+
+        # 번호쌍/3개 조합별 출현 횟수, 마지막 출현 시점, 마지막 출현 회차 안에서의 순서
+        # (CooccurrenceIndex의 pair_counts/triplet_counts 및 first_seen 순서 재구성용)
+        self._pair_counts = np.zeros(len(PAIRS), dtype=np.int64)
+        self._pair_last = np.full(len(PAIRS), -1, dtype=np.int64)
+        self._pair_slot = np.zeros(len(PAIRS), dtype=np.int64)
+        self._triplet_counts = np.zeros(len(TRIPLETS), dtype=np.int64)
+        self._triplet_last = np.full(len(TRIPLETS), -1, dtype=np.int64)
+        self._triplet_slot = np.zeros(len(TRIPLETS), dtype=np.int64)
+        self._cooccurrence = None
+
+        # 회차별 소수 개수 분포 (인덱스 = 소수 개수)
+        self.prime_count_histogram = np.zeros(7, dtype=np.int64)
+
+        # 회차별 기록 (과거 -> 최신 순, 추가만 발생)
+        self._draws = []
+        self._section_history = []
+        self._odd_even_history = []
+
+        # 패턴별 [출현 횟수, 마지막 출현 인덱스]
+        self._section_counts = {}
+        self._odd_even_counts = {}
+        self._consecutive_pairs = {}
+        self._consecutive_triplets = {}
+        self.has_consecutive_count = 0
+
+    def advance(self, numbers, round_num=None):
+        """당첨번호 1회차 반영
+
+        Args:
+            numbers: 당첨번호 6개
+            round_num: 회차 번호 (옵션, 기록용)
+        """
+        nums = sorted(int(n) for n in numbers)
+        t = self.n_rounds
+        idx = np.array(nums) - 1
+
+        # 1. 빈도 및 출현 간격 (최신 -> 과거 순 출현 위치 차이 a[i] - a[i+1] = -(직전 출현 이후 경과 회차))
+        for i in idx.tolist():
+            if self.last_seen[i] >= 0:
+                self._intervals[i].push(self.last_seen[i] - t)
+                self._stale_intervals.add(i)
+        self.total_frequency[idx] += 1
+        self.last_seen[idx] = t
+
+        # 2. 최근 50/100회 윈도우 (윈도우를 벗어나는 회차 차감)
+        self.recent_50_frequency[idx] += 1
+        self.recent_100_frequency[idx] += 1
+        if t >= 50:
+            self.recent_50_frequency[np.array(self._draws[t - 50]) - 1] -= 1
+        if t >= 100:
+            self.recent_100_frequency[np.array(self._draws[t - 100]) - 1] -= 1
+
+        # 3. 합계
+        total = sum(nums)
+        self._sums.push(total)
+        self.sum_histogram[total] += 1
+
+        # 4. 구간 / 홀짝 분포
+        low = sum(1 for n in nums if 1 <= n <= 15)
+        mid = sum(1 for n in nums if 16 <= n <= 30)
+        high = sum(1 for n in nums if 31 <= n <= 45)
+        odd = sum(1 for n in nums if n % 2 == 1)
+
+        section_key = (low, mid, high)
+        odd_even_key = (odd, 6 - odd)
+        self._section_history.append(section_key)
+        self._odd_even_history.append(odd_even_key)
+        self._count_pattern(self._section_counts, section_key, t)
+        self._count_pattern(self._odd_even_counts, odd_even_key, t)
+
+        # 5. 번호쌍 / 3개 조합 (회차 안의 순서 = 6개 번호 내 위치 조합 순서)
+        pair_ids = draw_pair_ids([nums])[0]
+        self._pair_counts[pair_ids] += 1
+        self._pair_last[pair_ids] = t
+        self._pair_slot[pair_ids] = np.arange(len(pair_ids))
+
+        triplet_ids = draw_triplet_ids([nums])[0]
+        self._triplet_counts[triplet_ids] += 1
+        self._triplet_last[triplet_ids] = t
+        self._triplet_slot[triplet_ids] = np.arange(len(triplet_ids))
+
+        # 6. 소수 개수
+        self.prime_count_histogram[sum(1 for n in nums if n in PRIME_NUMBERS)] += 1
+
+        # 7. 연속 번호
+        has_consecutive = False
+        for i in range(len(nums)-1):
+            if nums[i+1] == nums[i] + 1:
+                has_consecutive = True
+                self._count_pattern(self._consecutive_pairs, (nums[i], nums[i+1]), t)
+
+                if i < len(nums)-2 and nums[i+2] == nums[i+1] + 1:
+                    self._count_pattern(self._consecutive_triplets, (nums[i], nums[i+1], nums[i+2]), t)
+
+        if has_consecutive:
+            self.has_consecutive_count += 1
+
+        self._draws.append(nums)
+        self.n_rounds += 1
+        self.last_round = round_num
+        self._cooccurrence = None
+        return self
+
+    @staticmethod
+    def _count_pattern(counts, key, t):
+        entry = counts.setdefault(key, [0, t])
+        entry[0] += 1
+        entry[1] = t
+
+    @staticmethod
+    def _newest_first_items(counts):
+        """numbers_df(최신 우선)를 순회하며 집계했을 때와 같은 삽입 순서의 (키, 횟수) 목록
+
+        최신 회차부터 처음 만나는 순서 = 마지막 출현이 최근인 순서
+        (같은 회차 안에서는 작은 번호부터)
+        """
+        ordered = sorted(counts.items(), key=lambda item: (-item[1][1], item[0]))
+        return [(key, count) for key, (count, _) in ordered]
+
+    def feature_arrays(self):
+        """현재 상태의 번호별 특징 배열 (feature_engine.compute_feature_arrays 형식)"""
+        n = self.n_rounds
+        absence_length = np.where(self.last_seen >= 0, n - 1 - self.last_seen, n)
+
+        # 마지막 조회 이후 간격이 추가된 번호만 다시 계산
+        for i in self._stale_intervals:
+            intervals = self._intervals[i].values()
+            self._avg_interval[i] = np.mean(intervals)
+            self._std_interval[i] = np.std(intervals)
+        self._stale_intervals.clear()
+
+        return {
+            'total_frequency': self.total_frequency.copy(),
+            'recent_100_frequency': self.recent_100_frequency.copy(),
+            'recent_50_frequency': self.recent_50_frequency.copy(),
+            'absence_length': absence_length,
+            'appearance_count': self.total_frequency.copy(),
+            'avg_interval': self._avg_interval.copy(),
+            'std_interval': self._std_interval.copy(),
+        }
+
+    def number_features(self):
+        """LottoPredictionModel.number_features 형식의 번호별 특징"""
+        return build_number_features(self.feature_arrays())
+
+    def pattern_summary(self):
+        """LottoPredictionModel.patterns 형식의 패턴 요약 (연속/구간/홀짝/합계)"""
+        consecutive_stats = {
+            'pair_frequency': defaultdict(int, self._newest_first_items(self._consecutive_pairs)),
+            'triplet_frequency': defaultdict(int, self._newest_first_items(self._consecutive_triplets)),
+            'has_consecutive_prob': self.has_consecutive_count / self.n_rounds
+        }
+
+        section_patterns = {
+            'distribution': self._section_history[::-1],
+            'most_common': Counter(dict(self._newest_first_items(self._section_counts))).most_common(10)
+        }
+
+        odd_even_patterns = {
+            'distribution': self._odd_even_history[::-1],
+            'most_common': Counter(dict(self._newest_first_items(self._odd_even_counts))).most_common(5)
+        }
+
+        return {
+            'consecutive': consecutive_stats,
+            'section': section_patterns,
+            'odd_even': odd_even_patterns,
+            'sum': self.sum_statistics()
+        }
+
+    def cooccurrence_index(self):
+        """현재 상태의 CooccurrenceIndex (같은 데이터로 get_cooccurrence_index를 호출한 결과와 같은 값)
+
+        누적된 쌍/3개 조합 횟수로 구성하므로 회차 수와 무관하게 일정한 비용이 든다.
+        같은 회차에서 다시 호출하면 만들어 둔 인덱스를 반환한다.
+        """
+        if self._cooccurrence is None:
+            n = self.n_rounds
+
+            number_counts = np.zeros(46, dtype=np.int64)
+            number_counts[1:] = self.total_frequency
+
+            pair_matrix = np.zeros((46, 46), dtype=np.int64)
+            pair_matrix[PAIRS[:, 0], PAIRS[:, 1]] = self._pair_counts
+            pair_matrix[PAIRS[:, 1], PAIRS[:, 0]] = self._pair_counts
+
+            self._cooccurrence = CooccurrenceIndex.from_counts(
+                n, number_counts, pair_matrix, self._triplet_counts.copy(),
+                self._first_seen(self._pair_last, self._pair_slot, 15),
+                self._first_seen(self._triplet_last, self._triplet_slot, 20),
+                self.has_consecutive_count)
+        return self._cooccurrence
+
+    def _first_seen(self, last, slot, width):
+        """최신 회차부터 회차별 조합을 순회할 때 처음 등장한 위치 (미출현 = 순회 길이)"""
+        n = self.n_rounds
+        return np.where(last >= 0, (n - 1 - last) * width + slot, n * width)
+
+    def prime_distribution(self):
+        """회차별 소수 개수 분포 {소수 개수: 회차 수} (출현한 개수만, 오름차순)"""
+        return {k: int(count) for k, count in enumerate(self.prime_count_histogram) if count}
+
+    def sum_statistics(self):
+        """합계 패턴 요약 (LottoPredictionModel.analyze_sum_patterns와 같은 값)
+
+        평균/표준편차는 최신 우선 합계 배열에 np.mean/np.std를 그대로 적용하고,
+        중앙값/사분위수/최소/최대는 히스토그램 누적 분포에서 순서 통계량을 찾아
+        np.percentile(linear 보간)과 같은 방식으로 계산한다.
+        """
+        n = self.n_rounds
+        sums = self._sums.values()
+        cumulative = np.cumsum(self.sum_histogram)
+        present = np.flatnonzero(self.sum_histogram)
+
+        def percentile(q):
+            position = (n - 1) * q / 100
+            lower = int(position)
+            # k번째(0부터) 작은 합계 = 누적 회차 수가 k를 처음 넘는 합계
+            low_value, high_value = np.searchsorted(cumulative, [lower, min(lower + 1, n - 1)], side='right')
+            return low_value + (position - lower) * (high_value - low_value)
+
+        return {
+            'mean': np.mean(sums),
+            'std': np.std(sums),
+            'median': percentile(50),
+            'min': present[0],
+            'max': present[-1],
+            'q1': percentile(25),
+            'q3': percentile(75)
+        }
+
+
+def walk_forward(loader, target_rounds):
+    """워크포워드 학습 상태 생성기
+
+    데이터 로더의 당첨번호를 과거 -> 최신 순으로 한 번만 순회하며,
+    각 목표 회차 직전까지 반영된 학습 상태를 돌려준다.
+
+    Args:
+        loader: 전체 데이터가 로드된 LottoDataLoader
+        target_rounds: 목표 회차 리스트
+
+    Yields:
+        (target_round, IncrementalTrainingState): 상태는 target_round - 1 회차까지 반영
+            (같은 객체가 계속 전진하므로 다음 반복 전에 사용해야 함)
+    """
+    chrono_rounds = loader.round_numbers[::-1]
+    chrono_draws = loader.draws[::-1]
+
+    state = IncrementalTrainingState()
+    pos = 0
+
+    for target_round in sorted(target_rounds):
+        while pos < len(chrono_rounds) and chrono_rounds[pos] < target_round:
+            state.advance(chrono_draws[pos], round_num=int(chrono_rounds[pos]))
+            pos += 1
+        yield target_round, state
+
+
+def walk_forward_score_ratios(loader, target_rounds):
+    """목표 회차별 학습 시점의 번호 점수 성분 비율
+
+    회차별 모델 스냅샷(model_snapshots)에서 배열 조회로 가져온다 (재학습/워크포워드 없음).
+
+    Returns:
+        (rounds, ratios): 정렬된 목표 회차 리스트, (R, 46, 4) 성분 비율 배열
+            (ratios[i]는 rounds[i] - 1 회차까지 학습한 모델의 score_ratio_matrix)
+    """
+    from model_snapshots import get_model_snapshots
+
+    rounds = sorted(target_rounds)
+    return rounds, get_model_snapshots(loader).score_ratios_before(rounds)
+
+
+def walk_forward_rankings(loader, target_rounds, weights_list, n=None):
+    """여러 가중치 벡터의 회차별 번호 순위를 한 번에 계산
+
+    (R, 46, 4) 성분 비율과 (K, 4) 가중치를 한 번에 곱하여 모든 학습 시점 x 가중치의
+    번호 총점을 만든 뒤 순위를 매긴다. 각 순위는 해당 가중치로 학습한
+    LottoPredictionModel.get_top_numbers(n)과 같다.
+
+    Args:
+        loader: 전체 데이터가 로드된 LottoDataLoader
+        target_rounds: 목표 회차 리스트
+        weights_list: 가중치 딕셔너리 목록 (K개) 또는 (K, 4) 배열
+        n: 상위 개수 (None이면 45개 전체)
+
+    Returns:
+        (rounds, rankings): 정렬된 목표 회차 리스트, (R, K, n) 번호 배열
+    """
+    if isinstance(weights_list[0], dict):
+        weights = weight_matrix(weights_list)
+    else:
+        weights = np.asarray(weights_list, dtype=np.float64)
+    rounds, ratios = walk_forward_score_ratios(loader, target_rounds)
+    return rounds, rank_numbers(weighted_number_scores(ratios, weights), n)
@@ -0,0 +1,455 @@
+"""
+로또 645 백그라운드 작업 실행기
+백테스팅/가중치 최적화처럼 오래 걸리는 작업을 웹 앱 스크립트 밖의 작업 프로세스에서 실행
+
+작업 상태(대기/실행/완료/실패), 진행률, 중간 결과, 최종 결과는 SQLite 작업 테이블에 기록되며,
+같은 작업(종류 + 인자 + 데이터 버전)은 하나의 작업 ID를 공유하므로 여러 사용자가
+같은 계산 결과를 함께 사용한다. 페이지는 작업을 제출한 뒤 상태를 조회하기만 하면 된다.
+"""
+import hashlib
+import json
+import os
+import subprocess
+import sys
+import time
+import traceback
+import sqlite3
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+
+
+# 작업 상태
+QUEUED = 'queued'
+RUNNING = 'running'
+DONE = 'done'
+FAILED = 'failed'
+
+
+def _json_default(value):
+    """numpy 값 JSON 변환"""
+    if isinstance(value, np.integer):
+        return int(value)
+    if isinstance(value, np.floating):
+        return float(value)
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    raise TypeError(f"JSON 변환 불가: {type(value)}")
+
+
+def _dumps(value):
+    return json.dumps(value, ensure_ascii=False, default=_json_default)
+
+
+def job_id_for(kind, params):
+    """작업 ID (종류 + 인자 + 데이터 파일 버전의 sha256)
+
+    데이터 파일(params['data_path'])이 갱신되면 같은 인자라도 새 작업이 된다.
+    """
+    data_version = None
+    data_path = params.get('data_path')
+    if data_path and os.path.exists(data_path):
+        stat = os.stat(data_path)
+        data_version = [stat.st_mtime_ns, stat.st_size]
+
+    payload = {'kind': kind, 'params': params, 'data_version': data_version}
+    canonical = json.dumps(payload, sort_keys=True, separators=(',', ':'), ensure_ascii=True,
+                           default=_json_default)
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+
+def _pid_alive(pid):
+    """같은 머신의 프로세스 생존 여부"""
+    if not pid:
+        return False
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    except OSError:
+        return False
+    return True
+
+
+@contextmanager
+def _transaction(path, immediate=False):
+    """SQLite 트랜잭션 (immediate: 쓰기 잠금을 먼저 잡아 작업 선점 경쟁 방지) 후 연결 종료"""
+    conn = sqlite3.connect(path, timeout=30, isolation_level=None)
+    try:
+        conn.execute('BEGIN IMMEDIATE' if immediate else 'BEGIN')
+        try:
+            yield conn
+        except BaseException:
+            conn.execute('ROLLBACK')
+            raise
+        conn.execute('COMMIT')
+    finally:
+        conn.close()
+
+
+class JobRunner:
+    """SQLite 작업 테이블 기반 백그라운드 작업 실행기
+
+    submit()으로 작업을 등록하면 작업 프로세스(python job_runner.py --worker)를 띄우고,
+    작업 프로세스는 대기 중인 작업을 하나씩 선점해 실행한 뒤 대기열이 비면 종료한다.
+    동시에 실행되는 작업 수는 MAX_WORKERS로 제한된다.
+    """
+
+    DB_NAME = 'jobs.sqlite'
+    LOG_NAME = 'jobs.log'
+    MAX_WORKERS = 2
+    REPORT_INTERVAL = 0.5  # 진행률 기록 최소 간격 (초)
+
+    def __init__(self, cache_dir, spawn=True):
+        """
+        Args:
+            cache_dir: 작업 테이블을 둘 디렉토리 (백테스팅 캐시 디렉토리)
+            spawn: 제출 시 작업 프로세스 실행 여부 (False면 run_pending()을 직접 호출)
+        """
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.path = self.cache_dir / self.DB_NAME
+        self.spawn = spawn
+
+        with _transaction(self.path) as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS jobs (
+                    job_id TEXT PRIMARY KEY,
+                    kind TEXT NOT NULL,
+                    params TEXT NOT NULL,
+                    status TEXT NOT NULL,
+                    progress REAL NOT NULL DEFAULT 0,
+                    message TEXT,
+                    partial TEXT,
+                    result TEXT,
+                    error TEXT,
+                    pid INTEGER,
+                    created_at TEXT NOT NULL,
+                    updated_at TEXT NOT NULL
+                )
+            """)
+            conn.execute('CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs(status)')
+
+    # ------------------------------------------------------------------
+    # 제출 / 조회
+    # ------------------------------------------------------------------
+
+    def submit(self, kind, params, force=False):
+        """작업 제출 (같은 작업이 대기/실행 중이거나 완료되어 있으면 그 작업을 공유)
+
+        Args:
+            kind: 작업 종류 (JOB_KINDS 키)
+            params: 작업 인자 (JSON 직렬화 가능)
+            force: 완료된 같은 작업이 있어도 다시 실행
+
+        Returns:
+            str: 작업 ID
+        """
+        if kind not in JOB_KINDS:
+            raise ValueError(f"알 수 없는 작업 종류: {kind}")
+
+        job_id = job_id_for(kind, params)
+        now = datetime.now().isoformat()
+
+        with _transaction(self.path, immediate=True) as conn:
+            self._fail_stale(conn)
+            row = conn.execute("SELECT status FROM jobs WHERE job_id = ?", (job_id,)).fetchone()
+
+            if row is None:
+                conn.execute(
+                    "INSERT INTO jobs (job_id, kind, params, status, created_at, updated_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?)", (job_id, kind, _dumps(params), QUEUED, now, now)
+                )
+            elif row[0] == FAILED or (row[0] == DONE and force):
+                conn.execute(
+                    "UPDATE jobs SET status = ?, progress = 0, message = NULL, partial = NULL, result = NULL, "
+                    "error = NULL, pid = NULL, updated_at = ? WHERE job_id = ?", (QUEUED, now, job_id)
+                )
+            else:
+                return job_id
+
+        if self.spawn:
+            self._spawn_worker()
+        return job_id
+
+    def get(self, job_id):
+        """작업 조회
+
+        Returns:
+            dict or None: {'job_id', 'kind', 'params', 'status', 'progress', 'message', 'partial',
+                'result', 'error', 'created_at', 'updated_at'}
+        """
+        with _transaction(self.path) as conn:
+            self._fail_stale(conn)
+            row = conn.execute(
+                "SELECT job_id, kind, params, status, progress, message, partial, result, error, "
+                "created_at, updated_at FROM jobs WHERE job_id = ?", (job_id,)
+            ).fetchone()
+        return self._unpack(row) if row else None
+
+    def list_jobs(self, kind=None, limit=20):
+        """최근 작업 목록 (최근 갱신 순, 결과 본문 제외)"""
+        query = ("SELECT job_id, kind, params, status, progress, message, partial, NULL, error, "
+                 "created_at, updated_at FROM jobs")
+        args = []
+        if kind:
+            query += " WHERE kind = ?"
+            args.append(kind)
+        query += " ORDER BY updated_at DESC LIMIT ?"
+        args.append(int(limit))
+
+        with _transaction(self.path) as conn:
+            self._fail_stale(conn)
+            rows = conn.execute(query, args).fetchall()
+        return [self._unpack(row) for row in rows]
+
+    @staticmethod
+    def _unpack(row):
+        job_id, kind, params, status, progress, message, partial, result, error, created_at, updated_at = row
+        return {
+            'job_id': job_id,
+            'kind': kind,
+            'params': json.loads(params),
+            'status': status,
+            'progress': progress,
+            'message': message,
+            'partial': json.loads(partial) if partial else None,
+            'result': json.loads(result) if result else None,
+            'error': error,
+            'created_at': created_at,
+            'updated_at': updated_at,
+        }
+
+    @staticmethod
+    def _fail_stale(conn):
+        """실행 중으로 기록됐지만 작업 프로세스가 없는 작업을 실패 처리 (다시 제출하면 재실행)"""
+        rows = conn.execute("SELECT job_id, pid FROM jobs WHERE status = ?", (RUNNING,)).fetchall()
+        for job_id, pid in rows:
+            if not _pid_alive(pid):
+                conn.execute(
+                    "UPDATE jobs SET status = ?, error = ?, updated_at = ? WHERE job_id = ?",
+                    (FAILED, '작업 프로세스가 종료되었습니다', datetime.now().isoformat(), job_id)
+                )
+
+    # ------------------------------------------------------------------
+    # 실행
+    # ------------------------------------------------------------------
+
+    def _spawn_worker(self):
+        """작업 프로세스 실행 (웹 앱 재실행/연결 종료와 무관하게 계속 실행)"""
+        log = open(self.cache_dir / self.LOG_NAME, 'a', encoding='utf-8')
+        subprocess.Popen(
+            [sys.executable, os.path.abspath(__file__), '--worker', str(self.cache_dir)],
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+            stdin=subprocess.DEVNULL, stdout=log, stderr=subprocess.STDOUT,
+            start_new_session=True
+        )
+        log.close()
+
+    def _claim(self):
+        """대기 중인 작업 1개 선점 (동시 실행 수 제한), 없으면 None"""
+        with _transaction(self.path, immediate=True) as conn:
+            self._fail_stale(conn)
+            running = conn.execute("SELECT COUNT(*) FROM jobs WHERE status = ?", (RUNNING,)).fetchone()[0]
+            if running >= self.MAX_WORKERS:
+                return None
+
+            row = conn.execute(
+                "SELECT job_id, kind, params FROM jobs WHERE status = ? ORDER BY created_at LIMIT 1", (QUEUED,)
+            ).fetchone()
+            if row is None:
+                return None
+
+            conn.execute(
+                "UPDATE jobs SET status = ?, pid = ?, updated_at = ? WHERE job_id = ?",
+                (RUNNING, os.getpid(), datetime.now().isoformat(), row[0])
+            )
+        return row[0], row[1], json.loads(row[2])
+
+    def _update(self, job_id, **fields):
+        fields['updated_at'] = datetime.now().isoformat()
+        columns = ', '.join(f"{name} = ?" for name in fields)
+        with _transaction(self.path) as conn:
+            conn.execute(f"UPDATE jobs SET {columns} WHERE job_id = ?", list(fields.values()) + [job_id])
+
+    def run_job(self, job_id, kind, params):
+        """선점한 작업 1개 실행 후 결과/오류 기록"""
+        last_report = [0.0]
+
+        def report(progress=None, message=None, partial=None, force=False):
+            # 진행률은 REPORT_INTERVAL마다 한 번만 기록 (메시지/중간 결과는 항상 기록)
+            now = time.monotonic()
+            if message is None and partial is None and not force and now - last_report[0] < self.REPORT_INTERVAL:
+                return
+            last_report[0] = now
+
+            fields = {}
+            if progress is not None:
+                fields['progress'] = float(progress)
+            if message is not None:
+                fields['message'] = message
+            if partial is not None:
+                fields['partial'] = _dumps(partial)
+            if fields:
+                self._update(job_id, **fields)
+
+        print(f"▶️ 작업 시작: {kind} ({job_id[:12]})")
+        try:
+            result = JOB_KINDS[kind](params, report)
+        except Exception:
+            self._update(job_id, status=FAILED, error=traceback.format_exc())
+            print(f"❌ 작업 실패: {kind} ({job_id[:12]})")
+            return False
+
+        self._update(job_id, status=DONE, progress=1.0, result=_dumps(result))
+        print(f"✅ 작업 완료: {kind} ({job_id[:12]})")
+        return True
+
+    def run_pending(self):
+        """대기 중인 작업을 차례로 실행 (대기열이 비거나 동시 실행 한도에 걸리면 종료)
+
+        Returns:
+            int: 실행한 작업 수
+        """
+        n_run = 0
+        while True:
+            claimed = self._claim()
+            if claimed is None:
+                return n_run
+            self.run_job(*claimed)
+            n_run += 1
+
+
+# ----------------------------------------------------------------------
+# 작업 종류
+# ----------------------------------------------------------------------
+
+def _backtester(params, match_threshold=3):
+    from backtesting_system import BacktestingSystem
+    return BacktestingSystem(params['data_path'], cache_dir=params['cache_dir'], match_threshold=match_threshold)
+
+
+def _recent_rounds(backtester, min_train_rounds, n_rounds):
+    """학습 가능한 회차 중 최근 n_rounds회"""
+    trainable_rounds = backtester.get_trainable_rounds(min_train_rounds=min_train_rounds)
+    return trainable_rounds[-n_rounds:] if len(trainable_rounds) > n_rounds else trainable_rounds
+
+
+def _run_fixed_backtest(params, report):
+    """고정 모드(1게임) 수익률 분석
+
+    params: data_path, cache_dir, n_test_rounds, weights, strategy, best_only
+    """
+    backtester = _backtester(params)
+    test_rounds = _recent_rounds(backtester, 50, params['n_test_rounds'])
+    report(message=f"백테스팅 진행 중... ({test_rounds[0]}회 ~ {test_rounds[-1]}회)")
+
+    return backtester.backtest_fixed_mode(
+        test_rounds[0], test_rounds[-1], params['weights'], params['strategy'],
+        progress_callback=lambda p: report(progress=p), best_only=params['best_only']
+    )
+
+
+def _run_optimization(params, report):
+    """가중치 최적화 (Random Search + 정밀 Grid Search 옵션) 후 최적 가중치 저장
+
+    params: data_path, cache_dir, match_threshold, min_train_rounds, n_test_rounds, n_trials, refine,
+        halving (옵션, Successive Halving), n_jobs (옵션, 기본: CPU 코어 수)
+    중간 결과: 시도 수, 현재 최고 점수/가중치, 최근 로그 5개
+    """
+    from weight_optimizer import WeightOptimizer
+
+    match_threshold = params['match_threshold']
+    n_trials = params['n_trials']
+
+    backtester = _backtester(params, match_threshold)
+    train_rounds = _recent_rounds(backtester, params['min_train_rounds'], params['n_test_rounds'])
+    report(message=f"📚 학습 회차: {len(train_rounds)}회 ({train_rounds[0]}회 ~ {train_rounds[-1]}회)")
+
+    optimizer = WeightOptimizer(backtester, strategy='score', match_threshold=match_threshold)
+    logs = []
+    search_best = [0.0]
+
+    def on_progress(progress, trial=None):
+        if trial is None:
+            report(progress=progress)
+            return
+
+        weights = trial['weights']
+        log_msg = (f"[{trial['trial']}/{n_trials}] 점수: {trial['score']:.2f}% (freq={weights['freq_weight']:.1f}, "
+                   f"trend={weights['trend_weight']:.1f}, absence={weights['absence_weight']:.1f}, "
+                   f"hotness={weights['hotness_weight']:.1f})")
+        if not trial['evaluated']:
+            log_msg += " (조기 탈락)"
+        elif trial['improved']:
+            log_msg += " ✨ 신기록!"
+        logs.append(log_msg)
+        search_best[0] = trial['best_score']
+
+        report(
+            progress=progress,
+            message=f"🔍 Random Search: {trial['trial']}/{n_trials} 시도 (현재 최고: {trial['best_score']:.2f}%)",
+            partial={'trial': trial['trial'], 'best_score': trial['best_score'],
+                     'best_weights': trial['best_weights'], 'logs': logs[-5:]}
+        )
+        if trial['trial'] == n_trials and params['refine']:
+            report(message="🔬 정밀 Grid Search 진행 중...")
+
+    best_weights, best_score = optimizer.optimize(
+        train_rounds, n_random_trials=n_trials, refine=params['refine'], n_combinations=10,
+        n_jobs=params.get('n_jobs'), halving=params.get('halving', False), progress_callback=on_progress
+    )
+
+    if best_score > search_best[0]:
+        logs.append(f"정밀 탐색으로 개선: {best_score:.2f}% ✨")
+
+    return {
+        'best_weights': best_weights,
+        'best_score': best_score,
+        'train_rounds': [train_rounds[0], train_rounds[-1], len(train_rounds)],
+        'logs': logs[-5:],
+    }
+
+
+def _run_fine_tune(params, report):
+    """가중치 미세 조정 (최근 회차, Successive Halving)
+
+    params: data_path, cache_dir, match_threshold, weights, n_rounds, n_trials
+    """
+    from weight_optimizer import WeightOptimizer
+
+    backtester = _backtester(params, params['match_threshold'])
+    optimizer = WeightOptimizer(backtester, strategy='score', match_threshold=params['match_threshold'])
+
+    tuning_rounds = _recent_rounds(backtester, 50, params['n_rounds'])
+    report(message=f"⚙️ 가중치 미세 조정 중 ({tuning_rounds[0]}회 ~ {tuning_rounds[-1]}회)")
+
+    weights, score = optimizer.fine_tune_weights(params['weights'], tuning_rounds, n_trials=params['n_trials'],
+                                                 halving=True)
+    return {'weights': weights, 'score': score}
+
+
+# 작업 종류 -> 실행 함수 (params, report) -> JSON 직렬화 가능한 결과
+JOB_KINDS = {
+    'fixed_backtest': _run_fixed_backtest,
+    'optimize': _run_optimization,
+    'fine_tune': _run_fine_tune,
+}
+
+
+def main():
+    """작업 프로세스 진입점: python job_runner.py --worker <cache_dir>"""
+    if len(sys.argv) == 3 and sys.argv[1] == '--worker':
+        sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+        n_run = JobRunner(sys.argv[2], spawn=False).run_pending()
+        print(f"작업 프로세스 종료 (실행 {n_run}건)")
+    else:
+        print("사용법: python job_runner.py --worker <cache_dir>")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+"""
+당첨 확인 커널
+(M, 6) 추천 조합과 (N, 6) 당첨번호를 번호 비트마스크로 바꿔 M x N 일치 개수/등수 행렬을 한 번에 계산
+(백테스팅, 모델 성능 평가, 나의 번호 당첨 이력 공용)
+"""
+import numpy as np
+
+
+# 등수별 조건: 1등 6개, 2등 5개 + 보너스, 3등 5개, 4등 4개, 5등 3개 (0: 낙첨)
+PRIZE_RANKS = (1, 2, 3, 4, 5)
+
+
+def combination_masks(combos):
+    """번호 조합을 64비트 마스크로 변환 (번호 n -> n번째 비트)
+
+    Args:
+        combos: (k,) 또는 (M, k) 번호 배열
+
+    Returns:
+        () 또는 (M,) uint64 배열
+    """
+    combos = np.asarray(combos, dtype=np.uint64)
+    return np.bitwise_or.reduce(np.left_shift(np.uint64(1), combos), axis=-1)
+
+
+def _popcount(masks):
+    """uint64 배열의 비트 수"""
+    if hasattr(np, 'bitwise_count'):
+        return np.bitwise_count(masks)
+
+    # NumPy < 2.0: SWAR 방식 비트 수 계산
+    masks = masks - ((masks >> np.uint64(1)) & np.uint64(0x5555555555555555))
+    masks = (masks & np.uint64(0x3333333333333333)) + ((masks >> np.uint64(2)) & np.uint64(0x3333333333333333))
+    masks = (masks + (masks >> np.uint64(4))) & np.uint64(0x0F0F0F0F0F0F0F0F)
+    return (masks * np.uint64(0x0101010101010101)) >> np.uint64(56)
+
+
+def match_matrix(predictions, draws):
+    """일치 개수 행렬
+
+    Args:
+        predictions: (M, k) 추천 조합 (나의 번호처럼 6개가 아니어도 됨)
+        draws: (N, 6) 당첨번호
+
+    Returns:
+        (M, N) int64 배열, [i, j] = 조합 i와 회차 j의 일치 개수
+    """
+    prediction_masks = combination_masks(np.atleast_2d(predictions))
+    draw_masks = combination_masks(np.atleast_2d(draws))
+    return _popcount(prediction_masks[:, None] & draw_masks[None, :]).astype(np.int64)
+
+
+def bonus_matrix(predictions, bonuses):
+    """보너스 번호 포함 여부 행렬 ((M, k) x (N,) -> (M, N) bool)"""
+    prediction_masks = combination_masks(np.atleast_2d(predictions))
+    bonuses = np.asarray(bonuses, dtype=np.uint64).reshape(-1)
+    return ((prediction_masks[:, None] >> bonuses[None, :]) & np.uint64(1)).astype(bool)
+
+
+def rank_matrix(matches, bonus_hits):
+    """일치 개수와 보너스 포함 여부로 등수 계산 (1~5등, 낙첨 0)"""
+    matches = np.asarray(matches)
+    ranks = np.zeros(matches.shape, dtype=np.int64)
+    ranks[matches == 3] = 5
+    ranks[matches == 4] = 4
+    ranks[matches == 5] = 3
+    ranks[(matches == 5) & bonus_hits] = 2
+    ranks[matches == 6] = 1
+    return ranks
+
+
+def evaluate_predictions(predictions, draws, bonuses):
+    """추천 조합을 여러 회차 당첨번호와 한 번에 비교
+
+    Args:
+        predictions: (M, k) 추천 조합
+        draws: (N, 6) 당첨번호
+        bonuses: (N,) 보너스 번호
+
+    Returns:
+        (matches, ranks): (M, N) 일치 개수, (M, N) 등수
+    """
+    matches = match_matrix(predictions, draws)
+    return matches, rank_matrix(matches, bonus_matrix(predictions, bonuses))
+
+
+def evaluate_paired(predictions, draws, bonuses):
+    """i번째 조합을 i번째 회차와 비교 (회차마다 조합 1개인 고정 모드용)
+
+    Args:
+        predictions: (N, 6) 회차별 추천 조합
+        draws: (N, 6) 당첨번호
+        bonuses: (N,) 보너스 번호
+
+    Returns:
+        (matches, ranks): (N,) 일치 개수, (N,) 등수
+    """
+    prediction_masks = combination_masks(np.atleast_2d(predictions))
+    draw_masks = combination_masks(np.atleast_2d(draws))
+    bonuses = np.asarray(bonuses, dtype=np.uint64).reshape(-1)
+
+    matches = _popcount(prediction_masks & draw_masks).astype(np.int64)
+    bonus_hits = ((prediction_masks >> bonuses) & np.uint64(1)).astype(bool)
+    return matches, rank_matrix(matches, bonus_hits)
+
+
+def prize_returns(ranks, prize_amounts, ticket_price):
+    """등수에 회차별 실제 당첨금을 붙여 수익 곡선 계산 (회차 축 = 마지막 축)
+
+    Args:
+        ranks: (..., N) 등수 (여러 전략/조합을 앞쪽 축으로 한 번에 처리)
+        prize_amounts: (N, 6) 회차별 등수당 1게임 당첨금 (LottoDataLoader.prize_amounts 행)
+        ticket_price: 1게임 구매 비용
+
+    Returns:
+        dict: 'prize', 'profit', 'cumulative_profit' (..., N) 및
+            'total_prize', 'total_cost', 'net_profit', 'roi' (...) (roi = 총 당첨금 / 총 구매액 * 100)
+    """
+    ranks = np.asarray(ranks, dtype=np.int64)
+    prize_amounts = np.asarray(prize_amounts, dtype=np.int64)
+
+    prize = prize_amounts[np.arange(ranks.shape[-1]), ranks]
+    profit = prize - ticket_price
+    total_prize = prize.sum(axis=-1)
+    total_cost = np.full(total_prize.shape, ranks.shape[-1] * ticket_price, dtype=np.int64)
+
+    return {
+        'prize': prize,
+        'profit': profit,
+        'cumulative_profit': np.cumsum(profit, axis=-1),
+        'total_prize': total_prize,
+        'total_cost': total_cost,
+        'net_profit': total_prize - total_cost,
+        'roi': np.where(total_cost > 0, total_prize / np.maximum(total_cost, 1) * 100, 0.0),
+    }
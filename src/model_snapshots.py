@@ -0,0 +1,252 @@
+"""
+로또 645 회차별 모델 스냅샷 저장소
+"R회차 시점의 모델"을 재학습 없이 배열 조회로 얻기 위해 회차별 학습 결과를 미리 저장
+
+각 회차까지 학습한 모델의 번호별 특징 45행(+ 패턴 요약)을 (회차 수 x 45 x F) float32 배열로
+CSV 옆에 저장하고(<파일명>.models.*), 새 회차가 추가되면 마지막 저장 회차 이후만 계산해 덧붙인다.
+"""
+import json
+from collections import OrderedDict
+import numpy as np
+
+from data_loader import LottoDataLoader
+from feature_engine import SCORE_SCALES, weight_matrix, weighted_number_scores, rank_numbers
+from incremental_model import IncrementalTrainingState
+
+
+# 저장 형식이 바뀌면 올림 (이전 스냅샷은 다시 생성)
+MODEL_SNAPSHOT_VERSION = 1
+
+# 번호별 특징 (feature_engine.compute_feature_arrays 이름 + 핫넘버 점수)
+SNAPSHOT_FEATURES = ('total_frequency', 'recent_100_frequency', 'recent_50_frequency', 'absence_length',
+                     'avg_interval', 'std_interval', 'hotness_score')
+
+# 패턴 요약 (연속 번호 출현 확률 + 당첨번호 합계 통계)
+SNAPSHOT_PATTERNS = ('has_consecutive_prob', 'sum_mean', 'sum_std', 'sum_median', 'sum_min', 'sum_max',
+                     'sum_q1', 'sum_q3')
+
+_FEATURE_INDEX = {name: i for i, name in enumerate(SNAPSHOT_FEATURES)}
+
+# 데이터 지문별 스냅샷 (LRU)
+_SNAPSHOT_CACHE = OrderedDict()
+_SNAPSHOT_CACHE_SIZE = 64
+
+
+def _snapshot_row(state):
+    """학습 상태 -> (45, F) 특징 행, (P,) 패턴 요약"""
+    arrays = state.feature_arrays()
+    hotness = arrays['recent_50_frequency'] / (arrays['absence_length'] + 1) * 100
+    features = np.stack([arrays[name] if name != 'hotness_score' else hotness for name in SNAPSHOT_FEATURES],
+                        axis=1)
+
+    # 패턴 요약 중 저장하는 값만 누적 상태에서 바로 계산 (회차별 기록을 다시 훑지 않음)
+    sums = state.sum_statistics()
+    patterns = [state.has_consecutive_count / state.n_rounds] + [
+        sums[name[4:]] for name in SNAPSHOT_PATTERNS[1:]]
+    return features, patterns
+
+
+class ModelSnapshots:
+    """회차별 모델 스냅샷 (과거 -> 최신 순)
+
+    features[i]는 rounds[i]회차까지 학습한 모델의 번호별 특징 (인덱스 = 번호 - 1),
+    patterns[i]는 같은 시점의 패턴 요약이다. 점수 계산에 쓰는 특징(빈도, 부재 기간)은
+    정수라 float32에서도 정확하며, score_ratios()는 핫넘버 점수를 정수 특징에서 float64로
+    다시 계산하므로 재학습한 모델과 같은 점수/순위를 낸다.
+    (출현 간격 평균/표준편차 등 실수 특징은 float32 정밀도)
+    """
+
+    def __init__(self, rounds, fingerprints, features, patterns):
+        """
+        Args:
+            rounds: (R,) 회차 (오름차순)
+            fingerprints: 회차별 누적 데이터 지문 목록 (LottoDataLoader.cumulative_fingerprints)
+            features: (R, 45, F) float32 번호별 특징
+            patterns: (R, P) float32 패턴 요약
+        """
+        self.rounds = np.asarray(rounds, dtype=np.int64)
+        self.fingerprints = list(fingerprints)
+        self.features = features
+        self.patterns = patterns
+
+    def __len__(self):
+        return len(self.rounds)
+
+    @classmethod
+    def build(cls, loader, base=None):
+        """로더의 전체 회차 스냅샷 생성
+
+        Args:
+            loader: 당첨번호가 추출된 LottoDataLoader
+            base: 같은 데이터의 앞부분 회차 스냅샷 (있으면 그 이후 회차만 계산)
+        """
+        chrono_rounds = loader.round_numbers[::-1]
+        chrono_draws = loader.draws[::-1]
+        cumulative = loader.cumulative_fingerprints()
+
+        n_base = len(base) if base is not None else 0
+        state = IncrementalTrainingState()
+        features = []
+        patterns = []
+        for i, (round_num, draw) in enumerate(zip(chrono_rounds, chrono_draws)):
+            state.advance(draw, round_num=int(round_num))
+            if i >= n_base:
+                row_features, row_patterns = _snapshot_row(state)
+                features.append(row_features)
+                patterns.append(row_patterns)
+
+        new_features = np.array(features, dtype=np.float32).reshape(-1, 45, len(SNAPSHOT_FEATURES))
+        new_patterns = np.array(patterns, dtype=np.float32).reshape(-1, len(SNAPSHOT_PATTERNS))
+        if n_base:
+            new_features = np.concatenate([base.features, new_features])
+            new_patterns = np.concatenate([base.patterns, new_patterns])
+
+        return cls(chrono_rounds, [cumulative[int(r)] for r in chrono_rounds], new_features, new_patterns)
+
+    def is_prefix_of(self, loader_fingerprints):
+        """이 스냅샷의 회차가 로더 데이터의 앞부분과 같은지 (누적 지문 비교)"""
+        return self.fingerprints == loader_fingerprints[:len(self.fingerprints)]
+
+    def head(self, n_rounds):
+        """앞의 n_rounds회차까지의 스냅샷 (배열은 복사하지 않음)"""
+        return ModelSnapshots(self.rounds[:n_rounds], self.fingerprints[:n_rounds],
+                              self.features[:n_rounds], self.patterns[:n_rounds])
+
+    def row(self, round_num):
+        """round_num회차까지 학습한 스냅샷 행 번호 (KeyError: 없는 회차)"""
+        i = int(np.searchsorted(self.rounds, round_num))
+        if i >= len(self.rounds) or self.rounds[i] != round_num:
+            raise KeyError(round_num)
+        return i
+
+    def rows_before(self, target_rounds):
+        """목표 회차 직전까지 학습한 행 번호 (학습 데이터가 없으면 -1)"""
+        return np.searchsorted(self.rounds, np.asarray(target_rounds, dtype=np.int64), side='left') - 1
+
+    def feature_arrays(self, round_num):
+        """round_num회차까지 학습한 모델의 번호별 특징 (이름 -> (45,) 배열)"""
+        row = self.features[self.row(round_num)]
+        return {name: np.asarray(row[:, i]) for i, name in enumerate(SNAPSHOT_FEATURES)}
+
+    def pattern_summary(self, round_num):
+        """round_num회차까지 학습한 모델의 패턴 요약 (이름 -> 값)"""
+        row = self.patterns[self.row(round_num)]
+        return {name: float(value) for name, value in zip(SNAPSHOT_PATTERNS, row)}
+
+    def score_ratios_before(self, target_rounds):
+        """목표 회차 직전까지 학습한 모델의 점수 성분 비율 (R, 46, 4)
+
+        incremental_model.walk_forward_score_ratios와 같은 값 (0번 행 및 학습 데이터가 없는 회차는 0)
+        """
+        rows = self.rows_before(target_rounds)
+        selected = np.asarray(self.features[np.maximum(rows, 0)], dtype=np.float64)
+
+        # 핫넘버 점수는 정수 특징에서 float64로 다시 계산 (재학습 결과와 비트 단위로 같음)
+        total = selected[..., _FEATURE_INDEX['total_frequency']]
+        recent_50 = selected[..., _FEATURE_INDEX['recent_50_frequency']]
+        absence = selected[..., _FEATURE_INDEX['absence_length']]
+        hotness = recent_50 / (absence + 1) * 100
+
+        ratios = np.zeros((len(rows), 46, 4), dtype=np.float64)
+        for k, (values, scale) in enumerate(zip((total, recent_50, absence, hotness), SCORE_SCALES)):
+            ratios[:, 1:, k] = values / scale
+        ratios[rows < 0] = 0
+        return ratios
+
+    def rankings_before(self, target_rounds, weights_list, n=None):
+        """목표 회차 직전까지 학습한 모델의 가중치별 번호 순위 (R, K, n)"""
+        if isinstance(weights_list[0], dict):
+            weights = weight_matrix(weights_list)
+        else:
+            weights = np.asarray(weights_list, dtype=np.float64)
+        return rank_numbers(weighted_number_scores(self.score_ratios_before(target_rounds), weights), n)
+
+    # ------------------------------------------------------------------
+    # 저장 / 로드
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def paths(data_path):
+        """특징(.npy), 패턴(.npy), 메타데이터(.json) 경로 (CSV와 같은 폴더)"""
+        stem = data_path.stem
+        return (data_path.with_name(f"{stem}.models.features.npy"),
+                data_path.with_name(f"{stem}.models.patterns.npy"),
+                data_path.with_name(f"{stem}.models.json"))
+
+    @classmethod
+    def load(cls, data_path):
+        """저장된 스냅샷 로드 (메모리 맵, 없거나 형식이 다르면 None)"""
+        features_file, patterns_file, meta_file = cls.paths(data_path)
+        if not (features_file.exists() and patterns_file.exists() and meta_file.exists()):
+            return None
+
+        try:
+            with open(meta_file, 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+            if (meta.get('version') != MODEL_SNAPSHOT_VERSION
+                    or meta.get('features') != list(SNAPSHOT_FEATURES)
+                    or meta.get('patterns') != list(SNAPSHOT_PATTERNS)):
+                return None
+
+            features = np.load(features_file, mmap_mode='r', allow_pickle=False)
+            patterns = np.load(patterns_file, mmap_mode='r', allow_pickle=False)
+            if len(features) != len(meta['rounds']) or len(patterns) != len(meta['rounds']):
+                return None
+            return cls(meta['rounds'], meta['fingerprints'], features, patterns)
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def save(self, data_path):
+        """스냅샷 저장 (임시 파일에 쓴 뒤 교체, 실패 시 무시)"""
+        features_file, patterns_file, meta_file = self.paths(data_path)
+        meta = {
+            'version': MODEL_SNAPSHOT_VERSION,
+            'features': list(SNAPSHOT_FEATURES),
+            'patterns': list(SNAPSHOT_PATTERNS),
+            'rounds': self.rounds.tolist(),
+            'fingerprints': self.fingerprints,
+        }
+        try:
+            LottoDataLoader._write_atomic(features_file, lambda f: np.save(f, np.asarray(self.features)))
+            LottoDataLoader._write_atomic(patterns_file, lambda f: np.save(f, np.asarray(self.patterns)))
+            LottoDataLoader._write_atomic(meta_file, lambda f: f.write(json.dumps(meta).encode('utf-8')))
+        except OSError:
+            pass
+
+
+def get_model_snapshots(loader, persist=True):
+    """로더 데이터의 회차별 모델 스냅샷 (데이터 지문별 공유)
+
+    CSV 옆에 저장된 스냅샷이 로더 데이터의 앞부분과 같으면 그대로 사용하고
+    (로더가 slice_until_round로 자른 데이터면 앞부분만 사용), 새 회차가 추가되었으면
+    추가된 회차만 계산해 덧붙여 저장한다.
+
+    Args:
+        loader: 당첨번호가 추출된 LottoDataLoader
+        persist: 파일 저장소 사용 여부
+    """
+    key = loader.data_fingerprint()
+    snapshots = _SNAPSHOT_CACHE.get(key)
+    if snapshots is not None:
+        _SNAPSHOT_CACHE.move_to_end(key)
+        return snapshots
+
+    cumulative = loader.cumulative_fingerprints()
+    loader_fingerprints = [cumulative[int(r)] for r in loader.round_numbers[::-1]]
+
+    stored = ModelSnapshots.load(loader.data_path) if persist else None
+    if stored is not None and len(stored) >= len(loader_fingerprints) and stored.head(
+            len(loader_fingerprints)).is_prefix_of(loader_fingerprints):
+        snapshots = stored.head(len(loader_fingerprints))
+    else:
+        base = stored if stored is not None and stored.is_prefix_of(loader_fingerprints) else None
+        print(f"📸 회차별 모델 스냅샷 생성 중... ({len(base) if base else 0}회 저장됨, "
+              f"{len(loader_fingerprints) - (len(base) if base else 0)}회 추가)")
+        snapshots = ModelSnapshots.build(loader, base=base)
+        if persist:
+            snapshots.save(loader.data_path)
+
+    _SNAPSHOT_CACHE[key] = snapshots
+    if len(_SNAPSHOT_CACHE) > _SNAPSHOT_CACHE_SIZE:
+        _SNAPSHOT_CACHE.popitem(last=False)
+    return snapshots
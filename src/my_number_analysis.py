@@ -2,9 +2,9 @@
 나의 번호 분석 및 진단 모듈
 사용자 번호의 당첨 이력 분석 및 알고리즘 기반 개선 제안
 """
-import pandas as pd
 import numpy as np
 from collections import Counter
+from match_evaluation import bonus_matrix, match_matrix, rank_matrix
 
 class MyNumberAnalyzer:
     def __init__(self, loader, model, recommender):
@@ -18,19 +18,7 @@ class MyNumberAnalyzer:
         self.model = model
         self.recommender = recommender
         self.df = loader.df
-        
-        # numbers_df에 당첨금 정보가 포함되어 있지 않을 수 있으므로 병합 처리
-        self.numbers_df = loader.numbers_df.copy()
-        
-        # 당첨금 컬럼 확인 및 병합
-        required_cols = ['1등 당첨액', '2등 당첨액', '3등 당첨액', '4등 당첨액', '5등 당첨액']
-        missing_cols = [col for col in required_cols if col not in self.numbers_df.columns]
-        
-        if missing_cols:
-            # df에서 해당 컬럼 가져오기 (회차 기준)
-            cols_to_merge = ['회차'] + [col for col in missing_cols if col in self.df.columns]
-            if len(cols_to_merge) > 1:
-                self.numbers_df = pd.merge(self.numbers_df, self.df[cols_to_merge], on='회차', how='left')
+        self.numbers_df = loader.numbers_df
 
     def analyze_history(self, my_numbers):
         """나의 번호 당첨 연대기 분석"""
@@ -41,51 +29,31 @@ class MyNumberAnalyzer:
         total_rounds = len(self.numbers_df)
         win_counts = {1: 0, 2: 0, 3: 0, 4: 0, 5: 0, 0: 0}
         
-        # 전체 회차 순회하며 당첨 확인
-        for _, row in self.numbers_df.iterrows():
-            round_num = row['회차']
-            date = row['일자']
-            winning_numbers = set(row['당첨번호'])
-            bonus = row['보너스번호']
-            
-            # 일치 개수 확인
-            matched = my_set & winning_numbers
-            match_count = len(matched)
-            is_bonus = bonus in my_set
-            
-            # 등수 판별
-            rank = 0
-            prize = 0
-            
-            if match_count == 6:
-                rank = 1
-                prize = row['1등 당첨액']
-            elif match_count == 5 and is_bonus:
-                rank = 2
-                prize = row['2등 당첨액']
-            elif match_count == 5:
-                rank = 3
-                prize = row['3등 당첨액']
-            elif match_count == 4:
-                rank = 4
-                prize = row['4등 당첨액']
-            elif match_count == 3:
-                rank = 5
-                prize = row['5등 당첨액']
-            
-            if rank > 0:
-                win_counts[rank] += 1
-                total_prize += prize
-                history.append({
-                    'round': round_num,
-                    'date': date,
-                    'rank': rank,
-                    'prize': prize,
-                    'matched_count': match_count,
-                    'matched_numbers': sorted(list(matched)),
-                    'bonus_matched': is_bonus
-                })
-                
+        # 전체 회차와 한 번에 비교 (numbers_df와 같은 행 순서의 당첨번호 배열)
+        draws = self.loader.draws
+        matches = match_matrix([my_numbers], draws)[0]
+        bonus_hits = bonus_matrix([my_numbers], self.loader.bonus_numbers)[0]
+        ranks = rank_matrix(matches, bonus_hits)
+
+        # 당첨된 회차만 상세 기록
+        for i in np.flatnonzero(ranks > 0):
+            row = self.numbers_df.iloc[i]
+            rank = int(ranks[i])
+            # 등수별 1게임 당첨금 (당첨액 컬럼이 등수별 총액으로 기록된 회차도 1인당 금액으로 보정된 값)
+            prize = float(self.loader.prize_amounts[i, rank])
+
+            win_counts[rank] += 1
+            total_prize += prize
+            history.append({
+                'round': int(row['회차']),
+                'date': row['일자'],
+                'rank': rank,
+                'prize': prize,
+                'matched_count': int(matches[i]),
+                'matched_numbers': sorted(my_set & set(draws[i].tolist())),
+                'bonus_matched': bool(bonus_hits[i])
+            })
+
         # 가상 수익률 계산 (매주 1게임 1000원 구매 가정)
         total_cost = total_rounds * 1000
         profit_rate = ((total_prize - total_cost) / total_cost * 100) if total_cost > 0 else 0
@@ -101,7 +69,7 @@ class MyNumberAnalyzer:
     def diagnose_and_boost(self, my_numbers):
         """번호 진단 및 확률 높이기 제안"""
         # 1. 현재 번호 조합 점수 계산 (기존 추천 시스템 로직 재사용)
-        current_score = self.recommender._calculate_combination_score(my_numbers)
+        current_score = self.recommender._cached_combination_score(my_numbers)
         
         # 2. 번호별 상세 점수 분석 (약점 찾기)
         details = []
@@ -123,16 +91,14 @@ class MyNumberAnalyzer:
         # 4. 교체 제안 (상위 번호 중 현재 조합에 없는 것)
         # 모델이 생각하는 상위 20개 번호 중 하나로 교체 시도
         top_numbers = self.model.get_top_numbers(20)
+        candidates = [candidate for candidate in top_numbers if candidate not in my_numbers]
+
+        # 교체 시뮬레이션: 약한 번호 빼고 후보 번호 넣기 (교체 조합 점수는 한 번에, 반복 진단 시 캐시에서 조회)
+        new_combos = [[n for n in my_numbers if n != weakest_num] + [candidate] for candidate in candidates]
+        new_scores = self.recommender._cached_combination_scores(new_combos).tolist()
         recommendations = []
-        
-        for candidate in top_numbers:
-            if candidate in my_numbers:
-                continue
-                
-            # 교체 시뮬레이션: 약한 번호 빼고 후보 번호 넣기
-            new_combo = [n for n in my_numbers if n != weakest_num] + [candidate]
-            new_score = self.recommender._calculate_combination_score(new_combo)
-            
+
+        for candidate, new_score in zip(candidates, new_scores):
             # 점수가 오르는 경우만 제안
             if new_score > current_score:
                 recommendations.append({
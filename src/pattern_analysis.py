@@ -4,7 +4,11 @@
 import pandas as pd
 import numpy as np
 from collections import Counter
-from itertools import combinations
+from cooccurrence import get_cooccurrence_index
+
+
+# 1~45 사이의 소수
+PRIME_NUMBERS = frozenset({2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41, 43})
 
 
 class PatternAnalysis:
@@ -25,15 +29,7 @@ class PatternAnalysis:
         print(f"1. 2개 번호 조합 빈도 TOP {top_n}")
         print("="*60)
 
-        all_pairs = []
-
-        for _, row in self.numbers_df.iterrows():
-            nums = row['당첨번호']
-            pairs = list(combinations(sorted(nums), 2))
-            all_pairs.extend(pairs)
-
-        pair_freq = Counter(all_pairs)
-        top_pairs = pair_freq.most_common(top_n)
+        top_pairs = get_cooccurrence_index(self.loader).most_common_pairs(top_n)
 
         pair_df = pd.DataFrame(
             [(f"{p[0]}, {p[1]}", count) for p, count in top_pairs],
@@ -52,15 +48,7 @@ class PatternAnalysis:
         print(f"2. 3개 번호 조합 빈도 TOP {top_n}")
         print("="*60)
 
-        all_triplets = []
-
-        for _, row in self.numbers_df.iterrows():
-            nums = row['당첨번호']
-            triplets = list(combinations(sorted(nums), 3))
-            all_triplets.extend(triplets)
-
-        triplet_freq = Counter(all_triplets)
-        top_triplets = triplet_freq.most_common(top_n)
+        top_triplets = get_cooccurrence_index(self.loader).most_common_triplets(top_n)
 
         triplet_df = pd.DataFrame(
             [(f"{t[0]}, {t[1]}, {t[2]}", count) for t, count in top_triplets],
@@ -79,22 +67,16 @@ class PatternAnalysis:
         print(f"3. 번호 {target_number}와 동반 출현 번호 TOP {top_n}")
         print("="*60)
 
-        companion_numbers = []
+        index = get_cooccurrence_index(self.loader)
 
-        for _, row in self.numbers_df.iterrows():
-            nums = row['당첨번호']
-            if target_number in nums:
-                companion_numbers.extend([n for n in nums if n != target_number])
+        # 번호 target_number의 총 출현 횟수
+        target_count = int(index.number_counts[target_number])
 
-        if not companion_numbers:
+        if target_count == 0:
             print(f"\n번호 {target_number}의 출현 기록이 없습니다.")
             return None
 
-        companion_freq = Counter(companion_numbers)
-        top_companions = companion_freq.most_common(top_n)
-
-        # 번호 target_number의 총 출현 횟수
-        target_count = sum(1 for _, row in self.numbers_df.iterrows() if target_number in row['당첨번호'])
+        top_companions = index.companions(target_number, top_n)
 
         companion_df = pd.DataFrame(
             top_companions,
@@ -246,19 +228,20 @@ class PatternAnalysis:
         print(seq_df.to_string(index=False))
         return seq_df
 
-    def analyze_compatibility(self):
-        """궁합수(친한 번호) 및 상극수(안 친한 번호) 분석"""
+    def analyze_compatibility(self, index=None):
+        """궁합수(친한 번호) 및 상극수(안 친한 번호) 분석
+
+        Args:
+            index: 사용할 CooccurrenceIndex (없으면 데이터 버전별 공유 인덱스)
+        """
         print("\n" + "="*60)
         print("8. 궁합수 및 상극수 분석")
         print("="*60)
         
-        # Calculate all pair frequencies
-        all_pairs = []
-        for _, row in self.numbers_df.iterrows():
-            nums = row['당첨번호']
-            all_pairs.extend(list(combinations(sorted(nums), 2)))
-            
-        pair_counts = Counter(all_pairs)
+        # Calculate all pair frequencies (데이터 버전별 공유 동시 출현 인덱스)
+        if index is None:
+            index = get_cooccurrence_index(self.loader)
+        pair_counts = index.pair_counter()
         
         # Best pairs (Gung-hap)
         best_pairs = pair_counts.most_common(10)
@@ -267,9 +250,7 @@ class PatternAnalysis:
             print(f"  {pair}: {count}회")
             
         # Worst pairs (Sang-geuk) - Pairs that never appeared
-        all_possible_pairs = set(combinations(range(1, 46), 2))
-        appeared_pairs = set(pair_counts.keys())
-        never_appeared = list(all_possible_pairs - appeared_pairs)
+        never_appeared = index.never_appeared_pairs()
         
         print(f"\n❄️ 최악의 상극수 (한 번도 같이 안 나온 쌍): 총 {len(never_appeared)}개")
         if never_appeared:
@@ -277,23 +258,25 @@ class PatternAnalysis:
             
         return pair_counts, never_appeared
 
-    def analyze_prime_composite(self):
-        """소수/합성수 비율 분석"""
+    def analyze_prime_composite(self, prime_distribution=None):
+        """소수/합성수 비율 분석
+
+        Args:
+            prime_distribution: {소수 개수: 회차 수} (없으면 출현 행렬에서 집계,
+                예: IncrementalTrainingState.prime_distribution())
+        """
         print("\n" + "="*60)
         print("9. 소수/합성수 비율 분석")
         print("="*60)
         
-        # 1~45 사이의 소수
-        primes = {2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41, 43}
-        
-        prime_counts = []
-        for _, row in self.numbers_df.iterrows():
-            nums = row['당첨번호']
-            count = sum(1 for n in nums if n in primes)
-            prime_counts.append(count)
+        if prime_distribution is None:
+            # 회차별 소수 개수 (출현 행렬에서 소수 열의 합)
+            prime_columns = [n - 1 for n in sorted(PRIME_NUMBERS)]
+            prime_counts = self.loader.incidence[:, prime_columns].sum(axis=1).tolist()
+            prime_distribution = Counter(prime_counts)
             
-        dist = Counter(prime_counts)
-        total = len(prime_counts)
+        dist = prime_distribution
+        total = sum(dist.values())
         
         df = pd.DataFrame([
             {'소수개수': k, '합성수개수': 6-k, '출현횟수': v, '비율(%)': round(v/total*100, 2)}
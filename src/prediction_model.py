@@ -4,13 +4,41 @@
 """
 import pandas as pd
 import numpy as np
-from collections import Counter, defaultdict
+from collections import Counter, OrderedDict, defaultdict
 from sklearn.ensemble import RandomForestClassifier
 from sklearn.preprocessing import StandardScaler
 import warnings
+import copy
+from itertools import count
+from feature_engine import (extract_number_features, score_ratio_matrix, weight_matrix,
+                            weighted_number_scores, weighted_score_components, rank_numbers)
+from cooccurrence import get_cooccurrence_index
+from match_evaluation import evaluate_predictions, prize_returns
 warnings.filterwarnings('ignore')
 
 
+# 데이터 버전별 학습 결과 캐시 (LottoDataLoader.data_fingerprint -> (number_features, patterns))
+# 특징/패턴은 가중치와 무관하므로 같은 데이터로 가중치만 바꾼 모델끼리 재사용한다
+# (저장/조회 모두 사본이라 한 모델에서 결과를 수정해도 캐시와 다른 모델에 번지지 않음)
+_TRAINING_CACHE = OrderedDict()
+_TRAINING_CACHE_SIZE = 64
+
+
+def _copy_training_results(number_features, patterns):
+    """번호별 특징/패턴 사본 (내부 딕셔너리/리스트를 공유하지 않음)
+
+    번호별 특징은 {번호: {이름: 숫자}}, 패턴은 {이름: {키: 숫자/튜플 리스트/딕셔너리}} 구조이고
+    가장 안쪽 원소는 숫자/튜플(불변)이므로 두 단계까지만 복사한다 (copy.deepcopy보다 빠름).
+    """
+    features = {num: dict(values) for num, values in number_features.items()}
+    patterns = {name: {key: copy.copy(value) for key, value in pattern.items()}
+                for name, pattern in patterns.items()}
+    return features, patterns
+
+# 번호 점수 버전 (점수를 다시 계산할 때마다 새 번호, 조합 점수 캐시 무효화 키)
+_SCORE_VERSIONS = count(1)
+
+
 class LottoPredictionModel:
     """로또 번호 예측을 위한 머신러닝 모델"""
 
@@ -50,82 +78,14 @@ class LottoPredictionModel:
         self.patterns = {}
 
     def extract_number_features(self):
-        """각 번호(1-45)에 대한 특징 추출"""
-        print("\n📊 번호별 특징 추출 중...")
-
-        all_numbers = self.loader.get_all_numbers_flat(include_bonus=False)
-        frequency = Counter(all_numbers)
+        """각 번호(1-45)에 대한 특징 추출
 
-        features = {}
+        번호별로 numbers_df를 반복 순회하는 대신 데이터 로더의 출현 행렬
+        (incidence)에서 모든 번호의 특징을 한 번에 계산한다.
+        """
+        print("\n📊 번호별 특징 추출 중...")
 
-        for num in range(1, 46):
-            # 1. 전체 출현 빈도
-            total_freq = frequency.get(num, 0)
-
-            # 2. 최근 100회차 출현 빈도
-            recent_100 = []
-            for _, row in self.numbers_df.head(100).iterrows():
-                if num in row['당첨번호']:
-                    recent_100.append(1)
-                else:
-                    recent_100.append(0)
-            recent_freq = sum(recent_100)
-
-            # 3. 최근 50회차 출현 빈도
-            recent_50 = []
-            for _, row in self.numbers_df.head(50).iterrows():
-                if num in row['당첨번호']:
-                    recent_50.append(1)
-                else:
-                    recent_50.append(0)
-            recent_50_freq = sum(recent_50)
-
-            # 4. 마지막 출현 이후 경과 회차
-            last_appearance = None
-            for idx, row in self.numbers_df.iterrows():
-                if num in row['당첨번호']:
-                    last_appearance = idx
-                    break
-
-            absence_length = last_appearance if last_appearance is not None else len(self.numbers_df)
-
-            # 5. 평균 출현 간격
-            appearances = []
-            for idx, row in self.numbers_df.iterrows():
-                if num in row['당첨번호']:
-                    appearances.append(idx)
-
-            if len(appearances) > 1:
-                intervals = [appearances[i] - appearances[i+1] for i in range(len(appearances)-1)]
-                avg_interval = np.mean(intervals) if intervals else 0
-                std_interval = np.std(intervals) if intervals else 0
-            else:
-                avg_interval = 0
-                std_interval = 0
-
-            # 6. 구간 (저/중/고)
-            if 1 <= num <= 15:
-                section = 0  # 저구간
-            elif 16 <= num <= 30:
-                section = 1  # 중구간
-            else:
-                section = 2  # 고구간
-
-            # 7. 홀짝
-            odd_even = num % 2
-
-            features[num] = {
-                'number': num,
-                'total_frequency': total_freq,
-                'recent_100_frequency': recent_freq,
-                'recent_50_frequency': recent_50_freq,
-                'absence_length': absence_length,
-                'avg_interval': avg_interval,
-                'std_interval': std_interval,
-                'section': section,
-                'odd_even': odd_even,
-                'hotness_score': recent_50_freq / (absence_length + 1) * 100  # 핫넘버 점수
-            }
+        features = extract_number_features(self.loader.incidence)
 
         self.number_features = features
         print(f"✓ 45개 번호에 대한 특징 추출 완료")
@@ -135,35 +95,16 @@ class LottoPredictionModel:
         """연속 번호 패턴 분석"""
         print("📊 연속 번호 패턴 학습 중...")
 
+        # 연속 쌍 (n, n+1)과 3연속은 해당 번호쌍/3개 조합의 동시 출현 횟수와 같음
+        index = get_cooccurrence_index(self.loader)
+        pairs, triplets = index.consecutive_counts()
+
         consecutive_stats = {
-            'pair_frequency': defaultdict(int),  # 2개 연속
-            'triplet_frequency': defaultdict(int),  # 3개 연속
-            'has_consecutive_prob': 0
+            'pair_frequency': defaultdict(int, pairs),  # 2개 연속
+            'triplet_frequency': defaultdict(int, triplets),  # 3개 연속
+            'has_consecutive_prob': index.consecutive_rounds / len(self.numbers_df)
         }
 
-        has_consecutive_count = 0
-
-        for _, row in self.numbers_df.iterrows():
-            nums = sorted(row['당첨번호'])
-            has_consecutive = False
-
-            for i in range(len(nums)-1):
-                if nums[i+1] == nums[i] + 1:
-                    has_consecutive = True
-                    # 2개 연속
-                    pair = (nums[i], nums[i+1])
-                    consecutive_stats['pair_frequency'][pair] += 1
-
-                    # 3개 연속 확인
-                    if i < len(nums)-2 and nums[i+2] == nums[i+1] + 1:
-                        triplet = (nums[i], nums[i+1], nums[i+2])
-                        consecutive_stats['triplet_frequency'][triplet] += 1
-
-            if has_consecutive:
-                has_consecutive_count += 1
-
-        consecutive_stats['has_consecutive_prob'] = has_consecutive_count / len(self.numbers_df)
-
         self.patterns['consecutive'] = consecutive_stats
         print(f"✓ 연속 번호 출현 확률: {consecutive_stats['has_consecutive_prob']*100:.1f}%")
         return consecutive_stats
@@ -220,10 +161,7 @@ class LottoPredictionModel:
         """번호 합계 패턴 분석"""
         print("📊 합계 패턴 학습 중...")
 
-        sums = []
-        for _, row in self.numbers_df.iterrows():
-            total = sum(row['당첨번호'])
-            sums.append(total)
+        sums = [sum(numbers) for numbers in self.numbers_df['당첨번호']]
 
         sum_patterns = {
             'mean': np.mean(sums),
@@ -240,45 +178,39 @@ class LottoPredictionModel:
         return sum_patterns
 
     def calculate_number_scores(self):
-        """각 번호에 대한 종합 점수 계산 (가중치 적용)"""
+        """각 번호에 대한 종합 점수 계산 (가중치 적용)
+
+        데이터 전용 단계(번호별 특징)에서 만든 성분 비율 행렬에 가중치만 적용하므로
+        가중치를 바꿀 때는 이 단계만 다시 계산하면 된다 (set_weights / reweighted).
+        """
         print("\n🎯 번호별 종합 점수 계산 중...")
 
         if not self.number_features:
             self.extract_number_features()
 
-        scores = {}
+        # 성분 점수: 1. 빈도 (0-freq_w점) 2. 최근 트렌드 (0-trend_w점)
+        # 3. 부재 기간 (0-absence_w점, 오래 안나왔으면 높은 점수) 4. 핫넘버 (0-hotness_w점)
+        ratios = score_ratio_matrix(self.number_features)
+        weights = weight_matrix([self.weights])
+        return self._set_number_scores(weighted_score_components(ratios, weights)[0],
+                                       weighted_number_scores(ratios, weights)[0])
 
-        # 가중치 추출
-        freq_w = self.weights['freq_weight']
-        trend_w = self.weights['trend_weight']
-        absence_w = self.weights['absence_weight']
-        hotness_w = self.weights['hotness_weight']
+    def _set_number_scores(self, components, totals):
+        """성분 점수 (46, 4)와 총점 (46,) 배열로 number_scores 구성"""
+        components = components.tolist()
+        totals = totals.tolist()
 
+        scores = {}
         for num in range(1, 46):
-            features = self.number_features[num]
-
-            # 점수 계산 (여러 요소 종합, 가중치 적용)
-            # 1. 빈도 점수 (0-freq_w점)
-            freq_score = min(features['total_frequency'] / 100 * freq_w, freq_w)
-
-            # 2. 최근 트렌드 점수 (0-trend_w점)
-            trend_score = features['recent_50_frequency'] / 50 * trend_w
-
-            # 3. 부재 기간 점수 (0-absence_w점) - 오래 안나왔으면 높은 점수
-            absence_score = min(features['absence_length'] / 20 * absence_w, absence_w)
-
-            # 4. 핫넘버 점수 (0-hotness_w점)
-            hotness_score = min(features['hotness_score'] / 10 * hotness_w, hotness_w)
-
-            total_score = freq_score + trend_score + absence_score + hotness_score
+            freq_score, trend_score, absence_score, hotness_score = components[num]
 
             scores[num] = {
-                'total_score': total_score,
+                'total_score': totals[num],
                 'freq_score': freq_score,
                 'trend_score': trend_score,
                 'absence_score': absence_score,
                 'hotness_score': hotness_score,
-                'features': features
+                'features': self.number_features[num]
             }
 
         # 점수 순으로 정렬
@@ -289,19 +221,111 @@ class LottoPredictionModel:
             print(f"  {i}. 번호 {num:2d}: {score['total_score']:.1f}점")
 
         self.number_scores = scores
+        self.score_version = next(_SCORE_VERSIONS)
         return scores
 
+    def set_weights(self, weights):
+        """가중치 변경 후 번호 점수만 재계산 (특징/패턴 재학습 없음)
+
+        Args:
+            weights: 가중치 딕셔너리
+
+        Returns:
+            dict: 새 번호별 점수
+        """
+        self.weights = weights
+        return self.calculate_number_scores()
+
+    def reweighted(self, weights):
+        """같은 특징/패턴(사본)으로 가중치만 다른 새 모델 반환
+
+        Args:
+            weights: 가중치 딕셔너리
+
+        Returns:
+            LottoPredictionModel: 점수 계산까지 끝난 새 모델
+        """
+        if not self.number_features:
+            self.extract_number_features()
+
+        model = LottoPredictionModel(self.loader, weights=weights)
+        model.number_features, model.patterns = _copy_training_results(self.number_features, self.patterns)
+        model.calculate_number_scores()
+        return model
+
+    def reweighted_many(self, weights_list):
+        """같은 특징/패턴(사본)을 쓰는 가중치별 모델 목록 (K개 가중치의 점수를 한 번에 계산)
+
+        Args:
+            weights_list: 가중치 딕셔너리 목록 (K개)
+
+        Returns:
+            list: 점수 계산까지 끝난 LottoPredictionModel 목록 (입력 순서)
+        """
+        if not self.number_features:
+            self.extract_number_features()
+
+        ratios = score_ratio_matrix(self.number_features)
+        weights = weight_matrix(weights_list)
+        components = weighted_score_components(ratios, weights)
+        totals = weighted_number_scores(ratios, weights)
+
+        models = []
+        for k, model_weights in enumerate(weights_list):
+            model = LottoPredictionModel(self.loader, weights=model_weights)
+            model.number_features, model.patterns = _copy_training_results(self.number_features, self.patterns)
+            model._set_number_scores(components[k], totals[k])
+            models.append(model)
+        return models
+
+    def number_score_matrix(self, weights_list):
+        """여러 가중치 벡터에 대한 번호별 총점을 한 번에 계산
+
+        Args:
+            weights_list: 가중치 딕셔너리 목록 (K개)
+
+        Returns:
+            np.ndarray: (K, 46) 번호별 총점 (인덱스 = 번호, 0번 열은 0)
+                각 행은 해당 가중치로 calculate_number_scores를 실행한 total_score와 같다
+        """
+        if not self.number_features:
+            self.extract_number_features()
+
+        return weighted_number_scores(score_ratio_matrix(self.number_features), weight_matrix(weights_list))
+
+    def top_numbers_matrix(self, weights_list, n=20):
+        """여러 가중치 벡터별 상위 N개 번호 (각 행 = 해당 가중치의 get_top_numbers(n))
+
+        Returns:
+            np.ndarray: (K, n) 번호 배열
+        """
+        return rank_numbers(self.number_score_matrix(weights_list), n)
+
     def train_all_patterns(self):
         """모든 패턴 학습"""
         print("\n" + "="*70)
         print("🤖 머신러닝 모델 학습 시작")
         print("="*70)
 
-        self.extract_number_features()
-        self.analyze_consecutive_patterns()
-        self.analyze_section_patterns()
-        self.analyze_odd_even_patterns()
-        self.analyze_sum_patterns()
+        # 1. 데이터 전용 단계 (특징/패턴, 같은 데이터 버전이면 캐시 재사용)
+        key = self.loader.data_fingerprint()
+        cached = _TRAINING_CACHE.get(key)
+        if cached is None:
+            self.extract_number_features()
+            self.analyze_consecutive_patterns()
+            self.analyze_section_patterns()
+            self.analyze_odd_even_patterns()
+            self.analyze_sum_patterns()
+
+            _TRAINING_CACHE[key] = _copy_training_results(self.number_features, self.patterns)
+            if len(_TRAINING_CACHE) > _TRAINING_CACHE_SIZE:
+                _TRAINING_CACHE.popitem(last=False)
+        else:
+            print("♻️ 같은 데이터의 특징/패턴 학습 결과 재사용")
+            _TRAINING_CACHE.move_to_end(key)
+            self.number_features, self.patterns = _copy_training_results(*cached)
+
+        # 2. 가중치 단계 (번호 점수)
         self.calculate_number_scores()
 
         print("\n" + "="*70)
@@ -314,16 +338,41 @@ class LottoPredictionModel:
             'scores': self.number_scores
         }
 
+    def train_from_state(self, training_state):
+        """증분 학습 상태로부터 모델 구성 (train_all_patterns와 동일한 결과)
+
+        워크포워드 백테스팅에서 회차마다 전체 데이터를 다시 순회하지 않도록
+        IncrementalTrainingState가 누적한 특징과 패턴을 그대로 사용한다.
+
+        Args:
+            training_state: IncrementalTrainingState 인스턴스 (현재 로더와 같은 회차까지 반영)
+        """
+        print(f"\n🤖 증분 학습 상태로 모델 구성 ({training_state.n_rounds}회차)")
+
+        self.number_features = training_state.number_features()
+        self.patterns = training_state.pattern_summary()
+        self.calculate_number_scores()
+
+        return {
+            'number_features': self.number_features,
+            'patterns': self.patterns,
+            'scores': self.number_scores
+        }
+
     def get_top_numbers(self, n=20):
-        """점수 기반 상위 N개 번호 반환"""
+        """점수 기반 상위 N개 번호 반환 (순위는 점수가 바뀔 때만 다시 정렬)"""
         if not hasattr(self, 'number_scores'):
             self.calculate_number_scores()
 
-        sorted_scores = sorted(self.number_scores.items(),
-                             key=lambda x: x[1]['total_score'],
-                             reverse=True)
+        ranking = getattr(self, '_ranking', None)
+        if ranking is None or ranking[0] is not self.number_scores:
+            sorted_scores = sorted(self.number_scores.items(),
+                                 key=lambda x: x[1]['total_score'],
+                                 reverse=True)
+            ranking = (self.number_scores, [num for num, _ in sorted_scores])
+            self._ranking = ranking
 
-        return [num for num, _ in sorted_scores[:n]]
+        return ranking[1][:n]
 
     def get_probability_weights(self):
         """각 번호의 확률 가중치 계산"""
@@ -346,56 +395,37 @@ class LottoPredictionModel:
         """
         print(f"\n📊 최근 {n_rounds}회차 성능 평가 중...")
         
-        recent_data = self.numbers_df.head(n_rounds)
-        
         # 현재 모델의 Top 6 번호 (고정)
-        top_6 = set(self.get_top_numbers(6))
-        
+        top_6 = self.get_top_numbers(6)
+
         results = []
         total_prize = 0
         total_cost = n_rounds * 1000
-        
-        # 등수별 당첨금 (대략적인 평균값)
-        prizes = {
-            1: 2000000000,
-            2: 50000000,
-            3: 1500000,
-            4: 50000,
-            5: 5000,
-            0: 0
-        }
-        
-        for _, row in recent_data.iterrows():
-            round_num = row['회차']
-            winning_nums = set(row['당첨번호'])
-            bonus_num = row['보너스번호']
-            
-            # 매칭 개수 확인
-            matched = len(winning_nums & top_6)
-            is_bonus = bonus_num in top_6
-            
-            # 등수 판별
-            rank = 0
-            if matched == 6: rank = 1
-            elif matched == 5 and is_bonus: rank = 2
-            elif matched == 5: rank = 3
-            elif matched == 4: rank = 4
-            elif matched == 3: rank = 5
-            
-            prize = prizes.get(rank, 0)
+
+        # 최근 n_rounds 회차와 한 번에 비교 (일치 개수 / 등수 / 해당 회차 실제 당첨금)
+        draws = self.loader.draws[:n_rounds]
+        matches, ranks = evaluate_predictions([top_6], draws, self.loader.bonus_numbers[:n_rounds])
+        prizes = prize_returns(ranks[0], self.loader.prize_amounts[:n_rounds], 1000)['prize'].tolist()
+
+        for j in range(len(draws)):
+            matched = int(matches[0, j])
+            rank = int(ranks[0, j])
+
+            prize = prizes[j]
             total_prize += prize
-            
+
             # 당첨 번호들의 평균 점수 (모델의 확신도)
+            winning_nums = set(draws[j].tolist())
             avg_score = np.mean([self.number_scores[n]['total_score'] for n in winning_nums]) if hasattr(self, 'number_scores') else 0
-            
+
             results.append({
-                'round': round_num,
+                'round': int(self.loader.round_numbers[j]),
                 'matched': matched,
                 'rank': rank,
                 'prize': prize,
                 'avg_score': avg_score
             })
-            
+
         avg_match = sum(r['matched'] for r in results) / n_rounds
         roi = (total_prize - total_cost) / total_cost * 100 if total_cost > 0 else 0
         
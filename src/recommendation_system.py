@@ -4,17 +4,153 @@
 """
 import numpy as np
 import random
-from collections import Counter
-from itertools import combinations
+from collections import Counter, OrderedDict
+from types import MappingProxyType
+from itertools import combinations, chain
+from grid_geometry import NUMBER_TO_POSITION, mean_manhattan_distance
+from cooccurrence import get_cooccurrence_index
+from combination_scorer import CombinationScorer, search_top_combinations, top_k_order
+from score_cache import CombinationScoreCache
+from combination_sampler import (make_rng, sample_combinations, sample_pattern_combinations,
+                                 count_pattern_combinations)
+
+
+# 데이터 버전별 공유 분석 테이블 캐시 (LottoDataLoader.data_fingerprint -> RecommendationDataTables)
+_TABLES_CACHE = OrderedDict()
+_TABLES_CACHE_SIZE = 64
+
+
+class RecommendationDataTables:
+    """추천 시스템이 사용하는 데이터 전용 분석 결과 (가중치와 무관)
+
+    같은 데이터 버전에 묶인 추천 시스템 인스턴스들이 공유하며, 각 항목은
+    처음 사용할 때 한 번만 계산한다. 가중치가 바뀌어도 다시 만들 필요가 없다.
+    워크포워드 백테스팅에서는 from_state()로 증분 학습 상태의 누적 집계에서 만든다.
+    여러 인스턴스가 같은 객체를 보므로 결과는 읽기 전용 형태(MappingProxyType,
+    튜플, frozenset)로 제공하고, DataFrame(prime_df)은 복사본을 반환한다.
+    """
+
+    def __init__(self, loader):
+        """
+        Args:
+            loader: extract_numbers()가 끝난 LottoDataLoader
+        """
+        self.loader = loader
+        self._image_analyzer = None
+        self._pattern_analyzer = None
+        self._cooccurrence = None
+        self._prime_distribution = None
+        self._compatibility = None
+        self._never_appeared_set = None
+        self._prime_df = None
+        self._prime_score_map = None
+        self._overheated_numbers = None
+
+    @classmethod
+    def from_state(cls, loader, training_state):
+        """증분 학습 상태의 누적 집계로 구성 (loader 데이터를 다시 순회하지 않음)
+
+        상태는 이후 회차로 계속 전진하므로 필요한 집계는 지금 복사해 둔다.
+
+        Args:
+            loader: training_state와 같은 회차까지의 LottoDataLoader (예: prefix_view)
+            training_state: IncrementalTrainingState
+        """
+        tables = cls(loader)
+        tables._cooccurrence = training_state.cooccurrence_index()
+        tables._prime_distribution = training_state.prime_distribution()
+        return tables
+
+    @property
+    def image_analyzer(self):
+        if self._image_analyzer is None:
+            from image_pattern_analysis import ImagePatternAnalysis
+            self._image_analyzer = ImagePatternAnalysis(self.loader)
+        return self._image_analyzer
+
+    @property
+    def pattern_analyzer(self):
+        if self._pattern_analyzer is None:
+            from pattern_analysis import PatternAnalysis
+            self._pattern_analyzer = PatternAnalysis(self.loader)
+        return self._pattern_analyzer
+
+    @property
+    def cooccurrence(self):
+        """동시 출현 인덱스 (CooccurrenceIndex)"""
+        if self._cooccurrence is None:
+            self._cooccurrence = get_cooccurrence_index(self.loader)
+        return self._cooccurrence
+
+    @property
+    def compatibility(self):
+        """궁합수/상극수 (pair_counts {(a, b): 횟수} 읽기 전용 매핑, never_appeared 튜플)"""
+        if self._compatibility is None:
+            pair_counts, never_appeared = self.pattern_analyzer.analyze_compatibility(self.cooccurrence)
+            self._compatibility = (MappingProxyType(pair_counts), tuple(never_appeared))
+        return self._compatibility
+
+    @property
+    def never_appeared_set(self):
+        if self._never_appeared_set is None:
+            self._never_appeared_set = frozenset(self.compatibility[1])
+        return self._never_appeared_set
+
+    @property
+    def prime_df(self):
+        """소수/합성수 비율 분석 결과 (호출마다 복사본)"""
+        if self._prime_df is None:
+            self._prime_df = self.pattern_analyzer.analyze_prime_composite(self._prime_distribution)
+        return self._prime_df.copy()
+
+    @property
+    def prime_score_map(self):
+        """소수 개수 -> 출현 비율(%) 읽기 전용 매핑"""
+        if self._prime_score_map is None:
+            prime_df = self.prime_df
+            self._prime_score_map = MappingProxyType(dict(zip(prime_df['소수개수'], prime_df['비율(%)'])))
+        return self._prime_score_map
+
+    @property
+    def overheated_numbers(self):
+        """Phase 3 과열 번호 (최근 10회차 중 4회 이상 출현)"""
+        if self._overheated_numbers is None:
+            counts = self.loader.incidence[:10].sum(axis=0)
+            self._overheated_numbers = frozenset(int(num) for num in np.flatnonzero(counts >= 4) + 1)
+        return self._overheated_numbers
+
+
+def get_recommendation_tables(loader, training_state=None):
+    """데이터 버전별로 공유되는 RecommendationDataTables 반환 (없으면 생성 후 캐시)
+
+    Args:
+        loader: extract_numbers()가 끝난 LottoDataLoader
+        training_state: loader와 같은 회차까지 반영된 IncrementalTrainingState (옵션)
+            - 캐시에 없을 때 상태의 누적 집계로 테이블 구성
+    """
+    key = loader.data_fingerprint()
+    tables = _TABLES_CACHE.get(key)
+    if tables is None:
+        if training_state is not None:
+            tables = RecommendationDataTables.from_state(loader, training_state)
+        else:
+            tables = RecommendationDataTables(loader)
+        _TABLES_CACHE[key] = tables
+        if len(_TABLES_CACHE) > _TABLES_CACHE_SIZE:
+            _TABLES_CACHE.popitem(last=False)
+    else:
+        _TABLES_CACHE.move_to_end(key)
+    return tables
 
 
 class LottoRecommendationSystem:
     """로또 번호 추천 시스템"""
 
-    def __init__(self, prediction_model):
+    def __init__(self, prediction_model, tables=None):
         """
         Args:
             prediction_model: LottoPredictionModel 인스턴스
+            tables: 사용할 RecommendationDataTables (없으면 모델 데이터 버전의 공유 테이블)
         """
         self.model = prediction_model
         self.loader = prediction_model.loader
@@ -22,35 +158,50 @@ class LottoRecommendationSystem:
         # 그리드 패턴 데이터 초기화 (7x7 그리드)
         self._init_grid_pattern_data()
 
-        # Phase 3: 제외수 필터링 데이터 초기화
-        self._init_phase3_filters()
+        # 데이터 전용 분석 테이블 (이미지 패턴, 궁합수/상극수, 소수 패턴, Phase 3 과열 번호)
+        # 같은 데이터 버전의 추천 시스템끼리 공유하며, 처음 사용할 때 계산
+        self.tables = tables if tables is not None else get_recommendation_tables(self.loader)
+        self.primes = {2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41, 43}
 
-        # 이미지 패턴 분석기 초기화
-        from image_pattern_analysis import ImagePatternAnalysis
-        self.image_analyzer = ImagePatternAnalysis(self.loader)
+        # 조합 점수 LRU 캐시 (모델 점수 버전이 바뀌면 자동으로 비움)
+        self.score_cache = CombinationScoreCache()
 
-        # 패턴 분석기 초기화 (신규 피처 통합)
-        from pattern_analysis import PatternAnalysis
-        self.pattern_analyzer = PatternAnalysis(self.loader)
-        
-        # 분석 데이터 로드 (스코어링 속도를 위해 미리 계산)
-        self.pair_counts, self.never_appeared = self.pattern_analyzer.analyze_compatibility()
-        self.never_appeared_set = set(self.never_appeared)
-        
-        self.prime_df = self.pattern_analyzer.analyze_prime_composite()
-        self.prime_score_map = dict(zip(self.prime_df['소수개수'], self.prime_df['비율(%)']))
-        self.primes = {2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41, 43}
+    @property
+    def image_analyzer(self):
+        return self.tables.image_analyzer
+
+    @property
+    def pattern_analyzer(self):
+        return self.tables.pattern_analyzer
+
+    @property
+    def pair_counts(self):
+        return self.tables.compatibility[0]
+
+    @property
+    def never_appeared(self):
+        return self.tables.compatibility[1]
+
+    @property
+    def never_appeared_set(self):
+        return self.tables.never_appeared_set
+
+    @property
+    def prime_df(self):
+        return self.tables.prime_df
+
+    @property
+    def prime_score_map(self):
+        return self.tables.prime_score_map
+
+    @property
+    def overheated_numbers(self):
+        return self.tables.overheated_numbers
 
     def _init_grid_pattern_data(self):
         """그리드 패턴 관련 데이터 초기화"""
-        # 번호를 그리드 좌표로 매핑 (1-45)
-        self.number_to_position = {}
-        number = 1
-        for row in range(7):
-            for col in range(7):
-                if number <= 45:
-                    self.number_to_position[number] = (row, col)
-                    number += 1
+        # 번호를 그리드 좌표로 매핑 (1-45, grid_geometry 공용 읽기 전용 테이블)
+        self.number_to_position = NUMBER_TO_POSITION
 
         # 그리드 구역별 번호 정의
         self.grid_zones = {
@@ -68,17 +219,6 @@ class LottoRecommendationSystem:
             'corner': 0.83     # 61.5 / 74.0 = 0.83
         }
 
-    def _init_phase3_filters(self):
-        """Phase 3: 제외수 필터링을 위한 데이터 초기화"""
-        # 1. 과열 번호 (최근 10회차 중 4회 이상 출현)
-        recent_10 = self.model.numbers_df.head(10)
-        recent_nums = []
-        for _, row in recent_10.iterrows():
-            recent_nums.extend(row['당첨번호'])
-        
-        counts = Counter(recent_nums)
-        self.overheated_numbers = {num for num, count in counts.items() if count >= 4}
-
     def _get_grid_zone(self, number):
         """번호가 속한 그리드 구역 반환"""
         if number in self.grid_zones['corner']:
@@ -126,20 +266,11 @@ class LottoRecommendationSystem:
 
     def _calculate_spatial_distance(self, numbers):
         """번호들 간의 평균 맨해튼 거리 계산"""
-        distances = []
         nums = sorted(numbers)
+        if len(nums) < 2:
+            return 0
 
-        for i in range(len(nums)):
-            for j in range(i+1, len(nums)):
-                pos1 = self.number_to_position.get(nums[i])
-                pos2 = self.number_to_position.get(nums[j])
-
-                if pos1 and pos2:
-                    # 맨해튼 거리
-                    dist = abs(pos1[0] - pos2[0]) + abs(pos1[1] - pos2[1])
-                    distances.append(dist)
-
-        return np.mean(distances) if distances else 0
+        return mean_manhattan_distance(nums)
 
     def _is_valid_combination(self, numbers, strict=False):
         """번호 조합이 유효한지 검증"""
@@ -188,7 +319,8 @@ class LottoRecommendationSystem:
         return True
 
     def _calculate_combination_score(self, numbers):
-        """조합에 대한 점수 계산"""
+        """조합에 대한 점수 계산 (번호 순서와 무관하게 정렬된 조합으로 계산)"""
+        numbers = sorted(numbers)
         score = 0
 
         # 1. 개별 번호 점수 합
@@ -285,42 +417,102 @@ class LottoRecommendationSystem:
                 
         return True
 
-    def _find_best_combination(self, candidates, n_combinations=1, constraint_func=None, custom_score_func=None, apply_phase3=False):
-        """최적 조합 탐색 (완전 탐색) - Phase 1 결정론적 엔진"""
-        # 후보군이 너무 많으면 조합이 폭발하므로 제한 (22C6 = 74,613, 23C6 = 100,947)
-        limit = 22
+    def _score_version(self):
+        """조합 점수에 영향을 주는 입력의 버전 키
+
+        모델 점수 버전(재학습/가중치 변경)과 추천 시스템 자체의 그리드 가중치/구역,
+        소수 집합, 데이터 분석 테이블을 함께 묶는다. 어느 하나라도 바뀌면 키가 달라진다.
+        """
+        return (
+            self.model.score_version,
+            self.tables,
+            tuple(sorted(self.grid_weights.items())),
+            tuple((zone, tuple(numbers)) for zone, numbers in sorted(self.grid_zones.items())),
+            tuple(sorted(self.primes)),
+        )
+
+    def _get_combination_scorer(self):
+        """일괄 점수 계산 커널 (점수 입력 버전이 바뀌면 다시 생성)"""
+        version = self._score_version()
+        scorer = getattr(self, '_combination_scorer', None)
+        if scorer is None or scorer.version != version:
+            scorer = CombinationScorer(self)
+            self._combination_scorer = scorer
+        return scorer
+
+    def _calculate_combination_scores(self, combos):
+        """여러 조합의 점수를 한 번에 계산 (_calculate_combination_score와 동일한 값)
+
+        Args:
+            combos: (M, 6) 번호 배열 또는 조합 리스트
+
+        Returns:
+            np.ndarray: (M,) 조합별 점수
+        """
+        return self._get_combination_scorer().scores(combos)
+
+    def _cached_combination_scores(self, combos):
+        """여러 조합의 점수를 캐시를 거쳐 계산 (정렬된 조합 기준, 처음 보는 조합만 채점)
+
+        Args:
+            combos: (M, 6) 번호 배열 또는 조합 리스트
+
+        Returns:
+            np.ndarray: (M,) 조합별 점수
+        """
+        return self.score_cache.scores(combos, self._score_version(), self._calculate_combination_scores)
+
+    def _cached_combination_score(self, numbers):
+        """조합 1개의 점수를 캐시를 거쳐 계산 (정렬된 조합 기준)"""
+        return float(self._cached_combination_scores([numbers])[0])
+
+    def _find_best_combination(self, candidates, n_combinations=1, constraint_func=None, custom_score_func=None,
+                               apply_phase3=False, score_weights=(1.0, 0.0, 0.0)):
+        """최적 조합 탐색 - Phase 1 결정론적 엔진
+
+        분기 한정(branch-and-bound) 상위 K개 탐색으로 완전 탐색과 같은 결과를 반환한다.
+        score_weights는 (종합 점수, 그리드 점수, 이미지 점수) 가중치이며,
+        custom_score_func(조합 1개 -> 점수)를 주면 상한을 알 수 없으므로 완전 탐색한다.
+        """
+        # 후보군 제한 (30C6 = 593,775 - 상한 가지치기로 대부분의 조합은 채점하지 않음)
+        # 전략별 최적 조합 모드는 상위 22개 번호를 넘기고, 안전 전략만 22개를 넘을 수 있음
+        limit = 30
         if len(candidates) > limit:
             candidates = candidates[:limit]
-            
-        all_combos = list(combinations(candidates, 6))
-        valid_combos = []
-        
-        for combo in all_combos:
+
+        candidates = [int(n) for n in candidates]
+        if len(candidates) < 6:
+            return []
+
+        scorer = self._get_combination_scorer()
+
+        def leaf_mask(combos):
             # 제약 조건 확인
-            if constraint_func and not constraint_func(combo):
-                continue
-                
+            mask = np.ones(len(combos), dtype=bool)
+            if constraint_func:
+                mask &= np.fromiter((bool(constraint_func(tuple(combo))) for combo in combos.tolist()),
+                                    dtype=bool, count=len(combos))
+
             # Phase 3 필터링 (옵션)
-            if apply_phase3 and not self._check_phase3_constraints(combo):
-                continue
+            if apply_phase3:
+                mask &= scorer.phase3_mask(combos)
 
             # 유효성 검사 (기본)
-            if not self._is_valid_combination(combo):
-                continue
-                
-            # 점수 계산
-            if custom_score_func:
-                score = custom_score_func(combo)
-            else:
-                score = self._calculate_combination_score(combo)
-                
-            valid_combos.append((combo, score))
-            
-        # 점수순 정렬
-        valid_combos.sort(key=lambda x: x[1], reverse=True)
-        
-        # 상위 n개 반환
-        return [list(c[0]) for c in valid_combos[:n_combinations]]
+            return mask & scorer.is_valid(combos)
+
+        if custom_score_func:
+            index = np.fromiter(chain.from_iterable(combinations(range(len(candidates)), 6)), dtype=np.int64)
+            index = index.reshape(-1, 6)
+            combos = np.array(candidates, dtype=np.int64)[index]
+            mask = leaf_mask(combos)
+            index, combos = index[mask], combos[mask]
+            scores = np.array([custom_score_func(tuple(combo)) for combo in combos.tolist()], dtype=np.float64)
+            return combos[top_k_order(index, scores, n_combinations)].tolist()
+
+        return search_top_combinations(
+            scorer, candidates, n_combinations, weights=score_weights, leaf_mask_func=leaf_mask,
+            prefix_mask_func=scorer.prefix_phase3_mask if apply_phase3 else None
+        )
 
     def generate_by_score(self, n_combinations=5, use_top=20, seed=None, best_only=False):
         """점수 기반 추천"""
@@ -328,45 +520,23 @@ class LottoRecommendationSystem:
 
         if best_only:
             print("  ✨ 최적 조합 모드 (랜덤 제외)")
-            # 상위 번호들로 만들 수 있는 모든 조합 중 최고 점수 조합 반환
-            top_candidates = self.model.get_top_numbers(max(use_top, 22))
+            # 상위 22개 번호로 만들 수 있는 모든 조합 중 최고 점수 조합 반환
+            top_candidates = self.model.get_top_numbers(22)
             return self._find_best_combination(top_candidates, n_combinations, apply_phase3=True)
 
-        # 시드 설정 (고정 모드)
-        if seed is not None:
-            random.seed(seed)
-            np.random.seed(seed)
-
+        # 상위 번호들로 가능한 조합 일괄 생성 (시드가 같으면 같은 결과)
         top_numbers = self.model.get_top_numbers(use_top)
-        combinations_list = []
+        combos = sample_combinations(top_numbers, n_combinations, make_rng(seed),
+                                     valid_mask_func=self._get_combination_scorer().is_valid)
 
-        # 상위 번호들로 가능한 조합 생성
-        max_attempts = 10000
-        attempts = 0
+        # 점수 순으로 정렬 (동점은 생성 순서)
+        scores = self._cached_combination_scores(combos)
+        order = np.argsort(-scores, kind='stable')[:n_combinations]
 
-        while len(combinations_list) < n_combinations and attempts < max_attempts:
-            # 상위 번호에서 가중치 샘플링
-            selected = random.sample(top_numbers, 6)
+        results = combos[order].tolist()
 
-            if self._is_valid_combination(selected):
-                sorted_selected = tuple(sorted(selected))
-                if sorted_selected not in combinations_list:
-                    combinations_list.append(sorted_selected)
-
-            attempts += 1
-
-        # 점수 순으로 정렬
-        scored_combos = []
-        for combo in combinations_list:
-            score = self._calculate_combination_score(combo)
-            scored_combos.append((combo, score))
-
-        scored_combos.sort(key=lambda x: x[1], reverse=True)
-
-        results = [list(combo) for combo, _ in scored_combos[:n_combinations]]
-
-        for i, (combo, score) in enumerate(scored_combos[:n_combinations], 1):
-            print(f"  {i}. {list(combo)} (점수: {score:.1f})")
+        for i, (combo, score) in enumerate(zip(results, scores[order]), 1):
+            print(f"  {i}. {combo} (점수: {score:.1f})")
 
         return results
 
@@ -382,31 +552,13 @@ class LottoRecommendationSystem:
             top_candidates = sorted_nums[:22]
             return self._find_best_combination(top_candidates, n_combinations, apply_phase3=True)
 
-        # 시드 설정 (고정 모드)
-        if seed is not None:
-            random.seed(seed)
-            np.random.seed(seed)
-
         weights = self.model.get_probability_weights()
         numbers = list(range(1, 46))
         probabilities = [weights[n] for n in numbers]
 
-        combinations_list = []
-        max_attempts = 10000
-        attempts = 0
-
-        while len(combinations_list) < n_combinations and attempts < max_attempts:
-            # 가중치 기반 샘플링
-            selected = np.random.choice(numbers, size=6, replace=False, p=probabilities)
-
-            if self._is_valid_combination(selected):
-                sorted_selected = tuple(sorted(selected))
-                if sorted_selected not in combinations_list:
-                    combinations_list.append(sorted_selected)
-
-            attempts += 1
-
-        results = [list(combo) for combo in combinations_list[:n_combinations]]
+        # 가중치 기반 일괄 샘플링 (시드가 같으면 같은 결과)
+        results = sample_combinations(numbers, n_combinations, make_rng(seed), weights=probabilities,
+                                      valid_mask_func=self._get_combination_scorer().is_valid).tolist()
 
         for i, combo in enumerate(results, 1):
             print(f"  {i}. {combo}")
@@ -423,8 +575,8 @@ class LottoRecommendationSystem:
 
         if best_only:
             print("  ✨ 최적 조합 모드 (랜덤 제외)")
-            # 상위 번호 중 패턴을 만족하는 최적 조합 탐색
-            top_candidates = self.model.get_top_numbers(25)
+            # 상위 22개 번호 중 패턴을 만족하는 최적 조합 탐색
+            top_candidates = self.model.get_top_numbers(22)
             
             def pattern_constraint(combo):
                 low = sum(1 for n in combo if 1 <= n <= 15)
@@ -435,55 +587,20 @@ class LottoRecommendationSystem:
             
             return self._find_best_combination(top_candidates, n_combinations, constraint_func=pattern_constraint, apply_phase3=True)
 
-        # 시드 설정 (고정 모드)
-        if seed is not None:
-            random.seed(seed)
-            np.random.seed(seed)
-
         print(f"  목표 구간 분포: 저{section_pattern[0]}/중{section_pattern[1]}/고{section_pattern[2]}")
         print(f"  목표 홀짝 분포: 홀{odd_even_pattern[0]}/짝{odd_even_pattern[1]}")
 
-        combinations_list = []
-        max_attempts = 10000
-        attempts = 0
+        # 홀수 개수 오차 1 허용
+        odd_counts = range(max(odd_even_pattern[0] - 1, 0), min(odd_even_pattern[0] + 1, 6) + 1)
 
-        top_numbers = self.model.get_top_numbers(30)  # 상위 30개에서 선택
+        # 상위 30개에서 선택, 패턴을 만족하는 조합이 부족하면 전체 번호에서 선택
+        pool = self.model.get_top_numbers(30)
+        if count_pattern_combinations(pool, section_pattern, odd_counts) < n_combinations:
+            pool = list(range(1, 46))
 
-        while len(combinations_list) < n_combinations and attempts < max_attempts:
-            selected = []
-
-            # 구간별로 번호 선택
-            low_pool = [n for n in top_numbers if 1 <= n <= 15]
-            mid_pool = [n for n in top_numbers if 16 <= n <= 30]
-            high_pool = [n for n in top_numbers if 31 <= n <= 45]
-
-            # 구간 패턴 맞추기
-            if len(low_pool) >= section_pattern[0]:
-                selected.extend(random.sample(low_pool, section_pattern[0]))
-            if len(mid_pool) >= section_pattern[1]:
-                selected.extend(random.sample(mid_pool, section_pattern[1]))
-            if len(high_pool) >= section_pattern[2]:
-                selected.extend(random.sample(high_pool, section_pattern[2]))
-
-            # 부족하면 나머지 채우기
-            while len(selected) < 6:
-                remaining = [n for n in top_numbers if n not in selected]
-                if remaining:
-                    selected.append(random.choice(remaining))
-                else:
-                    break
-
-            if len(selected) == 6 and self._is_valid_combination(selected):
-                # 홀짝 패턴도 확인
-                odd_count = sum(1 for n in selected if n % 2 == 1)
-                if abs(odd_count - odd_even_pattern[0]) <= 1:  # 오차 1 허용
-                    sorted_selected = tuple(sorted(selected))
-                    if sorted_selected not in combinations_list:
-                        combinations_list.append(sorted_selected)
-
-            attempts += 1
-
-        results = [list(combo) for combo in combinations_list[:n_combinations]]
+        # 패턴을 만족하는 조합만 균등 추출 (시드가 같으면 같은 결과)
+        results = sample_pattern_combinations(pool, section_pattern, odd_counts, n_combinations,
+                                              make_rng(seed)).tolist()
 
         for i, combo in enumerate(results, 1):
             odd = sum(1 for n in combo if n % 2 == 1)
@@ -500,18 +617,14 @@ class LottoRecommendationSystem:
 
         if best_only:
             print("  ✨ 최적 조합 모드 (랜덤 제외)")
-            top_candidates = self.model.get_top_numbers(25)
+            top_candidates = self.model.get_top_numbers(22)
             
-            def grid_score_func(combo):
-                # 그리드 점수 + 기본 점수
-                return self._calculate_grid_score(combo) + self._calculate_combination_score(combo) * 0.5
-                
-            return self._find_best_combination(top_candidates, n_combinations, custom_score_func=grid_score_func, apply_phase3=True)
+            # 그리드 점수 + 기본 점수 * 0.5
+            return self._find_best_combination(top_candidates, n_combinations, apply_phase3=True,
+                                               score_weights=(0.5, 1.0, 0.0))
 
-        # 시드 설정 (고정 모드)
-        if seed is not None:
-            random.seed(seed)
-            np.random.seed(seed)
+        # 전략별 난수 생성기 (시드가 같으면 같은 결과, 전역 random 상태와 무관)
+        rng = random.Random(seed)
 
         # 중간 영역 번호 우선 선택
         middle_numbers = self.grid_zones['middle']
@@ -528,21 +641,21 @@ class LottoRecommendationSystem:
             # 1. 중간 영역에서 3-4개 선택
             middle_pool = [n for n in middle_numbers if n in top_numbers[:30]]
             if len(middle_pool) >= 3:
-                num_middle = random.choice([3, 4])
-                selected.extend(random.sample(middle_pool, min(num_middle, len(middle_pool))))
+                num_middle = rng.choice([3, 4])
+                selected.extend(rng.sample(middle_pool, min(num_middle, len(middle_pool))))
 
             # 2. 반대 대각선에서 1-2개 선택
             anti_diag_pool = [n for n in anti_diag_numbers if n not in selected and n in top_numbers[:30]]
             if len(anti_diag_pool) >= 1:
-                num_anti_diag = random.choice([1, 2])
-                selected.extend(random.sample(anti_diag_pool, min(num_anti_diag, len(anti_diag_pool))))
+                num_anti_diag = rng.choice([1, 2])
+                selected.extend(rng.sample(anti_diag_pool, min(num_anti_diag, len(anti_diag_pool))))
 
             # 3. 나머지는 상위 번호에서 선택 (모서리 제외)
             remaining_pool = [n for n in top_numbers[:30]
                             if n not in selected and n not in self.grid_zones['corner']]
 
             while len(selected) < 6 and remaining_pool:
-                selected.append(random.choice(remaining_pool))
+                selected.append(rng.choice(remaining_pool))
                 remaining_pool = [n for n in remaining_pool if n not in selected]
 
             if len(selected) == 6:
@@ -558,10 +671,10 @@ class LottoRecommendationSystem:
             attempts += 1
 
         # 그리드 점수로 정렬
+        total_scores = self._cached_combination_scores(combinations_list).tolist()
         scored_combos = []
-        for combo in combinations_list:
+        for combo, total_score in zip(combinations_list, total_scores):
             grid_score = self._calculate_grid_score(combo)
-            total_score = self._calculate_combination_score(combo)
             scored_combos.append((combo, grid_score, total_score))
 
         scored_combos.sort(key=lambda x: x[2], reverse=True)  # 총점으로 정렬
@@ -584,16 +697,12 @@ class LottoRecommendationSystem:
             print("  ✨ 최적 조합 모드 (랜덤 제외)")
             top_candidates = self.model.get_top_numbers(22)
             
-            def image_score_func(combo):
-                score_data = self.image_analyzer.calculate_image_score(combo)
-                return score_data['total_score']
-                
-            return self._find_best_combination(top_candidates, n_combinations, custom_score_func=image_score_func, apply_phase3=True)
+            # 이미지 패턴 점수만 사용
+            return self._find_best_combination(top_candidates, n_combinations, apply_phase3=True,
+                                               score_weights=(0.0, 0.0, 1.0))
 
-        # 시드 설정 (고정 모드)
-        if seed is not None:
-            random.seed(seed)
-            np.random.seed(seed)
+        # 전략별 난수 생성기 (시드가 같으면 같은 결과, 전역 random 상태와 무관)
+        rng = random.Random(seed)
 
         combinations_list = []
         max_attempts = 10000
@@ -604,7 +713,7 @@ class LottoRecommendationSystem:
         print("  목표: 시각적 밀도 3.0~4.5, 4분면 균형, 무게중심 균형, 좌우 대칭")
 
         while len(combinations_list) < n_combinations and attempts < max_attempts:
-            selected = random.sample(top_numbers, 6)
+            selected = rng.sample(top_numbers, 6)
 
             if self._is_valid_combination(selected):
                 # 이미지 패턴 점수 계산
@@ -631,54 +740,82 @@ class LottoRecommendationSystem:
 
         return results
 
-    def generate_hybrid(self, n_combinations=5, seed=None, best_only=False):
-        """하이브리드 추천 (여러 전략 혼합)"""
-        print(f"\n⭐ 하이브리드 추천 (최고 품질)")
+    def _prepare_shared_inputs(self):
+        """여러 전략이 함께 쓰는 입력을 한 번만 준비 (번호 순위, 조합 점수 커널)"""
+        self.model.get_top_numbers(45)
+        self._get_combination_scorer()
 
-        if best_only:
-            print("  ✨ 최적 조합 모드 (랜덤 제외 - 완전 탐색)")
-            # 상위 22개 번호로 확장하여 탐색 (22C6 = 74,613)
-            top_candidates = self.model.get_top_numbers(22)
-            return self._find_best_combination(top_candidates, n_combinations, apply_phase3=True)
+    def _run_strategies(self, jobs, catch_errors=False):
+        """서로 독립인 전략 여러 개를 공유 입력 준비 후 순서대로 실행
+
+        각 전략은 자체 난수 생성기를 쓰므로 실행 순서와 무관하게 같은 결과를 낸다.
 
-        # 시드 설정 (고정 모드)
-        if seed is not None:
-            random.seed(seed)
-            np.random.seed(seed)
+        Args:
+            jobs: [(이름, 전략 메서드, 인자 dict)]
+            catch_errors: True이면 실패한 전략은 경고 후 빈 결과
 
-        all_combos = []
+        Returns:
+            dict: 이름 -> 조합 리스트 (jobs 순서)
+        """
+        self._prepare_shared_inputs()
 
-        # 각 전략에서 생성 (5가지 전략)
-        score_combos = self.generate_by_score(n_combinations=2, use_top=15, seed=seed)
-        prob_combos = self.generate_by_probability(n_combinations=2, seed=seed)
-        pattern_combos = self.generate_by_pattern(n_combinations=2, seed=seed)
-        grid_combos = self.generate_grid_based(n_combinations=2, seed=seed)
-        image_combos = self.generate_image_based(n_combinations=2, seed=seed)  # NEW
+        results = {}
+        for name, func, kwargs in jobs:
+            try:
+                results[name] = func(**kwargs)
+            except Exception as e:
+                if not catch_errors:
+                    raise
+                print(f"  ⚠️ 전략 실행 중 오류: {e}")
+                results[name] = []
+        return results
 
-        # 중복 제거하여 합치기
-        for combo in score_combos + prob_combos + pattern_combos + grid_combos + image_combos:
-            sorted_combo = tuple(sorted(combo))
-            if sorted_combo not in all_combos:
-                all_combos.append(sorted_combo)
+    def _hybrid_jobs(self, seed=None):
+        """하이브리드 추천의 후보 전략 (5가지 전략에서 2개씩)"""
+        return [
+            ('hybrid_score', self.generate_by_score, dict(n_combinations=2, use_top=15, seed=seed)),
+            ('hybrid_probability', self.generate_by_probability, dict(n_combinations=2, seed=seed)),
+            ('hybrid_pattern', self.generate_by_pattern, dict(n_combinations=2, seed=seed)),
+            ('hybrid_grid', self.generate_grid_based, dict(n_combinations=2, seed=seed)),
+            ('hybrid_image', self.generate_image_based, dict(n_combinations=2, seed=seed)),  # NEW
+        ]
 
-        # 점수 계산하여 정렬
-        scored = []
-        for combo in all_combos:
-            score = self._calculate_combination_score(combo)
-            scored.append((combo, score))
+    def _select_hybrid(self, candidate_lists, n_combinations):
+        """하이브리드 후보 합집합을 한 번에 채점해 상위 조합 선정"""
+        # 중복 제거하여 합치기 (첫 등장 순서 유지)
+        all_combos = list(dict.fromkeys(tuple(sorted(combo)) for combo in chain.from_iterable(candidate_lists)))
+        if not all_combos:
+            return []
 
-        scored.sort(key=lambda x: x[1], reverse=True)
+        # 점수 계산하여 정렬 (동점은 등장 순서)
+        scores = self._cached_combination_scores(all_combos)
+        order = np.argsort(-scores, kind='stable')[:n_combinations]
 
-        results = [list(combo) for combo, _ in scored[:n_combinations]]
+        results = [list(all_combos[i]) for i in order]
 
         print(f"\n최종 선정:")
-        for i, (combo, score) in enumerate(scored[:n_combinations], 1):
+        for i, (combo, score) in enumerate(zip(results, scores[order]), 1):
             odd = sum(1 for n in combo if n % 2 == 1)
             total = sum(combo)
-            print(f"  {i}. {list(combo)} (점수: {score:.1f}, 합: {total}, 홀{odd}/짝{6-odd})")
+            print(f"  {i}. {combo} (점수: {score:.1f}, 합: {total}, 홀{odd}/짝{6-odd})")
 
         return results
 
+    def generate_hybrid(self, n_combinations=5, seed=None, best_only=False):
+        """하이브리드 추천 (여러 전략 혼합)"""
+        print(f"\n⭐ 하이브리드 추천 (최고 품질)")
+
+        if best_only:
+            print("  ✨ 최적 조합 모드 (랜덤 제외 - 완전 탐색)")
+            # 상위 22개 번호로 확장하여 탐색 (22C6 = 74,613)
+            top_candidates = self.model.get_top_numbers(22)
+            return self._find_best_combination(top_candidates, n_combinations, apply_phase3=True)
+
+        # 각 전략에서 생성 (5가지 전략)
+        candidates = self._run_strategies(self._hybrid_jobs(seed))
+
+        return self._select_hybrid(candidates.values(), n_combinations)
+
     def generate_with_consecutive(self, n_combinations=5, seed=None, best_only=False):
         """연속 번호 포함 추천 (56% 확률 반영)"""
         print(f"\n🔢 연속 번호 포함 추천")
@@ -691,7 +828,7 @@ class LottoRecommendationSystem:
             print("  ✨ 최적 조합 모드 (랜덤 제외)")
             # 상위 3개 연속 쌍에 대해 각각 최적 조합 탐색
             best_combos = []
-            top_candidates = self.model.get_top_numbers(25)
+            top_candidates = self.model.get_top_numbers(22)
             
             for pair, _ in top_pairs[:3]:
                 # 해당 쌍을 포함하는 조건으로 탐색
@@ -703,10 +840,8 @@ class LottoRecommendationSystem:
             best_combos.sort(key=lambda x: self._calculate_combination_score(x), reverse=True)
             return best_combos[:n_combinations]
 
-        # 시드 설정 (고정 모드)
-        if seed is not None:
-            random.seed(seed)
-            np.random.seed(seed)
+        # 전략별 난수 생성기 (시드가 같으면 같은 결과, 전역 random 상태와 무관)
+        rng = random.Random(seed)
 
         print(f"  인기 연속 쌍 활용: {[f'{p[0]}-{p[1]}' for p, _ in top_pairs[:5]]}")
 
@@ -718,13 +853,13 @@ class LottoRecommendationSystem:
 
         while len(combinations_list) < n_combinations and attempts < max_attempts:
             # 인기 연속 쌍 중 하나 선택
-            pair = random.choice(top_pairs)[0]
+            pair = rng.choice(top_pairs)[0]
             selected = list(pair)
 
             # 나머지 4개 선택
             remaining = [n for n in top_numbers if n not in selected]
             if len(remaining) >= 4:
-                selected.extend(random.sample(remaining, 4))
+                selected.extend(rng.sample(remaining, 4))
 
             if len(selected) == 6 and self._is_valid_combination(selected):
                 sorted_selected = tuple(sorted(selected))
@@ -755,19 +890,15 @@ class LottoRecommendationSystem:
             print("  ✨ 최적 조합 모드 (Monte Carlo 최적화)")
             # 무작위로 많이 생성해서 그 중 점수가 가장 높은 것 선택
             # 순수 랜덤보다는 '최고의 랜덤'을 찾는 방식
-            if seed is not None:
-                random.seed(seed)
             return self.generate_by_score(n_combinations, use_top=45, seed=seed, best_only=False)
 
-        # 시드 설정 (고정 모드)
-        if seed is not None:
-            random.seed(seed)
-            np.random.seed(seed)
+        # 전략별 난수 생성기 (시드가 같으면 같은 결과, 전역 random 상태와 무관)
+        rng = random.Random(seed)
 
         combinations_list = []
 
         while len(combinations_list) < n_combinations:
-            selected = random.sample(range(1, 46), 6)
+            selected = rng.sample(range(1, 46), 6)
             sorted_selected = tuple(sorted(selected))
             if sorted_selected not in combinations_list:
                 combinations_list.append(sorted_selected)
@@ -789,10 +920,9 @@ class LottoRecommendationSystem:
         """
         print(f"\n🛡️ 안정형 추천 (원금 보존 추구)")
         
-        if seed is not None:
-            random.seed(seed)
-            np.random.seed(seed)
-            
+        # 전략별 난수 생성기 (시드가 같으면 같은 결과, 전역 random 상태와 무관)
+        rng = random.Random(seed)
+
         # 1. 필수 그룹 선정 (약 15개)
         # 1-1. 최근 5주(35일) 핫넘버 상위 10개
         recent_data = self.model.numbers_df.head(5)
@@ -838,16 +968,16 @@ class LottoRecommendationSystem:
             selected = []
             
             # 필수 그룹에서 2~3개 선택
-            n_essential = random.choice([2, 3])
+            n_essential = rng.choice([2, 3])
             if len(essential_pool) >= n_essential:
-                selected.extend(random.sample(essential_pool, n_essential))
+                selected.extend(rng.sample(essential_pool, n_essential))
             
             # 나머지는 전체 상위 번호에서 선택 (중복 제외)
             remaining_count = 6 - len(selected)
             pool = [n for n in top_numbers if n not in selected]
             
             if len(pool) >= remaining_count:
-                selected.extend(random.sample(pool, remaining_count))
+                selected.extend(rng.sample(pool, remaining_count))
             
             if len(selected) == 6 and self._is_valid_combination(selected):
                 sorted_selected = tuple(sorted(selected))
@@ -857,10 +987,8 @@ class LottoRecommendationSystem:
             attempts += 1
             
         # 점수 순 정렬
-        scored_combos = []
-        for combo in combinations_list:
-            score = self._calculate_combination_score(combo)
-            scored_combos.append((combo, score))
+        scores = self._cached_combination_scores(combinations_list).tolist()
+        scored_combos = list(zip(combinations_list, scores))
             
         scored_combos.sort(key=lambda x: x[1], reverse=True)
         
@@ -889,7 +1017,6 @@ class LottoRecommendationSystem:
         """
         import os
         import json
-        from prediction_model import LottoPredictionModel
 
         print(f"\n⚡ 최적화된 가중치 추천 (조합: {n_combinations}개)")
 
@@ -911,9 +1038,8 @@ class LottoRecommendationSystem:
               f"absence={opt_weights['absence_weight']:.1f}, "
               f"hotness={opt_weights['hotness_weight']:.1f}")
 
-        # 최적 가중치로 재학습
-        optimized_model = LottoPredictionModel(self.loader, weights=opt_weights)
-        optimized_model.train_all_patterns()
+        # 최적 가중치로 번호 점수만 재계산 (특징/패턴은 현재 모델과 공유)
+        optimized_model = self.model.reweighted(opt_weights)
 
         # 추천
         temp_recommender = LottoRecommendationSystem(optimized_model)
@@ -933,17 +1059,12 @@ class LottoRecommendationSystem:
             self.generate_image_based,
             self.generate_with_consecutive
         ]
-        
-        pool = []
-        # 각 전략별로 10개씩 생성하여 후보군 확보
-        for func in strategies:
-            try:
-                # 각 전략의 최적/고정 결과를 수집
-                combos = func(n_combinations=10, seed=seed, best_only=best_only)
-                pool.extend(combos)
-            except Exception as e:
-                print(f"  ⚠️ 전략 실행 중 오류: {e}")
-                
+
+        # 각 전략별로 10개씩 생성하여 후보군 확보 (각 전략의 최적/고정 결과를 수집)
+        jobs = [(func.__name__, func, dict(n_combinations=10, seed=seed, best_only=best_only))
+                for func in strategies]
+        pool = list(chain.from_iterable(self._run_strategies(jobs, catch_errors=True).values()))
+
         # 번호 빈도 분석 (투표)
         all_numbers = [num for combo in pool for num in combo]
         counter = Counter(all_numbers)
@@ -960,11 +1081,6 @@ class LottoRecommendationSystem:
             # 투표 상위 15개 번호로 최적 조합 탐색
             return self._find_best_combination(sorted_numbers[:15], n_combinations, apply_phase3=True)
             
-        # 시드 설정 (고정 모드)
-        if seed is not None:
-            random.seed(seed)
-            np.random.seed(seed)
-            
         # 빈도 가중치 기반 샘플링 (상위 25개)
         candidates = sorted_numbers[:25]
         weights = [counter[n] for n in candidates]
@@ -972,31 +1088,23 @@ class LottoRecommendationSystem:
         probs = [w/total_w for w in weights]
         
         # _find_best_combination 대신 확률 기반 샘플링 구현 (다양성 위해)
-        return self._find_best_combination(candidates, n_combinations) if best_only else self._sample_weighted(candidates, probs, n_combinations)
+        return self._find_best_combination(candidates, n_combinations) if best_only else self._sample_weighted(candidates, probs, n_combinations, seed=seed)
 
-    def _sample_weighted(self, candidates, probs, n_combinations):
-        """가중치 기반 샘플링 헬퍼"""
-        results = []
-        attempts = 0
-        while len(results) < n_combinations and attempts < 1000:
-            selected = np.random.choice(candidates, 6, replace=False, p=probs)
-            if self._is_valid_combination(selected):
-                sorted_selected = list(sorted(selected))
-                if sorted_selected not in results:
-                    results.append(sorted_selected)
-            attempts += 1
-        return results
+    def _sample_weighted(self, candidates, probs, n_combinations, seed=None):
+        """가중치 기반 샘플링 헬퍼 (시드가 같으면 같은 결과)"""
+        return sample_combinations(candidates, n_combinations, make_rng(seed), weights=probs, max_draws=1000,
+                                   valid_mask_func=self._get_combination_scorer().is_valid).tolist()
 
     def get_swap_candidates(self, current_combination, number_to_remove, top_n=5):
         """교체 후보 추천 (Phase 4: 사용자 인터랙티브 튜닝)"""
-        current_score = self._calculate_combination_score(current_combination)
+        current_score = self._cached_combination_score(current_combination)
         remaining_nums = [n for n in current_combination if n != number_to_remove]
         
         # 후보군: 상위 45개(전체) 중 현재 조합에 없는 것
         # (이미 점수순으로 정렬된 상태에서 필터링)
         candidates = [n for n in self.model.get_top_numbers(45) if n not in current_combination]
         
-        recommendations = []
+        swaps = []
         for cand in candidates:
             new_combo = sorted(remaining_nums + [cand])
             
@@ -1007,8 +1115,14 @@ class LottoRecommendationSystem:
             # Phase 3 제약조건 확인 (고정 모드 튜닝이므로 안전장치 적용)
             if not self._check_phase3_constraints(new_combo):
                 continue
-                
-            new_score = self._calculate_combination_score(new_combo)
+
+            swaps.append((cand, new_combo))
+
+        # 교체 조합 점수는 한 번에 계산 (반복 튜닝 시 캐시에서 조회)
+        new_scores = self._cached_combination_scores([combo for _, combo in swaps]).tolist()
+
+        recommendations = []
+        for (cand, _), new_score in zip(swaps, new_scores):
             diff = new_score - current_score
             
             recommendations.append({
@@ -1027,17 +1141,22 @@ class LottoRecommendationSystem:
         print("🎯 로또 645 번호 추천 시스템")
         print("="*70)
 
-        results = {
-            'hybrid': self.generate_hybrid(n_per_strategy, seed=seed),
-            'score': self.generate_by_score(n_per_strategy, seed=seed),
-            'probability': self.generate_by_probability(n_per_strategy, seed=seed),
-            'pattern': self.generate_by_pattern(n_per_strategy, seed=seed),
-            'grid': self.generate_grid_based(n_per_strategy, seed=seed),
-            'image': self.generate_image_based(n_per_strategy, seed=seed),  # NEW
-            'consecutive': self.generate_with_consecutive(n_per_strategy, seed=seed),
-            'safe': self.generate_safe_strategy(n_per_strategy, seed=seed), # NEW
-            'random': self.generate_random(n_per_strategy, seed=seed)
-        }
+        # 하이브리드 후보 전략과 개별 전략을 한 번에 실행
+        jobs = self._hybrid_jobs(seed) + [
+            ('score', self.generate_by_score, dict(n_combinations=n_per_strategy, seed=seed)),
+            ('probability', self.generate_by_probability, dict(n_combinations=n_per_strategy, seed=seed)),
+            ('pattern', self.generate_by_pattern, dict(n_combinations=n_per_strategy, seed=seed)),
+            ('grid', self.generate_grid_based, dict(n_combinations=n_per_strategy, seed=seed)),
+            ('image', self.generate_image_based, dict(n_combinations=n_per_strategy, seed=seed)),  # NEW
+            ('consecutive', self.generate_with_consecutive, dict(n_combinations=n_per_strategy, seed=seed)),
+            ('safe', self.generate_safe_strategy, dict(n_combinations=n_per_strategy, seed=seed)),  # NEW
+            ('random', self.generate_random, dict(n_combinations=n_per_strategy, seed=seed)),
+        ]
+        outputs = self._run_strategies(jobs)
+
+        print(f"\n⭐ 하이브리드 추천 (최고 품질)")
+        hybrid = self._select_hybrid([outputs.pop(name) for name, _, _ in self._hybrid_jobs()], n_per_strategy)
+        results = {'hybrid': hybrid, **outputs}
 
         print("\n" + "="*70)
         print("✅ 추천 완료")
@@ -0,0 +1,106 @@
+"""
+조합 점수 LRU 캐시
+정렬된 조합의 64비트 마스크를 키로 점수를 보관하고, 모델 점수 버전이 바뀌면 비운다
+"""
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+from combination_scorer import as_combination_array
+from match_evaluation import combination_masks
+
+
+# 캐시에 보관하는 최대 조합 수
+SCORE_CACHE_SIZE = 100000
+
+
+class CombinationScoreCache:
+    """조합 점수 LRU 캐시 (조합 마스크 -> 점수)
+
+    같은 조합이 추천 재정렬, 교체 후보, 내 번호 진단, 코어 번호 조합 생성에서
+    반복해서 채점되므로 계산한 점수를 보관한다. 모델이 다시 학습되거나 가중치가 바뀌어
+    점수 버전이 달라지면 보관한 점수를 모두 버린다.
+    """
+
+    def __init__(self, maxsize=SCORE_CACHE_SIZE):
+        """
+        Args:
+            maxsize: 최대 보관 조합 수 (초과하면 가장 오래 사용하지 않은 조합부터 제거)
+        """
+        self.maxsize = maxsize
+        self.version = None
+        self.hits = 0
+        self.misses = 0
+        self._scores = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._scores)
+
+    def clear(self, version=None):
+        """보관한 점수와 히트/미스 횟수 초기화"""
+        with self._lock:
+            self._reset(version)
+
+    def _reset(self, version):
+        # _lock을 잡은 상태에서 호출
+        self._scores.clear()
+        self.version = version
+        self.hits = 0
+        self.misses = 0
+
+    def scores(self, combos, version, score_func):
+        """조합 점수 조회 (캐시에 없는 조합만 score_func로 한 번에 계산)
+
+        Args:
+            combos: (M, 6) 번호 배열 또는 조합 리스트
+            version: 모델 점수 버전 (이전 호출과 다르면 캐시를 비움)
+            score_func: (K, 6) 정렬된 조합 -> (K,) 점수
+                (계산하는 동안 다른 호출이 버전을 바꿨으면 계산한 점수는 보관하지 않음)
+
+        Returns:
+            np.ndarray: (M,) 정렬된 조합 기준 점수
+        """
+        nums = np.sort(as_combination_array(combos), axis=1)
+        masks = combination_masks(nums).tolist()
+        result = np.empty(len(masks))
+        missing = []
+
+        with self._lock:
+            if version != self.version:
+                self._reset(version)
+            for i, mask in enumerate(masks):
+                score = self._scores.get(mask)
+                if score is None:
+                    missing.append(i)
+                else:
+                    self._scores.move_to_end(mask)
+                    result[i] = score
+            self.hits += len(masks) - len(missing)
+            self.misses += len(missing)
+
+        if missing:
+            computed = score_func(nums[missing])
+            result[missing] = computed
+
+            with self._lock:
+                if version != self.version:
+                    return result  # 계산 중 버전이 바뀜: 이전 버전 점수는 보관하지 않음
+                for i, score in zip(missing, computed.tolist()):
+                    self._scores[masks[i]] = score
+                while len(self._scores) > self.maxsize:
+                    self._scores.popitem(last=False)
+
+        return result
+
+    def stats(self):
+        """히트/미스 횟수와 보관 조합 수"""
+        total = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / total if total else 0.0,
+            'size': len(self._scores),
+            'maxsize': self.maxsize,
+        }
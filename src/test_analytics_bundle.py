@@ -0,0 +1,139 @@
+import sys
+import os
+import io
+import pickle
+import contextlib
+from collections import Counter
+
+import numpy as np
+
+# 프로젝트 루트 경로 추가
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from data_loader import LottoDataLoader
+from analytics_bundle import build_analytics_bundle
+from grid_pattern_analysis import GridPatternAnalysis
+from image_pattern_analysis import ImagePatternAnalysis
+
+
+def reference_exploration(loader):
+    """데이터 탐색 / 번호 분석 페이지의 기존 iterrows 계산 (비교 기준)"""
+    all_numbers = loader.get_all_numbers_flat(include_bonus=False)
+    frequency = Counter(all_numbers)
+
+    recent_50_numbers = []
+    for _, row in loader.numbers_df.head(50).iterrows():
+        recent_50_numbers.extend(row['당첨번호'])
+    recent_freq = Counter(recent_50_numbers)
+
+    absence = []
+    for num in range(1, 46):
+        for idx, row in loader.numbers_df.iterrows():
+            if num in row['당첨번호']:
+                absence.append(idx)
+                break
+        else:
+            absence.append(len(loader.numbers_df))
+
+    consecutive = {'none': 0, 'pair': 0, 'triple': 0, 'quad': 0}
+    for _, row in loader.numbers_df.iterrows():
+        nums = sorted(row['당첨번호'])
+        max_consecutive = 0
+        current_consecutive = 1
+        for i in range(len(nums)-1):
+            if nums[i+1] == nums[i] + 1:
+                current_consecutive += 1
+                max_consecutive = max(max_consecutive, current_consecutive)
+            else:
+                current_consecutive = 1
+        if max_consecutive == 0:
+            consecutive['none'] += 1
+        elif max_consecutive == 2:
+            consecutive['pair'] += 1
+        elif max_consecutive == 3:
+            consecutive['triple'] += 1
+        elif max_consecutive >= 4:
+            consecutive['quad'] += 1
+
+    companions = {}
+    for num in (1, 7, 45):
+        counts = Counter()
+        for _, row in loader.numbers_df.iterrows():
+            if num in row['당첨번호']:
+                counts.update(n for n in row['당첨번호'] if n != num)
+        companions[num] = counts.most_common(10)
+
+    return {
+        'frequency': [frequency.get(num, 0) for num in range(1, 46)],
+        'hot': recent_freq.most_common(10),
+        'cold': sorted(recent_freq.items(), key=lambda x: x[1])[:10],
+        'absence': absence,
+        'consecutive': [consecutive['none'], consecutive['pair'], consecutive['triple'], consecutive['quad']],
+        'companions': companions,
+    }
+
+
+def test_analytics_bundle():
+    print("🧪 분석 번들 일치 테스트")
+    print("=" * 60)
+
+    current_dir = os.path.dirname(os.path.abspath(__file__))
+    project_root = os.path.dirname(current_dir)
+    data_path = os.path.join(project_root, "Data", "645_251227.csv")
+
+    loader = LottoDataLoader(data_path)
+    loader.load_data()
+    loader.preprocess()
+    loader.extract_numbers()
+
+    bundle = build_analytics_bundle(loader)
+
+    # 1. 데이터 탐색 / 번호 분석 페이지 통계
+    ref = reference_exploration(loader)
+    same = (bundle['frequency']['출현횟수'].tolist() == ref['frequency']
+            and list(bundle['hot_numbers'][['번호', '출현횟수']].itertuples(index=False, name=None)) == ref['hot']
+            and list(bundle['cold_numbers'][['번호', '출현횟수']].itertuples(index=False, name=None)) == ref['cold']
+            and bundle['absence']['미출현 기간'].tolist() == ref['absence']
+            and bundle['consecutive']['출현횟수'].tolist() == ref['consecutive']
+            and all(bundle['companions'][num] == ref['companions'][num] for num in ref['companions']))
+    print(f"   {'✅' if same else '❌'} 빈도/핫·콜드/미출현/연속/동반 번호 일치")
+    assert same
+
+    # 2. 그리드 / 이미지 패턴 분석 결과 (분석 클래스 출력과 비교)
+    with contextlib.redirect_stdout(io.StringIO()):
+        grid = GridPatternAnalysis(loader)
+        heatmap = grid.analyze_position_frequency()
+        zones = grid.analyze_zone_distribution()
+        geometric = grid.analyze_geometric_patterns()
+        clustering = grid.analyze_spatial_clustering()
+
+        image = ImagePatternAnalysis(loader)
+        density = image.analyze_visual_density()
+        quadrants = image.analyze_quadrant_patterns()
+        balance = image.analyze_visual_balance()
+        symmetry = image.analyze_symmetry_patterns()
+
+    same_grid = (np.array_equal(bundle['grid_heatmap'], heatmap)
+                 and bundle['grid_zone_counts'] == dict(zones)
+                 and bundle['grid_diagonal_avg'] == (np.mean(geometric['diagonal_main']),
+                                                     np.mean(geometric['diagonal_anti']))
+                 and bundle['grid_line_totals'] == (sum(len(v) for v in geometric['horizontal'].values()),
+                                                    sum(len(v) for v in geometric['vertical'].values()))
+                 and bundle['grid_avg_distances'].tolist() == [s['avg_distance'] for s in clustering])
+    print(f"   {'✅' if same_grid else '❌'} 그리드 패턴 통계 일치")
+    assert same_grid
+
+    same_image = (np.array_equal(bundle['image_density'].to_numpy(dtype=float), density.to_numpy(dtype=float))
+                  and list(bundle['image_quadrant_patterns'].most_common()) == list(quadrants.most_common())
+                  and np.array_equal(bundle['image_balance'].to_numpy(dtype=float), balance.to_numpy(dtype=float))
+                  and bundle['image_symmetry'] == symmetry)
+    print(f"   {'✅' if same_image else '❌'} 이미지 패턴 통계 일치")
+    assert same_image
+
+    # 3. pickle 가능 (st.cache_data 저장)
+    restored = pickle.loads(pickle.dumps(bundle))
+    assert restored['data_version'] == loader.data_fingerprint()
+
+
+if __name__ == "__main__":
+    test_analytics_bundle()
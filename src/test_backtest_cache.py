@@ -0,0 +1,113 @@
+import sys
+import os
+import tempfile
+
+# 프로젝트 루트 경로 추가
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from backtesting_system import BacktestingSystem
+from backtest_cache import job_key, round_result_key
+
+
+def test_backtest_cache():
+    print("🧪 백테스팅 결과 캐시 테스트")
+    print("=" * 60)
+
+    current_dir = os.path.dirname(os.path.abspath(__file__))
+    project_root = os.path.dirname(current_dir)
+    data_path = os.path.join(project_root, "Data", "645_251227.csv")
+
+    weights_a = {'freq_weight': 30.4, 'trend_weight': 30, 'absence_weight': 20, 'hotness_weight': 20}
+    weights_b = {'freq_weight': 29.6, 'trend_weight': 30, 'absence_weight': 20, 'hotness_weight': 20}
+
+    # 1. 키 구분 (반올림하면 같아지는 가중치, 시드, 최적 모드, 데이터 지문)
+    base = (1100, 'f' * 64, weights_a, 'score', 42, 5, False, 3)
+    variants = [
+        (1100, 'f' * 64, weights_b, 'score', 42, 5, False, 3),
+        (1100, 'f' * 64, weights_a, 'score', 7, 5, False, 3),
+        (1100, 'f' * 64, weights_a, 'score', 42, 5, True, 3),
+        (1100, 'e' * 64, weights_a, 'score', 42, 5, False, 3),
+    ]
+    distinct = all(round_result_key(*base) != round_result_key(*v) for v in variants)
+    print(f"   {'✅' if distinct else '❌'} 입력이 다르면 캐시 키도 다름")
+    assert distinct
+    assert round_result_key(*base) == round_result_key(*base)
+    assert round_result_key(*base) != job_key([base[0]], *base[1:])
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        backtester = BacktestingSystem(data_path, cache_dir=cache_dir)
+        rounds = list(range(1180, 1186))
+
+        # 2. 캐시 저장 후 재사용 (결과 동일)
+        fresh = backtester.backtest_multiple_rounds(rounds, weights_a, 'hybrid', 5, use_cache=False)
+        first = backtester.backtest_multiple_rounds(rounds[:3], weights_a, 'hybrid', 5)
+        second = backtester.backtest_multiple_rounds(rounds, weights_a, 'hybrid', 5)
+        reused = first == fresh[:3] and second == fresh
+        print(f"   {'✅' if reused else '❌'} 캐시 결과와 신규 계산 결과 일치 (부분 캐시 포함)")
+        assert reused
+
+        # 3. 반올림 값이 같은 다른 가중치는 캐시를 공유하지 않음
+        other = backtester.backtest_multiple_rounds(rounds, weights_b, 'hybrid', 5)
+        expected = backtester.backtest_multiple_rounds(rounds, weights_b, 'hybrid', 5, use_cache=False)
+        separated = other == expected
+        print(f"   {'✅' if separated else '❌'} 가중치 30.4 / 29.6 결과 분리")
+        assert separated
+
+        # 4. 추가 전용 저장소: 결과당 1행, 회차 인덱스 조회
+        stored = len(backtester.result_cache)
+        by_round = backtester.result_cache.get_round(rounds[0])
+        indexed = stored == 2 * len(rounds) and sorted(r['predicted'] for r in by_round) == sorted(
+            [fresh[0]['predicted'], expected[0]['predicted']])
+        print(f"   {'✅' if indexed else '❌'} 저장 행 수 {stored}, {rounds[0]}회 조회 {len(by_round)}건")
+        assert indexed
+
+
+class _Interrupted(Exception):
+    pass
+
+
+def test_backtest_resume():
+    print("🧪 백테스팅 중간 저장 / 이어서 실행 테스트")
+    print("=" * 60)
+
+    current_dir = os.path.dirname(os.path.abspath(__file__))
+    project_root = os.path.dirname(current_dir)
+    data_path = os.path.join(project_root, "Data", "645_251227.csv")
+
+    weights = {'freq_weight': 30, 'trend_weight': 30, 'absence_weight': 20, 'hotness_weight': 20}
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        backtester = BacktestingSystem(data_path, cache_dir=cache_dir)
+        backtester.CHECKPOINT_EVERY = 2
+        rounds = list(range(1180, 1188))
+        job = job_key(rounds, backtester.data_fingerprints.get(rounds[-1]), weights, 'hybrid', 42, 5,
+                      False, backtester.match_threshold)
+
+        # 1. 6번째 회차 계산 직전에 중단 -> 완료된 5회 중 체크포인트 4회 보존
+        def interrupt(progress):
+            if progress >= 5 / len(rounds):
+                raise _Interrupted()
+
+        try:
+            backtester.backtest_multiple_rounds(rounds, weights, 'hybrid', 5, progress_callback=interrupt)
+        except _Interrupted:
+            pass
+
+        state = backtester.result_cache.get_job(job)
+        saved = (state is not None and state['completed'] == 4 and state['last_round'] == rounds[3]
+                 and not state['finished'] and len(backtester.result_cache) == 4)
+        print(f"   {'✅' if saved else '❌'} 중단 시점까지 저장: {state}")
+        assert saved
+
+        # 2. 같은 작업 재실행: 저장된 회차 이후부터 계산, 결과는 처음부터 계산한 것과 동일
+        resumed = backtester.backtest_multiple_rounds(rounds, weights, 'hybrid', 5)
+        fresh = backtester.backtest_multiple_rounds(rounds, weights, 'hybrid', 5, use_cache=False)
+        state = backtester.result_cache.get_job(job)
+        same = resumed == fresh and state['finished'] and state['completed'] == len(rounds)
+        print(f"   {'✅' if same else '❌'} 이어서 실행한 결과와 신규 계산 결과 일치, 작업 완료 기록")
+        assert same
+
+
+if __name__ == "__main__":
+    test_backtest_cache()
+    test_backtest_resume()
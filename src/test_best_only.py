@@ -73,5 +73,38 @@ def test_best_only():
             print(f"   ❌ Random이 더 높음 (탐색 로직 점검 필요)")
         print("-" * 60)
 
+
+def test_best_only_pinned():
+    """최적 조합 모드 결과 고정 (전략별 후보 수 = 상위 22개 번호, 900회까지 학습)"""
+    print("📌 Best Only 결과 고정 테스트 (900회까지 학습)")
+
+    data_path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "Data", "645_251227.csv")
+    loader = LottoDataLoader(data_path)
+    loader.load_data()
+    loader.preprocess()
+    loader.extract_numbers()
+
+    model = LottoPredictionModel(loader.slice_until_round(900))
+    model.train_all_patterns()
+    recommender = LottoRecommendationSystem(model)
+
+    expected = {
+        'score': [[10, 11, 44, 34, 24, 19], [10, 11, 44, 34, 27, 19], [11, 44, 34, 24, 19, 12]],
+        'pattern': [[10, 11, 44, 34, 24, 19], [10, 11, 44, 34, 27, 19], [11, 44, 34, 24, 19, 12]],
+        'grid': [[2, 34, 24, 27, 39, 19], [2, 44, 34, 24, 27, 19], [10, 11, 44, 34, 24, 19]],
+    }
+    results = {
+        'score': recommender.generate_by_score(3, use_top=25, best_only=True),
+        'pattern': recommender.generate_by_pattern(3, best_only=True),
+        'grid': recommender.generate_grid_based(3, best_only=True),
+    }
+
+    for name, combos in results.items():
+        ok = [[int(n) for n in combo] for combo in combos] == expected[name]
+        print(f"   {'✅' if ok else '❌'} {name}: {combos[0]}")
+        assert ok
+
+
 if __name__ == "__main__":
-    test_best_only()
\ No newline at end of file
+    test_best_only()
+    test_best_only_pinned()
\ No newline at end of file
@@ -0,0 +1,104 @@
+import sys
+import os
+import time
+from itertools import combinations
+
+import numpy as np
+
+# 프로젝트 루트 경로 추가
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from combination_sampler import (make_rng, sample_combinations, sample_pattern_combinations,
+                                 count_pattern_combinations)
+
+
+def test_combination_sampler():
+    print("🧪 조합 일괄 샘플러 테스트")
+    print("=" * 60)
+
+    numbers = np.arange(1, 46)
+    weights = np.linspace(1.0, 5.0, 45)
+    weights[:5] = 0  # 1~5번은 추출 제외
+
+    # 1. 1,000개 요청: 중복 없음, 정렬, 가중치 0 번호 제외, 같은 시드 = 같은 결과
+    start = time.perf_counter()
+    combos = sample_combinations(numbers, 1000, make_rng(7), weights=weights)
+    elapsed = time.perf_counter() - start
+    masks = {tuple(c) for c in combos.tolist()}
+    ok = (combos.shape == (1000, 6) and len(masks) == 1000
+          and (np.diff(combos, axis=1) > 0).all() and combos.min() > 5
+          and np.array_equal(combos, sample_combinations(numbers, 1000, make_rng(7), weights=weights)))
+    print(f"   {'✅' if ok else '❌'} 1,000개 조합 생성 ({elapsed*1000:.1f}ms)")
+    assert ok
+
+    # 2. 번호별 포함 빈도 = np.random.choice(replace=False, p=...) 포함 빈도
+    probs = weights / weights.sum()
+    sampled = sample_combinations(numbers, 20000, make_rng(1), weights=weights, max_draws=20000,
+                                  valid_mask_func=lambda c: np.ones(len(c), dtype=bool))
+    rng = np.random.default_rng(2)
+    reference = np.array([rng.choice(numbers, 6, replace=False, p=probs) for _ in range(20000)])
+    freq = np.bincount(sampled.ravel(), minlength=46)[1:] / len(sampled)
+    ref_freq = np.bincount(reference.ravel(), minlength=46)[1:] / len(reference)
+    max_diff = np.abs(freq - ref_freq).max()
+    print(f"   {'✅' if max_diff < 0.02 else '❌'} 번호별 포함 빈도 차이 최대 {max_diff:.4f}")
+    assert max_diff < 0.02
+
+    # 3. 고정 번호 포함 + 유효성 필터, 가능한 조합 수보다 많이 요청하면 가능한 만큼만
+    fixed = [3, 7, 12]
+    limited = sample_combinations([20, 21, 22, 23, 24], 100, make_rng(0), fixed=fixed,
+                                  valid_mask_func=lambda c: c.sum(axis=1) % 2 == 0)
+    ok = (len(limited) == len({tuple(c) for c in limited.tolist()}) <= 10
+          and all(set(fixed) <= set(c) for c in limited.tolist())
+          and (limited.sum(axis=1) % 2 == 0).all())
+    print(f"   {'✅' if ok else '❌'} 고정 번호 + 유효성 필터 ({len(limited)}개)")
+    assert ok
+
+
+def _pattern_of(combo):
+    sections = tuple(sum(1 for n in combo if lo <= n <= lo + 14) for lo in (1, 16, 31))
+    return sections, sum(1 for n in combo if n % 2 == 1)
+
+
+def test_pattern_sampler():
+    print("🧪 구간/홀짝 패턴 샘플러 테스트")
+    print("=" * 60)
+
+    pool = list(range(1, 46))
+    odd_counts = range(2, 5)
+
+    # 1. 조합 수 = 전체 나열 결과 (24개 풀), 1,000개 요청 시 모두 조건 만족 + 중복 없음
+    small_pool = [n for n in pool if (n - 1) % 15 < 8]
+    brute = sum(1 for c in combinations(small_pool, 6)
+                if _pattern_of(c)[0] == (2, 2, 2) and _pattern_of(c)[1] in odd_counts)
+    total = count_pattern_combinations(pool, (2, 2, 2), odd_counts)
+    start = time.perf_counter()
+    combos = sample_pattern_combinations(pool, (2, 2, 2), odd_counts, 1000, make_rng(3))
+    elapsed = time.perf_counter() - start
+    ok = (count_pattern_combinations(small_pool, (2, 2, 2), odd_counts) == brute and combos.shape == (1000, 6)
+          and len({tuple(c) for c in combos.tolist()}) == 1000
+          and all(_pattern_of(c)[0] == (2, 2, 2) and _pattern_of(c)[1] in odd_counts for c in combos.tolist())
+          and np.array_equal(combos, sample_pattern_combinations(pool, (2, 2, 2), odd_counts, 1000, make_rng(3))))
+    print(f"   {'✅' if ok else '❌'} 1,000개 패턴 조합 생성 ({elapsed*1000:.1f}ms, 전체 {total:,}개)")
+    assert ok
+
+    # 2. 드문 패턴 (고구간 6개, 홀수 6개 = C(8,6) = 28개): 요청 수만큼, 가능한 수를 넘으면 전부
+    rare = sample_pattern_combinations(pool, (0, 0, 6), [6], 20, make_rng(0))
+    every = sample_pattern_combinations(pool, (0, 0, 6), [6], 100, make_rng(0))
+    ok = (len(rare) == 20 and len(every) == 28 == len({tuple(c) for c in every.tolist()})
+          and all(min(c) >= 31 and all(n % 2 for n in c) for c in every.tolist()))
+    print(f"   {'✅' if ok else '❌'} 드문 패턴 ({len(rare)}개 / 전체 {len(every)}개)")
+    assert ok
+
+    # 3. 균등 추출: 배분별 추출 비율 = 배분별 조합 수 비율
+    sampled = sample_pattern_combinations(pool, (2, 2, 2), odd_counts, 20000, make_rng(5))
+    odd = np.array([_pattern_of(c)[1] for c in sampled.tolist()])
+    expected = np.array([count_pattern_combinations(pool, (2, 2, 2), [o]) for o in odd_counts]) / total
+    observed = np.array([(odd == o).mean() for o in odd_counts])
+    max_diff = np.abs(observed - expected).max()
+    print(f"   {'✅' if max_diff < 0.02 else '❌'} 홀수 개수 분포 차이 최대 {max_diff:.4f}")
+    assert max_diff < 0.02
+
+
+if __name__ == "__main__":
+    test_combination_sampler()
+    test_pattern_sampler()
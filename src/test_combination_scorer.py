@@ -0,0 +1,86 @@
+import sys
+import os
+import random
+import numpy as np
+from itertools import combinations
+
+# 프로젝트 루트 경로 추가
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from data_loader import LottoDataLoader
+from prediction_model import LottoPredictionModel
+from recommendation_system import LottoRecommendationSystem
+from combination_scorer import search_top_combinations, top_k_order
+
+
+def load_recommender():
+    current_dir = os.path.dirname(os.path.abspath(__file__))
+    project_root = os.path.dirname(current_dir)
+    data_path = os.path.join(project_root, "Data", "645_251227.csv")
+
+    loader = LottoDataLoader(data_path)
+    loader.load_data()
+    loader.preprocess()
+    loader.extract_numbers()
+
+    model = LottoPredictionModel(loader)
+    model.train_all_patterns()
+    return LottoRecommendationSystem(model)
+
+
+def test_combination_scorer():
+    print("🧪 조합 일괄 점수 계산 커널 일치 테스트")
+    print("=" * 60)
+
+    recommender = load_recommender()
+    scorer = recommender._get_combination_scorer()
+
+    # 정렬되지 않은 임의 조합 (입력 순서에 따른 누적 순서까지 검증)
+    rng = random.Random(7)
+    combos = [rng.sample(range(1, 46), 6) for _ in range(2000)]
+
+    checks = {
+        '종합 점수': (scorer.scores(combos), [recommender._calculate_combination_score(c) for c in combos]),
+        '그리드 점수': (scorer.grid_scores(combos), [recommender._calculate_grid_score(c) for c in combos]),
+        '이미지 점수': (scorer.image_scores(combos),
+                   [recommender.image_analyzer.calculate_image_score(c)['total_score'] for c in combos]),
+        'Phase 3 필터': (scorer.phase3_mask(combos), [recommender._check_phase3_constraints(c) for c in combos]),
+    }
+
+    for name, (batch, scalar) in checks.items():
+        mismatches = sum(1 for b, s in zip(batch.tolist(), scalar) if b != s)
+        status = "✅" if mismatches == 0 else "❌"
+        print(f"   {status} {name}: {len(combos)}개 조합 중 불일치 {mismatches}건")
+        assert mismatches == 0
+
+
+def test_branch_and_bound_search():
+    print("🧪 분기 한정 상위 K개 탐색 vs 완전 탐색 테스트")
+    print("=" * 60)
+
+    recommender = load_recommender()
+    scorer = recommender._get_combination_scorer()
+    candidates = np.array(recommender.model.get_top_numbers(22))
+
+    def leaf_mask(combos):
+        return scorer.phase3_mask(combos) & scorer.is_valid(combos)
+
+    # 완전 탐색 (전체 조합 채점 후 안정 정렬)
+    index = np.array(list(combinations(range(len(candidates)), 6)))
+    mask = leaf_mask(candidates[index])
+    index = index[mask]
+
+    for weights in [(1.0, 0.0, 0.0), (0.5, 1.0, 0.0), (0.0, 0.0, 1.0)]:
+        scores = scorer.weighted_scores(candidates[index], weights)
+        expected = candidates[index[top_k_order(index, scores, 10)]].tolist()
+        result = search_top_combinations(scorer, candidates, 10, weights, leaf_mask_func=leaf_mask,
+                                         prefix_mask_func=scorer.prefix_phase3_mask)
+
+        status = "✅" if result == expected else "❌"
+        print(f"   {status} 가중치 {weights}: 상위 10개 {'일치' if result == expected else '불일치'}")
+        assert result == expected
+
+
+if __name__ == "__main__":
+    test_combination_scorer()
+    test_branch_and_bound_search()
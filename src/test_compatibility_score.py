@@ -108,5 +108,47 @@ def test_compatibility_score():
     print(f"  패턴 보너스/페널티 합계: {score_bad - base_score:.2f}")
     print(f"  (예상 페널티: -10점)")
 
+
+def test_shared_tables_read_only():
+    """같은 데이터의 추천 시스템끼리 공유하는 분석 테이블은 읽기 전용 (한 인스턴스가 바꿀 수 없음)"""
+    print("🧪 공유 분석 테이블 읽기 전용 테스트")
+
+    data_path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "Data", "645_251227.csv")
+    loader = LottoDataLoader(data_path)
+    loader.load_data()
+    loader.preprocess()
+    loader.extract_numbers()
+
+    model = LottoPredictionModel(loader)
+    model.train_all_patterns()
+    first = LottoRecommendationSystem(model)
+    second = LottoRecommendationSystem(model)
+    assert first.tables is second.tables
+
+    pair = next(iter(first.pair_counts))
+    mutations = [
+        lambda: first.pair_counts.__setitem__(pair, 0),
+        lambda: first.never_appeared.append((1, 2)),
+        lambda: first.never_appeared_set.add((1, 2)),
+        lambda: first.overheated_numbers.add(1),
+        lambda: first.prime_score_map.__setitem__(0, 100.0),
+    ]
+    blocked = 0
+    for mutate in mutations:
+        try:
+            mutate()
+        except (TypeError, AttributeError):
+            blocked += 1
+
+    prime_df = first.prime_df
+    prime_df['비율(%)'] = 0.0
+
+    ok = (blocked == len(mutations) and second.pair_counts[pair] > 0
+          and (second.prime_df['비율(%)'] > 0).any())
+    print(f"   {'✅' if ok else '❌'} 수정 시도 {blocked}/{len(mutations)}개 차단, prime_df는 복사본")
+    assert ok
+
+
 if __name__ == "__main__":
-    test_compatibility_score()
\ No newline at end of file
+    test_compatibility_score()
+    test_shared_tables_read_only()
\ No newline at end of file
@@ -0,0 +1,54 @@
+import sys
+import os
+from collections import Counter
+from itertools import combinations
+
+# 프로젝트 루트 경로 추가
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from data_loader import LottoDataLoader
+from cooccurrence import get_cooccurrence_index
+
+
+def test_cooccurrence_index():
+    print("🧪 동시 출현 인덱스 vs Counter 집계 테스트")
+    print("=" * 60)
+
+    current_dir = os.path.dirname(os.path.abspath(__file__))
+    project_root = os.path.dirname(current_dir)
+    data_path = os.path.join(project_root, "Data", "645_251227.csv")
+
+    loader = LottoDataLoader(data_path)
+    loader.load_data()
+    loader.preprocess()
+    loader.extract_numbers()
+
+    index = get_cooccurrence_index(loader)
+
+    # 기존 방식: 최신 회차부터 순회하며 Counter 집계
+    pair_counter = Counter()
+    triplet_counter = Counter()
+    for nums in loader.numbers_df['당첨번호']:
+        pair_counter.update(combinations(sorted(nums), 2))
+        triplet_counter.update(combinations(sorted(nums), 3))
+
+    same_pairs = index.most_common_pairs() == pair_counter.most_common()
+    print(f"   {'✅' if same_pairs else '❌'} 번호쌍 {len(pair_counter)}개: 횟수 및 동점 순서 일치")
+    assert same_pairs
+
+    same_triplets = index.most_common_triplets() == triplet_counter.most_common()
+    print(f"   {'✅' if same_triplets else '❌'} 3개 조합 {len(triplet_counter)}개: 횟수 및 동점 순서 일치")
+    assert same_triplets
+
+    # 같은 데이터 버전은 같은 인덱스 공유
+    sliced = loader.slice_until_round(int(loader.round_numbers.max()))
+    shared = get_cooccurrence_index(sliced) is index
+    print(f"   {'✅' if shared else '❌'} 같은 데이터의 다른 로더와 인덱스 공유")
+    assert shared
+
+    older = loader.slice_until_round(1100)
+    assert get_cooccurrence_index(older) is not index
+
+
+if __name__ == "__main__":
+    test_cooccurrence_index()
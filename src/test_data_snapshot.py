@@ -0,0 +1,64 @@
+import sys
+import os
+import shutil
+import tempfile
+import pandas as pd
+
+# 프로젝트 루트 경로 추가
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from data_loader import LottoDataLoader
+
+
+def load(data_path, use_snapshot=True):
+    loader = LottoDataLoader(data_path, use_snapshot=use_snapshot)
+    loader.load_data()
+    loader.preprocess()
+    loader.extract_numbers()
+    return loader
+
+
+def test_data_snapshot():
+    print("🧪 전처리 스냅샷 로드 일치 테스트")
+    print("=" * 60)
+
+    current_dir = os.path.dirname(os.path.abspath(__file__))
+    project_root = os.path.dirname(current_dir)
+    source_path = os.path.join(project_root, "Data", "645_251227.csv")
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        data_path = os.path.join(tmp_dir, "645_251227.csv")
+        shutil.copy(source_path, data_path)
+
+        expected = load(data_path, use_snapshot=False)
+
+        # 1. 첫 로드에서 스냅샷 생성, 두 번째 로드는 스냅샷 사용
+        load(data_path)
+        cached = load(data_path)
+        created = os.path.exists(os.path.join(tmp_dir, "645_251227.snapshot.npy"))
+        print(f"   {'✅' if created else '❌'} 스냅샷 생성")
+        assert created and cached._preprocessed
+
+        pd.testing.assert_frame_equal(cached.df, expected.df)
+        pd.testing.assert_frame_equal(cached.numbers_df, expected.numbers_df)
+        print("   ✅ 스냅샷 로드 결과가 CSV 파싱 결과와 일치")
+
+        # 2. 수정 시각만 바뀌면 내용 해시로 재사용
+        os.utime(data_path)
+        touched = load(data_path)
+        pd.testing.assert_frame_equal(touched.df, expected.df)
+        print("   ✅ 수정 시각만 바뀐 CSV는 스냅샷 재사용")
+
+        # 3. 내용이 바뀌면 CSV를 다시 파싱
+        with open(data_path, 'r', encoding='utf-8-sig') as f:
+            lines = f.readlines()
+        with open(data_path, 'w', encoding='utf-8-sig') as f:
+            f.writelines(lines[:-1])
+        changed = load(data_path)
+        reparsed = len(changed.df) == len(expected.df) - 1
+        print(f"   {'✅' if reparsed else '❌'} 변경된 CSV 재파싱: {len(changed.df)}개 회차")
+        assert reparsed
+
+
+if __name__ == "__main__":
+    test_data_snapshot()
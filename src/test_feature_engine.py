@@ -0,0 +1,121 @@
+import sys
+import os
+import numpy as np
+
+# 프로젝트 루트 경로 추가
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from data_loader import LottoDataLoader
+from prediction_model import LottoPredictionModel
+
+
+def reference_features(numbers_df):
+    """번호별 반복 순회 방식의 기존 특징 계산 (비교 기준)"""
+    features = {}
+    for num in range(1, 46):
+        appearances = [idx for idx, nums in enumerate(numbers_df['당첨번호']) if num in nums]
+        recent_50 = sum(1 for nums in numbers_df.head(50)['당첨번호'] if num in nums)
+        absence_length = appearances[0] if appearances else len(numbers_df)
+
+        if len(appearances) > 1:
+            intervals = [appearances[i] - appearances[i+1] for i in range(len(appearances)-1)]
+            avg_interval = np.mean(intervals)
+            std_interval = np.std(intervals)
+        else:
+            avg_interval = 0
+            std_interval = 0
+
+        features[num] = {
+            'total_frequency': len(appearances),
+            'recent_100_frequency': sum(1 for nums in numbers_df.head(100)['당첨번호'] if num in nums),
+            'recent_50_frequency': recent_50,
+            'absence_length': absence_length,
+            'avg_interval': avg_interval,
+            'std_interval': std_interval,
+            'hotness_score': recent_50 / (absence_length + 1) * 100
+        }
+    return features
+
+
+def test_feature_engine():
+    print("🧪 벡터화 특징 추출 엔진 일치 테스트")
+    print("=" * 60)
+
+    current_dir = os.path.dirname(os.path.abspath(__file__))
+    project_root = os.path.dirname(current_dir)
+    data_path = os.path.join(project_root, "Data", "645_251227.csv")
+
+    for max_round in [640, 900, 10000]:
+        loader = LottoDataLoader(data_path)
+        loader.load_data_until_round(max_round)
+
+        model = LottoPredictionModel(loader)
+        features = model.extract_number_features()
+        expected = reference_features(loader.numbers_df)
+
+        mismatches = [
+            (num, key) for num in range(1, 46) for key, value in expected[num].items()
+            if features[num][key] != value
+        ]
+
+        if mismatches:
+            print(f"   ❌ {max_round}회까지: 불일치 {len(mismatches)}건 (예: {mismatches[:3]})")
+        else:
+            print(f"   ✅ {max_round}회까지 ({len(loader.numbers_df)}회차): 45개 번호 특징 일치")
+
+        assert not mismatches
+
+
+def test_weight_matrix_scoring():
+    print("🧪 가중치 재적용 / 다중 가중치 점수 계산 일치 테스트")
+    print("=" * 60)
+
+    current_dir = os.path.dirname(os.path.abspath(__file__))
+    project_root = os.path.dirname(current_dir)
+    data_path = os.path.join(project_root, "Data", "645_251227.csv")
+
+    loader = LottoDataLoader(data_path)
+    loader.load_data_until_round(1100)
+
+    base = LottoPredictionModel(loader)
+    base.train_all_patterns()
+
+    rng = np.random.default_rng(0)
+    keys = ['freq_weight', 'trend_weight', 'absence_weight', 'hotness_weight']
+    weights_list = [dict(zip(keys, row)) for row in rng.uniform(5, 40, size=(8, 4)).tolist()]
+
+    score_matrix = base.number_score_matrix(weights_list)
+    top_matrix = base.top_numbers_matrix(weights_list, 20)
+
+    for k, weights in enumerate(weights_list):
+        # 처음부터 학습한 모델 (캐시 없이 모든 단계 실행)
+        expected = LottoPredictionModel(loader, weights=weights)
+        expected.extract_number_features()
+        expected.calculate_number_scores()
+
+        reweighted = base.reweighted(weights)
+        same = (reweighted.number_scores == expected.number_scores
+                and score_matrix[k, 1:].tolist() == [expected.number_scores[n]['total_score'] for n in range(1, 46)]
+                and top_matrix[k].tolist() == expected.get_top_numbers(20))
+        print(f"   {'✅' if same else '❌'} 가중치 {k + 1}: 점수/상위 20개 번호 일치")
+        assert same
+
+    # 재가중 모델/캐시 재사용 모델을 수정해도 원본 모델과 학습 캐시는 그대로
+    reweighted.number_features[1]['total_frequency'] = -1
+    reweighted.patterns['consecutive']['pair_frequency'][(1, 2)] = -1
+    reused = LottoPredictionModel(loader)
+    reused.train_all_patterns()
+    reused.patterns['section']['distribution'].clear()
+    again = LottoPredictionModel(loader)
+    again.train_all_patterns()
+    isolated = (base.number_features[1]['total_frequency'] >= 0
+                and base.patterns['consecutive']['pair_frequency'][(1, 2)] >= 0
+                and again.number_features == base.number_features
+                and len(again.patterns['section']['distribution']) == len(loader.numbers_df))
+    print(f"   {'✅' if isolated else '❌'} 모델별 특징/패턴 독립 (학습 캐시 보호)")
+    assert isolated
+
+
+if __name__ == "__main__":
+    test_feature_engine()
+    test_weight_matrix_scoring()
@@ -0,0 +1,87 @@
+import sys
+import os
+import numpy as np
+
+# 프로젝트 루트 경로 추가
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from data_loader import LottoDataLoader
+from prediction_model import LottoPredictionModel
+from incremental_model import walk_forward, walk_forward_rankings
+from cooccurrence import CooccurrenceIndex
+from recommendation_system import RecommendationDataTables
+
+
+def test_incremental_model():
+    print("🧪 증분 학습 상태(워크포워드) 일치 테스트")
+    print("=" * 60)
+
+    current_dir = os.path.dirname(os.path.abspath(__file__))
+    project_root = os.path.dirname(current_dir)
+    data_path = os.path.join(project_root, "Data", "645_251227.csv")
+
+    full_loader = LottoDataLoader(data_path)
+    full_loader.load_data()
+    full_loader.preprocess()
+    full_loader.extract_numbers()
+
+    for target_round, state in walk_forward(full_loader, [651, 700, 1000, 1200]):
+        # 1. 증분 상태로 구성한 모델
+        train_loader = full_loader.slice_until_round(target_round - 1)
+        incremental = LottoPredictionModel(train_loader)
+        incremental.train_from_state(state)
+
+        # 2. 기존 방식 (CSV 재로딩 + 전체 재학습)
+        reload_loader = LottoDataLoader(data_path)
+        reload_loader.load_data_until_round(target_round - 1)
+        retrained = LottoPredictionModel(reload_loader)
+        retrained.train_all_patterns()
+
+        same_features = incremental.number_features == retrained.number_features
+        same_scores = incremental.number_scores == retrained.number_scores
+        same_patterns = all(
+            incremental.patterns[key]['most_common'] == retrained.patterns[key]['most_common']
+            for key in ('section', 'odd_even')
+        ) and incremental.patterns['sum'] == retrained.patterns['sum'] and (
+            list(incremental.patterns['consecutive']['pair_frequency'].items())
+            == list(retrained.patterns['consecutive']['pair_frequency'].items())
+        )
+
+        status = "✅" if same_features and same_scores and same_patterns else "❌"
+        print(f"   {status} {target_round}회 학습 상태 ({state.n_rounds}회차 반영): "
+              f"특징 {same_features}, 점수 {same_scores}, 패턴 {same_patterns}")
+
+        assert same_features and same_scores and same_patterns
+
+        # 3. 상태의 누적 집계로 만든 동시 출현 인덱스 / 소수 패턴 (prefix_view + from_state)
+        view = full_loader.prefix_view(target_round - 1)
+        index = state.cooccurrence_index()
+        expected = CooccurrenceIndex(train_loader.incidence, train_loader.draws)
+        same_index = all(
+            np.array_equal(getattr(index, key), getattr(expected, key))
+            for key in ('n_rounds', 'consecutive_rounds', 'number_counts', 'pair_matrix', 'pair_counts',
+                        'triplet_counts', 'pair_first_seen', 'triplet_first_seen'))
+        tables = RecommendationDataTables.from_state(view, state)
+        same_tables = (tables.prime_df.equals(RecommendationDataTables(train_loader).prime_df)
+                       and list(tables.compatibility[0].items()) == list(index.pair_counter().items())
+                       and view.data_fingerprint() == train_loader.data_fingerprint())
+        print(f"   {'✅' if same_index and same_tables else '❌'} {target_round}회 누적 동시 출현 인덱스 / 분석 테이블")
+        assert same_index and same_tables
+
+    # 회차 x 가중치 후보별 번호 순위 일괄 계산
+    weights_list = [
+        {'freq_weight': 30, 'trend_weight': 30, 'absence_weight': 20, 'hotness_weight': 20},
+        {'freq_weight': 12.5, 'trend_weight': 44.0, 'absence_weight': 8.2, 'hotness_weight': 31.7},
+    ]
+    rounds, rankings = walk_forward_rankings(full_loader, [700, 1200], weights_list, n=20)
+    for i, target_round in enumerate(rounds):
+        train_loader = full_loader.slice_until_round(target_round - 1)
+        for k, weights in enumerate(weights_list):
+            model = LottoPredictionModel(train_loader, weights=weights)
+            model.train_all_patterns()
+            assert rankings[i, k].tolist() == model.get_top_numbers(20)
+    print(f"   ✅ 회차 {len(rounds)}개 x 가중치 {len(weights_list)}개 번호 순위 일치")
+
+
+if __name__ == "__main__":
+    test_incremental_model()
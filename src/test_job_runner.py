@@ -0,0 +1,68 @@
+import sys
+import os
+import json
+import tempfile
+
+# 프로젝트 루트 경로 추가
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from backtesting_system import BacktestingSystem
+from job_runner import JobRunner, DONE, FAILED, QUEUED
+
+
+def test_job_runner():
+    print("🧪 백그라운드 작업 실행기 테스트")
+    print("=" * 60)
+
+    current_dir = os.path.dirname(os.path.abspath(__file__))
+    project_root = os.path.dirname(current_dir)
+    data_path = os.path.join(project_root, "Data", "645_251227.csv")
+
+    weights = {'freq_weight': 30, 'trend_weight': 30, 'absence_weight': 20, 'hotness_weight': 20}
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        runner = JobRunner(cache_dir, spawn=False)
+        params = {'data_path': data_path, 'cache_dir': cache_dir, 'n_test_rounds': 3,
+                  'weights': weights, 'strategy': 'hybrid', 'best_only': False}
+
+        # 1. 같은 작업은 같은 작업 ID 공유
+        job_id = runner.submit('fixed_backtest', params)
+        shared = runner.submit('fixed_backtest', params) == job_id and runner.get(job_id)['status'] == QUEUED
+        print(f"   {'✅' if shared else '❌'} 같은 작업 재제출 시 작업 공유")
+        assert shared
+
+        # 2. 작업 실행 후 결과 = 직접 실행 결과
+        assert runner.run_pending() == 1
+        job = runner.get(job_id)
+        backtester = BacktestingSystem(data_path, cache_dir=cache_dir)
+        rounds = backtester.get_trainable_rounds(min_train_rounds=50)[-3:]
+        expected = json.loads(json.dumps(backtester.backtest_fixed_mode(rounds[0], rounds[-1], weights, 'hybrid')))
+        same = job['status'] == DONE and job['progress'] == 1.0 and job['result'] == expected
+        print(f"   {'✅' if same else '❌'} 작업 결과와 직접 실행 결과 일치 ({rounds[0]}회 ~ {rounds[-1]}회)")
+        assert same
+
+        # 3. 실패한 작업은 오류를 기록하고, 다시 제출하면 대기열로 복귀
+        bad_id = runner.submit('fixed_backtest', dict(params, strategy='unknown', weights={}))
+        runner.run_pending()
+        failed = runner.get(bad_id)
+        requeued = runner.get(runner.submit('fixed_backtest', dict(params, strategy='unknown', weights={})))
+        ok = failed['status'] == FAILED and failed['error'] and requeued['status'] == QUEUED
+        print(f"   {'✅' if ok else '❌'} 실패 작업 오류 기록 및 재제출")
+        assert ok
+
+        # 4. 가중치 최적화 작업: WeightOptimizer.optimize로 실행, 시도별 중간 결과 기록
+        opt_id = runner.submit('optimize', {'data_path': data_path, 'cache_dir': cache_dir, 'match_threshold': 3,
+                                            'min_train_rounds': 50, 'n_test_rounds': 3, 'n_trials': 3,
+                                            'refine': False, 'n_jobs': 1})
+        runner.run_pending()
+        job = runner.get(opt_id)
+        saved = json.load(open(os.path.join(cache_dir, "optimal_weights_score_3plus.json"), encoding='utf-8'))
+        ok = (job['status'] == DONE and job['partial']['trial'] == 3 and len(job['result']['logs']) == 3
+              and job['result']['best_weights'] == saved['weights'] and len(saved['optimization_history']) == 3
+              and job['result']['best_score'] == max(h['score'] for h in saved['optimization_history']))
+        print(f"   {'✅' if ok else '❌'} 가중치 최적화 작업 (최고 {job['result']['best_score']:.2f}%)")
+        assert ok
+
+
+if __name__ == "__main__":
+    test_job_runner()
@@ -0,0 +1,92 @@
+import sys
+import os
+import random
+
+# 프로젝트 루트 경로 추가
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from data_loader import LottoDataLoader
+from match_evaluation import evaluate_predictions, evaluate_paired, prize_returns
+from my_number_analysis import MyNumberAnalyzer
+
+
+def reference_rank(prediction, draw, bonus):
+    """집합 교집합 + 등수 판별 (기존 방식, 비교 기준)"""
+    match_cnt = len(set(prediction) & set(draw))
+    is_bonus = bonus in prediction
+
+    rank = 0
+    if match_cnt == 6: rank = 1
+    elif match_cnt == 5 and is_bonus: rank = 2
+    elif match_cnt == 5: rank = 3
+    elif match_cnt == 4: rank = 4
+    elif match_cnt == 3: rank = 5
+    return match_cnt, rank
+
+
+def test_match_evaluation():
+    print("🧪 비트마스크 당첨 확인 커널 일치 테스트")
+    print("=" * 60)
+
+    current_dir = os.path.dirname(os.path.abspath(__file__))
+    project_root = os.path.dirname(current_dir)
+    data_path = os.path.join(project_root, "Data", "645_251227.csv")
+
+    loader = LottoDataLoader(data_path)
+    loader.load_data()
+    loader.preprocess()
+    loader.extract_numbers()
+
+    draws = loader.draws.tolist()
+    bonuses = loader.bonus_numbers.tolist()
+
+    # 임의 조합 + 실제 당첨 조합 (1등), 5개 + 보너스 (2등)
+    rng = random.Random(11)
+    predictions = [rng.sample(range(1, 46), 6) for _ in range(50)]
+    predictions.append(draws[3])
+    predictions.append([n for n in draws[7] if n != draws[7][0]] + [bonuses[7]])
+
+    # 1. 조합 M개 x 전체 회차 N개
+    matches, ranks = evaluate_predictions(predictions, draws, bonuses)
+    mismatches = sum(
+        1 for i, prediction in enumerate(predictions) for j, draw in enumerate(draws)
+        if (matches[i, j], ranks[i, j]) != reference_rank(prediction, draw, bonuses[j])
+    )
+    print(f"   {'✅' if mismatches == 0 else '❌'} {len(predictions)}개 조합 x {len(draws)}회: 불일치 {mismatches}건")
+    assert mismatches == 0
+    assert ranks[-2, 3] == 1 and ranks[-1, 7] == 2
+
+    # 2. 회차별 조합 1개 (고정 모드)
+    paired = predictions
+    paired_matches, paired_ranks = evaluate_paired(paired, draws[:len(paired)], bonuses[:len(paired)])
+    same = [(int(m), int(r)) for m, r in zip(paired_matches, paired_ranks)] == [
+        reference_rank(p, d, b) for p, d, b in zip(paired, draws, bonuses)]
+    print(f"   {'✅' if same else '❌'} 회차별 1:1 비교 일치")
+    assert same
+
+    # 3. 회차별 실제 당첨금 수익 곡선 (등수별 1게임 당첨금, 누적 손익)
+    returns = prize_returns(paired_ranks, loader.prize_amounts[:len(paired)], 1000)
+    expected_prizes = [int(loader.prize_amounts[j, r]) for j, r in enumerate(paired_ranks.tolist())]
+    cumulative, total = [], 0
+    for prize in expected_prizes:
+        total += prize - 1000
+        cumulative.append(total)
+    same_returns = (returns['prize'].tolist() == expected_prizes
+                    and returns['cumulative_profit'].tolist() == cumulative
+                    and int(returns['net_profit']) == total)
+    print(f"   {'✅' if same_returns else '❌'} 실제 당첨금 수익 곡선 일치 (총 당첨금 {int(returns['total_prize']):,}원)")
+    assert same_returns
+    assert (loader.prize_amounts[:, 1:] > 0).all()
+    assert (loader.prize_amounts[:, 1:-1] >= loader.prize_amounts[:, 2:]).all()
+
+    # 4. 내 번호 당첨 이력도 1게임 당첨금 사용 (당첨액이 총액으로 기록된 최근 회차 포함)
+    history = MyNumberAnalyzer(loader, None, None).analyze_history(list(draws[0]))
+    latest = history['history'][0]
+    same_history = (latest['round'] == int(loader.round_numbers[0]) and latest['rank'] == 1
+                    and latest['prize'] == loader.prize_amounts[0, 1])
+    print(f"   {'✅' if same_history else '❌'} 당첨 이력 당첨금 = 1게임 당첨금 ({int(latest['prize']):,}원)")
+    assert same_history
+
+
+if __name__ == "__main__":
+    test_match_evaluation()
@@ -0,0 +1,84 @@
+import sys
+import os
+import shutil
+import tempfile
+import numpy as np
+
+# 프로젝트 루트 경로 추가
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from data_loader import LottoDataLoader
+from prediction_model import LottoPredictionModel
+from feature_engine import score_ratio_matrix
+from incremental_model import walk_forward
+import model_snapshots
+from model_snapshots import ModelSnapshots, get_model_snapshots
+
+
+def load(data_path):
+    loader = LottoDataLoader(data_path, use_snapshot=False)
+    loader.load_data()
+    loader.preprocess()
+    loader.extract_numbers()
+    return loader
+
+
+def test_model_snapshots():
+    print("🧪 회차별 모델 스냅샷 테스트")
+    print("=" * 60)
+
+    current_dir = os.path.dirname(os.path.abspath(__file__))
+    project_root = os.path.dirname(current_dir)
+    source_path = os.path.join(project_root, "Data", "645_251227.csv")
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        data_path = os.path.join(tmp_dir, "645_251227.csv")
+
+        # 최신 1회차를 뺀 CSV로 스냅샷 생성 (CSV는 최신 회차가 위쪽)
+        with open(source_path, 'r', encoding='utf-8-sig') as f:
+            lines = f.readlines()
+        with open(data_path, 'w', encoding='utf-8-sig') as f:
+            f.writelines(lines[:2] + lines[3:])
+
+        model_snapshots._SNAPSHOT_CACHE.clear()
+        previous = get_model_snapshots(load(data_path))
+
+        # 1. 새 회차 추가 후: 저장된 회차 이후만 계산해 덧붙임 (전체 재생성과 같은 결과)
+        shutil.copy(source_path, data_path)
+        loader = load(data_path)
+        snapshots = get_model_snapshots(loader)
+        rebuilt = ModelSnapshots.build(loader)
+
+        extended = (len(snapshots) == len(previous) + 1
+                    and np.array_equal(np.asarray(snapshots.features), rebuilt.features)
+                    and np.array_equal(np.asarray(snapshots.patterns), rebuilt.patterns))
+        print(f"   {'✅' if extended else '❌'} 새 회차 추가: {len(previous)}회 -> {len(snapshots)}회 (전체 재생성과 일치)")
+        assert extended
+
+        # 2. 저장된 스냅샷 로드 (메모리 맵)
+        model_snapshots._SNAPSHOT_CACHE.clear()
+        reloaded = get_model_snapshots(loader)
+        assert isinstance(reloaded.features, np.memmap)
+        assert np.array_equal(np.asarray(reloaded.features), rebuilt.features)
+
+        # 3. 목표 회차 직전 모델의 점수 성분 = 워크포워드 학습 결과 (비트 단위)
+        rounds = list(range(int(loader.round_numbers[-1]), int(loader.round_numbers[0]) + 2, 7))
+        expected = np.array([score_ratio_matrix(state.number_features()) for _, state in walk_forward(loader, rounds)])
+        same_ratios = np.array_equal(reloaded.score_ratios_before(rounds), expected)
+        print(f"   {'✅' if same_ratios else '❌'} {len(rounds)}개 회차 점수 성분이 워크포워드 학습과 일치")
+        assert same_ratios
+
+        # 4. 특정 회차 시점 모델의 순위 = 해당 회차까지 재학습한 모델
+        target_round = 1100
+        model = LottoPredictionModel(loader.slice_until_round(target_round - 1))
+        model.train_all_patterns()
+        ranking = reloaded.rankings_before([target_round], [model.weights], n=10)[0, 0].tolist()
+        print(f"   {'✅' if ranking == model.get_top_numbers(10) else '❌'} {target_round}회 직전 모델 상위 10개 일치")
+        assert ranking == model.get_top_numbers(10)
+
+        summary = reloaded.pattern_summary(target_round - 1)
+        assert np.isclose(summary['sum_mean'], model.patterns['sum']['mean'])
+
+
+if __name__ == "__main__":
+    test_model_snapshots()
@@ -0,0 +1,60 @@
+import sys
+import os
+import random
+
+# 프로젝트 루트 경로 추가
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from data_loader import LottoDataLoader
+from prediction_model import LottoPredictionModel
+from recommendation_system import LottoRecommendationSystem
+
+
+def test_multi_strategy():
+    print("🧪 다중 전략 일괄 실행 테스트")
+    print("=" * 60)
+
+    data_path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "Data", "645_251227.csv")
+    loader = LottoDataLoader(data_path)
+    loader.load_data()
+    loader.preprocess()
+    loader.extract_numbers()
+
+    model = LottoPredictionModel(loader)
+    model.train_all_patterns()
+    recommender = LottoRecommendationSystem(model)
+
+    seed = 1205
+
+    # 1. 전체 전략 일괄 실행 = 전략별 단독 실행 (전역 random 상태를 바꿔도 같은 결과)
+    all_results = recommender.generate_all_strategies(n_per_strategy=3, seed=seed)
+    random.seed(0)
+    standalone = {
+        'hybrid': recommender.generate_hybrid(3, seed=seed),
+        'score': recommender.generate_by_score(3, seed=seed),
+        'probability': recommender.generate_by_probability(3, seed=seed),
+        'pattern': recommender.generate_by_pattern(3, seed=seed),
+        'grid': recommender.generate_grid_based(3, seed=seed),
+        'image': recommender.generate_image_based(3, seed=seed),
+        'consecutive': recommender.generate_with_consecutive(3, seed=seed),
+        'safe': recommender.generate_safe_strategy(3, seed=seed),
+        'random': recommender.generate_random(3, seed=seed),
+    }
+    ok = all_results == standalone
+    print(f"   {'✅' if ok else '❌'} 일괄 실행 = 단독 실행 ({len(all_results)}개 전략)")
+    assert ok
+
+    # 2. 전략 실행 순서와 무관한 결과
+    jobs = recommender._hybrid_jobs(seed)
+    ok = recommender._run_strategies(jobs) == recommender._run_strategies(jobs[::-1])
+    print(f"   {'✅' if ok else '❌'} 실행 순서 무관")
+    assert ok
+
+    # 3. 앙상블 결과는 시드가 같으면 같음
+    ok = recommender.generate_ensemble(5, seed=seed) == recommender.generate_ensemble(5, seed=seed)
+    print(f"   {'✅' if ok else '❌'} 앙상블 고정 시드 재현")
+    assert ok
+
+
+if __name__ == "__main__":
+    test_multi_strategy()
@@ -0,0 +1,80 @@
+import sys
+import os
+import tempfile
+
+# 프로젝트 루트 경로 추가
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from backtesting_system import BacktestingSystem
+
+
+def test_parallel_backtest():
+    print("🧪 병렬 워크포워드 백테스팅 일치 테스트")
+    print("=" * 60)
+
+    current_dir = os.path.dirname(os.path.abspath(__file__))
+    project_root = os.path.dirname(current_dir)
+    data_path = os.path.join(project_root, "Data", "645_251227.csv")
+
+    weights = {'freq_weight': 30, 'trend_weight': 30, 'absence_weight': 20, 'hotness_weight': 20}
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        backtester = BacktestingSystem(data_path, cache_dir=cache_dir)
+        rounds = list(range(1180, 1192))
+
+        # 1. 여러 회차 백테스팅
+        sequential = backtester.backtest_multiple_rounds(rounds, weights, 'hybrid', 5, use_cache=False)
+        progress = []
+        parallel = backtester.backtest_multiple_rounds(rounds, weights, 'hybrid', 5, use_cache=False,
+                                                       n_jobs=2, progress_callback=progress.append)
+
+        same_multiple = sequential == parallel
+        print(f"   {'✅' if same_multiple else '❌'} 여러 회차 ({len(rounds)}회): 순차/병렬 결과 일치 {same_multiple}")
+        assert same_multiple
+        assert progress[-1] == 1.0
+
+        # 2. 고정 모드 수익률 분석
+        sequential = backtester.backtest_fixed_mode(rounds[0], rounds[-1], weights, 'hybrid')
+        parallel = backtester.backtest_fixed_mode(rounds[0], rounds[-1], weights, 'hybrid', n_jobs=2)
+
+        same_fixed = sequential == parallel
+        print(f"   {'✅' if same_fixed else '❌'} 고정 모드: 순차/병렬 결과 일치 {same_fixed}")
+        assert same_fixed
+
+
+def test_weight_trials_population():
+    print("🧪 가중치 후보 회차 단위 일괄 평가 일치 테스트")
+    print("=" * 60)
+
+    current_dir = os.path.dirname(os.path.abspath(__file__))
+    project_root = os.path.dirname(current_dir)
+    data_path = os.path.join(project_root, "Data", "645_251227.csv")
+
+    weights_list = [
+        {'freq_weight': 30, 'trend_weight': 30, 'absence_weight': 20, 'hotness_weight': 20},
+        {'freq_weight': 12.5, 'trend_weight': 44.0, 'absence_weight': 8.2, 'hotness_weight': 31.7},
+        {'freq_weight': 47.1, 'trend_weight': 15.3, 'absence_weight': 36.9, 'hotness_weight': 6.4},
+    ]
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        backtester = BacktestingSystem(data_path, cache_dir=cache_dir)
+        rounds = list(range(1180, 1188))
+
+        # 가중치별 개별 백테스팅 vs 회차별 후보 일괄 평가
+        expected = [backtester.backtest_multiple_rounds(rounds, weights, 'hybrid', 5, use_cache=False)
+                    for weights in weights_list]
+        population = backtester.backtest_weight_trials(weights_list, rounds, 'hybrid', 5, use_cache=False)
+        parallel = backtester.backtest_weight_trials(weights_list, rounds, 'hybrid', 5, n_jobs=2)
+
+        same = population == expected and parallel == expected
+        print(f"   {'✅' if same else '❌'} 후보 {len(weights_list)}개 x {len(rounds)}회: 개별/일괄/병렬 결과 일치")
+        assert same
+
+        # 캐시 저장 후 재사용 (개별 백테스팅과 같은 키)
+        cached = backtester.backtest_multiple_rounds(rounds, weights_list[1], 'hybrid', 5)
+        assert cached == expected[1]
+
+
+if __name__ == "__main__":
+    test_parallel_backtest()
+    test_weight_trials_population()
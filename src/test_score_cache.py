@@ -0,0 +1,96 @@
+import sys
+import os
+import random
+
+import numpy as np
+
+# 프로젝트 루트 경로 추가
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from data_loader import LottoDataLoader
+from prediction_model import LottoPredictionModel
+from recommendation_system import LottoRecommendationSystem
+from score_cache import CombinationScoreCache
+
+
+def test_score_cache():
+    print("🧪 조합 점수 LRU 캐시 테스트")
+    print("=" * 60)
+
+    data_path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "Data", "645_251227.csv")
+    loader = LottoDataLoader(data_path)
+    loader.load_data()
+    loader.preprocess()
+    loader.extract_numbers()
+
+    model = LottoPredictionModel(loader)
+    model.train_all_patterns()
+    recommender = LottoRecommendationSystem(model)
+
+    rng = random.Random(11)
+    combos = [sorted(rng.sample(range(1, 46), 6)) for _ in range(500)]
+
+    # 1. 캐시 점수 = 일괄 점수, 두 번째 조회는 모두 히트 (입력 순서가 달라도 같은 조합)
+    first = recommender._cached_combination_scores(combos)
+    shuffled = [rng.sample(combo, 6) for combo in combos]
+    second = recommender._cached_combination_scores(shuffled)
+    stats = recommender.score_cache.stats()
+    ok = (np.array_equal(first, recommender._calculate_combination_scores(combos))
+          and np.array_equal(first, second) and stats['hits'] == 500 and stats['misses'] == 500)
+    print(f"   {'✅' if ok else '❌'} 캐시 점수 일치 (히트 {stats['hits']}, 미스 {stats['misses']})")
+    assert ok
+
+    # 2. 가중치를 바꾸면 자동으로 비우고 새 점수로 계산
+    model.set_weights({'freq_weight': 10.0, 'trend_weight': 40.0, 'absence_weight': 30.0, 'hotness_weight': 20.0})
+    reweighted = recommender._cached_combination_scores(combos)
+    stats = recommender.score_cache.stats()
+    ok = (np.array_equal(reweighted, recommender._calculate_combination_scores(combos))
+          and not np.array_equal(reweighted, first) and stats['hits'] == 0 and stats['misses'] == 500)
+    print(f"   {'✅' if ok else '❌'} 재학습 시 캐시 무효화")
+    assert ok
+
+    # 3. 캐시 점수 = 스칼라 점수 (번호 순서가 달라도 정렬된 조합으로 계산하므로 비트 단위로 같음)
+    ok = all(recommender._calculate_combination_score(combo) == score
+             for combo, score in zip(shuffled[:100], reweighted[:100].tolist()))
+    print(f"   {'✅' if ok else '❌'} 순서와 무관한 스칼라 점수 = 캐시 점수")
+    assert ok
+
+    # 4. 추천 시스템 자체 가중치(그리드)를 바꿔도 캐시 무효화
+    recommender.grid_weights['middle'] = 2.0
+    regrid = recommender._cached_combination_scores(combos)
+    stats = recommender.score_cache.stats()
+    ok = (np.array_equal(regrid, recommender._calculate_combination_scores(combos))
+          and not np.array_equal(regrid, reweighted) and stats['misses'] == 500)
+    print(f"   {'✅' if ok else '❌'} 그리드 가중치 변경 시 캐시 무효화")
+    assert ok
+
+    # 5. 최대 크기를 넘으면 가장 오래 사용하지 않은 조합부터 제거
+    cache = CombinationScoreCache(maxsize=3)
+    score_func = lambda nums: nums.sum(axis=1).astype(float)
+    small = [[1, 2, 3, 4, 5, 6], [1, 2, 3, 4, 5, 7], [1, 2, 3, 4, 5, 8]]
+    cache.scores(small, 1, score_func)
+    cache.scores([small[0]], 1, score_func)  # 가장 최근 사용으로 이동
+    cache.scores([[1, 2, 3, 4, 5, 9]], 1, score_func)  # small[1] 제거
+    cache.scores([small[0], small[1]], 1, score_func)
+    ok = len(cache) == 3 and cache.hits == 2 and cache.misses == 5
+    print(f"   {'✅' if ok else '❌'} LRU 제거 (히트 {cache.hits}, 미스 {cache.misses})")
+    assert ok
+
+    # 6. 이전 버전 점수를 계산하는 동안 새 버전이 캐시를 비우면 이전 버전 점수는 보관하지 않음
+    cache = CombinationScoreCache()
+    new_scores = lambda nums: -nums.sum(axis=1).astype(float)
+
+    def old_scores(nums):
+        cache.scores([[1, 2, 3, 4, 5, 7]], 2, new_scores)  # 계산 도중 다른 호출이 버전 2로 전환
+        return nums.sum(axis=1).astype(float)
+
+    old = cache.scores(small, 1, old_scores)
+    current = cache.scores(small, 2, new_scores)
+    ok = (old.tolist() == [21.0, 22.0, 23.0] and current.tolist() == [-21.0, -22.0, -23.0]
+          and cache.version == 2 and len(cache) == 3 and cache.hits == 1 and cache.misses == 3)
+    print(f"   {'✅' if ok else '❌'} 버전 전환이 겹쳐도 이전 버전 점수 미보관")
+    assert ok
+
+
+if __name__ == "__main__":
+    test_score_cache()
@@ -0,0 +1,75 @@
+import sys
+import os
+import random
+
+# 프로젝트 루트 경로 추가
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from weight_optimizer import WeightOptimizer, FINE_TUNE_BATCHES
+
+
+class DistanceOptimizer(WeightOptimizer):
+    """백테스팅 대신 목표 가중치와의 거리로 점수를 매기는 최적화기 (탐색 절차만 검증)"""
+
+    def __init__(self, target=None):
+        super().__init__(backtester=None)
+        self.target = target
+        self.batches = []
+
+    def score(self, weights):
+        if self.target is None:
+            return 0.0
+        return 100.0 - sum(abs(weights[key] - value) for key, value in self.target.items())
+
+    def evaluate_weights(self, weights, rounds, n_combinations=10):
+        return self.score(weights)
+
+    def evaluate_many(self, weights_list, rounds, n_combinations=10, n_jobs=1, progress_callback=None):
+        return [self.score(weights) for weights in weights_list]
+
+    def _evaluate_candidates(self, weights_list, rounds, n_combinations=10, n_jobs=1, halving=False,
+                             progress_callback=None):
+        self.batches.append(list(weights_list))
+        return super()._evaluate_candidates(weights_list, rounds, n_combinations, n_jobs, halving,
+                                            progress_callback)
+
+
+def test_weight_optimizer():
+    print("🧪 가중치 최적화 탐색 절차 테스트")
+    print("=" * 60)
+
+    rounds = list(range(1000, 1030))
+    base = {'freq_weight': 30.0, 'trend_weight': 30.0, 'absence_weight': 20.0, 'hotness_weight': 20.0}
+
+    # 1. 모든 점수가 0이어도 최적 가중치는 첫 후보 (None이 아님)
+    random.seed(0)
+    optimizer = DistanceOptimizer()
+    best_weights, best_score = optimizer.random_search(rounds, n_trials=5, halving=True)
+    ok = best_weights == optimizer.batches[0][0] and best_score == 0.0
+    print(f"   {'✅' if ok else '❌'} 점수가 모두 0일 때 첫 후보 유지")
+    assert ok
+
+    # 2. Halving 미세 조정: 시도를 여러 묶음으로 나누고, 묶음마다 최적 가중치 주변에서 다시 탐색
+    random.seed(0)
+    step = 3.0
+    optimizer = DistanceOptimizer(target={'freq_weight': 45.0, 'trend_weight': 15.0,
+                                          'absence_weight': 35.0, 'hotness_weight': 5.0})
+    best_weights, best_score = optimizer.fine_tune_weights(base, rounds, n_trials=20, step=step, halving=True)
+
+    center, center_score = base, optimizer.score(base)
+    recentered = True
+    for batch in optimizer.batches:
+        recentered &= all(abs(weights[key] - center[key]) <= step for weights in batch for key in center)
+        for weights in batch:
+            if optimizer.score(weights) > center_score:
+                center, center_score = weights, optimizer.score(weights)
+
+    ok = (len(optimizer.batches) == FINE_TUNE_BATCHES and recentered
+          and best_weights == center and best_score == center_score > optimizer.score(base))
+    print(f"   {'✅' if ok else '❌'} {len(optimizer.batches)}개 묶음, 묶음마다 중심 이동 "
+          f"({optimizer.score(base):.1f} -> {best_score:.1f})")
+    assert ok
+
+
+if __name__ == "__main__":
+    test_weight_optimizer()
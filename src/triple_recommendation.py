@@ -3,8 +3,8 @@
 """
 import numpy as np
 from itertools import combinations
-from collections import Counter
 import math
+from cooccurrence import get_cooccurrence_index
 
 
 class TripleRecommendation:
@@ -56,20 +56,16 @@ class TripleRecommendation:
         print("\n\n2️⃣ 실제 데이터 분석 (과거 603회차)")
         print("-" * 70)
 
-        # 가장 많이 함께 나온 3개 조합 찾기
-        triplet_counter = Counter()
-
-        for numbers in self.winning_numbers:
-            # 각 회차의 6개 번호에서 모든 3개 조합 생성
-            for triplet in combinations(sorted(numbers), 3):
-                triplet_counter[triplet] += 1
+        # 가장 많이 함께 나온 3개 조합 찾기 (데이터 버전별 공유 동시 출현 인덱스)
+        index = get_cooccurrence_index(self.loader)
+        distinct_triplets = index.distinct_triplets()
 
         # TOP 20
-        top_20_triplets = triplet_counter.most_common(20)
+        top_20_triplets = index.most_common_triplets(20)
 
-        print(f"총 분석된 3개 조합 수: {len(triplet_counter):,}개")
+        print(f"총 분석된 3개 조합 수: {distinct_triplets:,}개")
         print(f"최다 출현 3개 조합: {top_20_triplets[0][0]} - {top_20_triplets[0][1]}회 출현")
-        print(f"평균 출현 횟수: {sum(triplet_counter.values()) / len(triplet_counter):.2f}회")
+        print(f"평균 출현 횟수: {int(index.triplet_counts.sum()) / distinct_triplets:.2f}회")
 
         print("\n🏆 가장 많이 함께 나온 3개 번호 조합 TOP 20:")
         for i, (triplet, count) in enumerate(top_20_triplets, 1):
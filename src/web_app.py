@@ -21,14 +21,16 @@ from time_series import TimeSeriesAnalysis
 from pattern_analysis import PatternAnalysis
 from prediction_model import LottoPredictionModel
 from recommendation_system import LottoRecommendationSystem
-from grid_pattern_analysis import GridPatternAnalysis
+from grid_geometry import POSITION_TO_NUMBER
 from image_pattern_analysis import ImagePatternAnalysis
 from core_number_system import CoreNumberSystem
+from analytics_bundle import build_analytics_bundle
 from text_lottery_ticket import create_lottery_ticket_compact, create_lottery_grid_simple
 from data_updater import DataUpdater
 from text_parser import LottoTextParser
 from my_number_analysis import MyNumberAnalyzer
 from history_manager import HistoryManager
+from job_runner import DONE, FAILED, QUEUED
 import socket
 
 
@@ -386,6 +388,59 @@ def load_core_system(_model, _recommender, _file_mtime=None, _version="v1.0"):
     return CoreNumberSystem(_model, _recommender)
 
 
+@st.cache_resource
+def get_job_runner(cache_dir):
+    """백그라운드 작업 실행기 (모든 세션이 같은 작업 테이블 공유)"""
+    from job_runner import JobRunner
+    return JobRunner(cache_dir)
+
+
+@st.cache_data(show_spinner=False, max_entries=4)
+def load_analytics_bundle(data_version, _loader):
+    """분석 페이지 통계 묶음 (데이터 버전마다 한 번만 계산, 모든 세션/재실행이 공유)"""
+    return build_analytics_bundle(_loader)
+
+
+def display_job_progress(runner, job_id, key, partial_renderer=None):
+    """백그라운드 작업 진행 상황 표시
+
+    Args:
+        runner: JobRunner
+        job_id: 작업 ID
+        key: 위젯 키 접두어
+        partial_renderer: 중간 결과 표시 함수 (job['partial'] 인자, 옵션)
+
+    Returns:
+        dict or None: 작업 정보 (완료 여부는 job['status']로 판단)
+    """
+    job = runner.get(job_id)
+    if job is None:
+        st.warning("작업 정보를 찾을 수 없습니다. 다시 실행해주세요.")
+        return None
+
+    if job['status'] == FAILED:
+        st.error("❌ 작업이 실패했습니다. 다시 실행하면 저장된 결과부터 이어서 계산합니다.")
+        with st.expander("오류 상세"):
+            st.code(job['error'] or '')
+        return job
+
+    if job['status'] == DONE:
+        return job
+
+    st.progress(min(max(job['progress'], 0.0), 1.0))
+    if job['status'] == QUEUED:
+        st.info("⏳ 작업 대기 중... (다른 작업이 끝나면 시작됩니다)")
+    else:
+        st.info(job['message'] or "⏳ 작업 실행 중...")
+    if partial_renderer and job['partial']:
+        partial_renderer(job['partial'])
+
+    st.caption(f"작업 ID: {job_id[:12]} · 백그라운드에서 실행 중이며 페이지를 떠나도 계속 진행됩니다. "
+               f"(마지막 갱신: {job['updated_at'][11:19]})")
+    st.button("🔄 진행 상황 새로고침", key=f"refresh_{key}")
+    return job
+
+
 # 사이드바
 def sidebar(loader):
     """사이드바 메뉴"""
@@ -603,19 +658,14 @@ def data_exploration_page(loader):
     inject_custom_css()
     st.title("📊 데이터 탐색")
 
+    bundle = load_analytics_bundle(loader.data_fingerprint(), loader)
+
     tab1, tab2, tab3 = st.tabs(["기본 통계", "시계열 분석", "패턴 분석"])
 
     with tab1:
         st.subheader("📈 번호별 출현 빈도")
 
-        all_numbers = loader.get_all_numbers_flat(include_bonus=False)
-        frequency = Counter(all_numbers)
-
-        freq_df = pd.DataFrame([
-            {'번호': num, '출현횟수': frequency.get(num, 0),
-             '출현율(%)': frequency.get(num, 0) / len(loader.df) * 100}
-            for num in range(1, 46)
-        ])
+        freq_df = bundle['frequency']
 
         # Plotly 차트
         fig = px.bar(freq_df, x='번호', y='출현횟수',
@@ -631,15 +681,7 @@ def data_exploration_page(loader):
         # 구간별 분석
         st.subheader("📊 구간별 분포")
 
-        low = sum(1 for n in all_numbers if 1 <= n <= 15)
-        mid = sum(1 for n in all_numbers if 16 <= n <= 30)
-        high = sum(1 for n in all_numbers if 31 <= n <= 45)
-
-        section_df = pd.DataFrame({
-            '구간': ['저구간(1-15)', '중구간(16-30)', '고구간(31-45)'],
-            '출현횟수': [low, mid, high],
-            '비율(%)': [low/(low+mid+high)*100, mid/(low+mid+high)*100, high/(low+mid+high)*100]
-        })
+        section_df = bundle['sections']
 
         fig = px.pie(section_df, values='출현횟수', names='구간',
                      title='구간별 분포',
@@ -649,14 +691,7 @@ def data_exploration_page(loader):
         # 홀짝 분석
         st.subheader("🔢 홀수/짝수 분포")
 
-        odd = sum(1 for n in all_numbers if n % 2 == 1)
-        even = len(all_numbers) - odd
-
-        odd_even_df = pd.DataFrame({
-            '구분': ['홀수', '짝수'],
-            '출현횟수': [odd, even],
-            '비율(%)': [odd/(odd+even)*100, even/(odd+even)*100]
-        })
+        odd_even_df = bundle['odd_even']
 
         fig = px.pie(odd_even_df, values='출현횟수', names='구분',
                      title='홀수/짝수 분포',
@@ -667,42 +702,20 @@ def data_exploration_page(loader):
         st.subheader("📈 최근 트렌드 분석")
 
         # 최근 50회 핫넘버
-        recent_50_numbers = []
-        for _, row in loader.numbers_df.head(50).iterrows():
-            recent_50_numbers.extend(row['당첨번호'])
-
-        recent_freq = Counter(recent_50_numbers)
-        hot_numbers = recent_freq.most_common(10)
-        cold_numbers = sorted(recent_freq.items(), key=lambda x: x[1])[:10]
-
         col1, col2 = st.columns(2)
 
         with col1:
             st.markdown("##### 🔥 핫넘버 TOP 10 (최근 50회)")
-            hot_df = pd.DataFrame(hot_numbers, columns=['번호', '출현횟수'])
-            hot_df['출현율(%)'] = (hot_df['출현횟수'] / 50 * 100).round(1)
-            st.dataframe(hot_df, use_container_width=True, hide_index=True)
+            st.dataframe(bundle['hot_numbers'], use_container_width=True, hide_index=True)
 
         with col2:
             st.markdown("##### ❄️ 콜드넘버 TOP 10 (최근 50회)")
-            cold_df = pd.DataFrame(cold_numbers, columns=['번호', '출현횟수'])
-            cold_df['출현율(%)'] = (cold_df['출현횟수'] / 50 * 100).round(1)
-            st.dataframe(cold_df, use_container_width=True, hide_index=True)
+            st.dataframe(bundle['cold_numbers'], use_container_width=True, hide_index=True)
 
         # 미출현 기간
         st.subheader("⏱️ 번호별 미출현 기간")
 
-        absence_data = []
-        for num in range(1, 46):
-            for idx, row in loader.numbers_df.iterrows():
-                if num in row['당첨번호']:
-                    absence_data.append({'번호': num, '미출현 기간': idx})
-                    break
-            else:
-                absence_data.append({'번호': num, '미출현 기간': len(loader.numbers_df)})
-
-        absence_df = pd.DataFrame(absence_data)
-        absence_df = absence_df.sort_values('미출현 기간', ascending=False).head(15)
+        absence_df = bundle['absence'].sort_values('미출현 기간', ascending=False).head(15)
 
         fig = px.bar(absence_df, x='번호', y='미출현 기간',
                      title='장기 미출현 번호 TOP 15',
@@ -713,35 +726,7 @@ def data_exploration_page(loader):
     with tab3:
         st.subheader("🔄 연속 번호 패턴")
 
-        consecutive_stats = {'none': 0, 'pair': 0, 'triple': 0, 'quad': 0}
-
-        for _, row in loader.numbers_df.iterrows():
-            nums = sorted(row['당첨번호'])
-            max_consecutive = 0
-            current_consecutive = 1
-
-            for i in range(len(nums)-1):
-                if nums[i+1] == nums[i] + 1:
-                    current_consecutive += 1
-                    max_consecutive = max(max_consecutive, current_consecutive)
-                else:
-                    current_consecutive = 1
-
-            if max_consecutive == 0:
-                consecutive_stats['none'] += 1
-            elif max_consecutive == 2:
-                consecutive_stats['pair'] += 1
-            elif max_consecutive == 3:
-                consecutive_stats['triple'] += 1
-            elif max_consecutive >= 4:
-                consecutive_stats['quad'] += 1
-
-        cons_df = pd.DataFrame({
-            '패턴': ['연속 없음', '연속 2개', '연속 3개', '연속 4개 이상'],
-            '출현횟수': [consecutive_stats['none'], consecutive_stats['pair'],
-                         consecutive_stats['triple'], consecutive_stats['quad']],
-        })
-        cons_df['비율(%)'] = (cons_df['출현횟수'] / len(loader.df) * 100).round(2)
+        cons_df = bundle['consecutive']
 
         fig = px.bar(cons_df, x='패턴', y='출현횟수',
                      title='연속 번호 패턴 분포',
@@ -1141,19 +1126,10 @@ def number_analysis_page(loader, model):
         st.markdown("---")
         st.subheader("📅 최근 출현 이력")
 
-        appearance_history = []
-        for idx, row in loader.numbers_df.iterrows():
-            if selected_number in row['당첨번호']:
-                appearance_history.append({
-                    '회차': row['회차'],
-                    '일자': row['일자'],
-                    '당첨번호': ', '.join(map(str, sorted(row['당첨번호'])))
-                })
-                if len(appearance_history) >= 10:
-                    break
+        bundle = load_analytics_bundle(loader.data_fingerprint(), loader)
+        history_df = bundle['appearance_history'][selected_number]
 
-        if appearance_history:
-            history_df = pd.DataFrame(appearance_history)
+        if not history_df.empty:
             st.dataframe(history_df, use_container_width=True, hide_index=True)
         else:
             st.warning("출현 이력이 없습니다.")
@@ -1162,14 +1138,8 @@ def number_analysis_page(loader, model):
         st.markdown("---")
         st.subheader("🤝 자주 함께 나온 번호 TOP 10")
 
-        companion_counts = Counter()
-        for _, row in loader.numbers_df.iterrows():
-            if selected_number in row['당첨번호']:
-                companions = [n for n in row['당첨번호'] if n != selected_number]
-                companion_counts.update(companions)
-
         companion_df = pd.DataFrame(
-            companion_counts.most_common(10),
+            bundle['companions'][selected_number],
             columns=['번호', '동반 출현 횟수']
         )
         companion_df['동반 출현율(%)'] = (
@@ -1298,13 +1268,13 @@ def grid_pattern_page(loader):
 
     # 분석 실행
     with st.spinner("그리드 패턴 분석 중..."):
-        analyzer = GridPatternAnalysis(loader)
+        bundle = load_analytics_bundle(loader.data_fingerprint(), loader)
 
         # 1. 위치별 빈도 분석
         st.markdown("---")
         st.subheader("🔥 위치별 출현 빈도")
 
-        position_heatmap = analyzer.analyze_position_frequency()
+        position_heatmap = bundle['grid_heatmap']
 
         # 히트맵 이미지 표시
         import matplotlib.pyplot as plt
@@ -1324,7 +1294,7 @@ def grid_pattern_page(loader):
         # 각 셀에 번호 표시
         for row in range(7):
             for col in range(7):
-                number = analyzer.position_to_number.get((row, col))
+                number = POSITION_TO_NUMBER.get((row, col))
                 if number:
                     freq = int(position_heatmap[row, col])
                     ax.text(col + 0.5, row + 0.3, f'#{number}',
@@ -1341,7 +1311,7 @@ def grid_pattern_page(loader):
 
         # 통계
         valid_frequencies = []
-        for pos, num in analyzer.position_to_number.items():
+        for pos, num in POSITION_TO_NUMBER.items():
             r, c = pos
             freq = position_heatmap[r, c]
             valid_frequencies.append((freq, pos, num))
@@ -1363,7 +1333,7 @@ def grid_pattern_page(loader):
         st.markdown("---")
         st.subheader("🗺️ 구역별 분포")
 
-        zone_counts = analyzer.analyze_zone_distribution()
+        zone_counts = bundle['grid_zone_counts']
 
         zone_names = {
             "corner": "모서리 (4칸)",
@@ -1400,14 +1370,11 @@ def grid_pattern_page(loader):
         st.markdown("---")
         st.subheader("📐 기하학적 패턴")
 
-        pattern_stats = analyzer.analyze_geometric_patterns()
-
         col1, col2 = st.columns(2)
 
         with col1:
             st.markdown("##### 대각선 패턴")
-            main_diag_avg = np.mean(pattern_stats["diagonal_main"])
-            anti_diag_avg = np.mean(pattern_stats["diagonal_anti"])
+            main_diag_avg, anti_diag_avg = bundle['grid_diagonal_avg']
 
             diag_data = pd.DataFrame([
                 {"대각선": "주 대각선 (↘)", "평균 출현": f"{main_diag_avg:.2f}개/회차"},
@@ -1420,8 +1387,7 @@ def grid_pattern_page(loader):
 
         with col2:
             st.markdown("##### 같은 줄 패턴")
-            h_total = sum(len(v) for v in pattern_stats["horizontal"].values())
-            v_total = sum(len(v) for v in pattern_stats["vertical"].values())
+            h_total, v_total = bundle['grid_line_totals']
 
             line_data = pd.DataFrame([
                 {"패턴": "같은 가로줄 3개 이상", "발생 횟수": f"{h_total}회", "비율": f"{h_total/len(loader.df)*100:.1f}%"},
@@ -1433,9 +1399,7 @@ def grid_pattern_page(loader):
         st.markdown("---")
         st.subheader("🎯 공간적 군집도")
 
-        clustering_scores = analyzer.analyze_spatial_clustering()
-
-        avg_distances = [s['avg_distance'] for s in clustering_scores]
+        avg_distances = bundle['grid_avg_distances']
 
         col1, col2, col3, col4 = st.columns(4)
         with col1:
@@ -1554,13 +1518,13 @@ def image_pattern_page(loader):
     st.subheader("📊 이미지 패턴 분석")
 
     with st.spinner("이미지 패턴 분석 중..."):
-        analyzer = ImagePatternAnalysis(loader)
+        bundle = load_analytics_bundle(loader.data_fingerprint(), loader)
 
         # 1. 시각적 밀도 분석
         st.markdown("### 🎨 시각적 밀도 분석")
         st.markdown("복권용지 상에서 번호들이 얼마나 밀집되어 있는지 분석")
 
-        density_df = analyzer.analyze_visual_density()
+        density_df = bundle['image_density']
 
         col1, col2, col3, col4 = st.columns(4)
         with col1:
@@ -1617,7 +1581,7 @@ def image_pattern_page(loader):
         Q4 (오른쪽 아래): 25-28, 32-35, 39-42
         """, language="text")
 
-        quadrant_patterns = analyzer.analyze_quadrant_patterns()
+        quadrant_patterns = bundle['image_quadrant_patterns']
 
         # 패턴 빈도 차트
         pattern_data = pd.DataFrame([
@@ -1637,7 +1601,7 @@ def image_pattern_page(loader):
         st.markdown("---")
         st.markdown("### ⚖️ 시각적 균형 분석 (무게중심)")
 
-        balance_df = analyzer.analyze_visual_balance()
+        balance_df = bundle['image_balance']
 
         col1, col2, col3 = st.columns(3)
         with col1:
@@ -1689,7 +1653,7 @@ def image_pattern_page(loader):
         st.markdown("---")
         st.markdown("### 🔄 대칭 패턴 분석")
 
-        symmetry_stats = analyzer.analyze_symmetry_patterns()
+        symmetry_stats = bundle['image_symmetry']
 
         symmetry_df = pd.DataFrame([
             {'패턴': pattern, '출현횟수': count, '비율(%)': count/len(loader.df)*100}
@@ -1737,7 +1701,7 @@ def image_pattern_page(loader):
         )
 
         if len(test_numbers) == 6:
-            score_data = analyzer.calculate_image_score(test_numbers)
+            score_data = ImagePatternAnalysis(loader).calculate_image_score(test_numbers)
 
             col1, col2 = st.columns([1, 2])
 
@@ -2478,8 +2442,7 @@ def display_backtesting_results(loader, match_threshold, cache_dir):
 
 # 고정 모드 백테스팅 UI 함수
 def display_fixed_mode_backtest(loader, cache_dir, project_root):
-    """고정 모드(1게임) 백테스팅 UI"""
-    from backtesting_system import BacktestingSystem
+    """고정 모드(1게임) 백테스팅 UI (백그라운드 작업)"""
     import json
 
     st.markdown("""
@@ -2488,7 +2451,8 @@ def display_fixed_mode_backtest(loader, cache_dir, project_root):
     매주 **단 1게임(1,000원)**을 구매했을 때의 수익률을 시뮬레이션합니다.
     - **가정**: 매주 예측 모델을 재학습하여 1개의 최적 조합 추천
     - **비용**: 회차당 1,000원
-    - **당첨금**: 1등(20억), 2등(5천만), 3등(150만), 4등(5만), 5등(5천) 가정
+    - **당첨금**: 해당 회차의 실제 등수별 1게임 당첨금 적용
+    - **실행**: 백그라운드 작업으로 실행되어 페이지를 이동해도 계속 진행됩니다
     """)
     
     col1, col2 = st.columns(2)
@@ -2510,80 +2474,68 @@ def display_fixed_mode_backtest(loader, cache_dir, project_root):
         )
         best_only = st.checkbox("✨ 최적 조합만 (랜덤 제외)", value=False, key="fixed_best_only")
         
+    runner = get_job_runner(str(cache_dir))
+
     if st.button("🚀 수익률 분석 시작", type="primary", key="start_fixed_backtest"):
-        # 진행 표시
-        progress_bar = st.progress(0)
-        status_text = st.empty()
-        
-        try:
-            status_text.info("시스템 초기화 중...")
-            
-            # 백테스팅 시스템 초기화
-            data_path = os.path.join(project_root, "Data", "645_251227.csv")
-            backtester = BacktestingSystem(data_path, cache_dir=str(cache_dir))
-            
-            # 가중치 로드 (최적 가중치 있으면 사용, 없으면 기본값)
-            weights_file = cache_dir / "optimal_weights_score.json"
-            if weights_file.exists():
-                with open(weights_file, 'r', encoding='utf-8') as f:
-                    weights = json.load(f)['weights']
-                st.success("⚡ 최적화된 가중치를 사용합니다.")
-            else:
-                weights = {
-                    'freq_weight': 30.0, 'trend_weight': 30.0,
-                    'absence_weight': 20.0, 'hotness_weight': 20.0
-                }
-                st.info("ℹ️ 기본 가중치를 사용합니다.")
+        # 가중치 로드 (최적 가중치 있으면 사용, 없으면 기본값)
+        weights_file = cache_dir / "optimal_weights_score.json"
+        if weights_file.exists():
+            with open(weights_file, 'r', encoding='utf-8') as f:
+                weights = json.load(f)['weights']
+            st.success("⚡ 최적화된 가중치를 사용합니다.")
+        else:
+            weights = {
+                'freq_weight': 30.0, 'trend_weight': 30.0,
+                'absence_weight': 20.0, 'hotness_weight': 20.0
+            }
+            st.info("ℹ️ 기본 가중치를 사용합니다.")
+
+        # 백그라운드 작업 제출 (같은 조건의 작업이 있으면 그 결과를 공유)
+        st.session_state.fixed_backtest_job = runner.submit('fixed_backtest', {
+            'data_path': os.path.join(project_root, "Data", "645_251227.csv"),
+            'cache_dir': str(cache_dir),
+            'n_test_rounds': n_test_rounds,
+            'weights': weights,
+            'strategy': strategy,
+            'best_only': best_only,
+        })
 
-            # 회차 범위 설정
-            trainable_rounds = backtester.get_trainable_rounds(min_train_rounds=50)
-            if len(trainable_rounds) > n_test_rounds:
-                test_rounds = trainable_rounds[-n_test_rounds:]
-            else:
-                test_rounds = trainable_rounds
-                
-            start_round = test_rounds[0]
-            end_round = test_rounds[-1]
-            
-            status_text.info(f"백테스팅 진행 중... ({start_round}회 ~ {end_round}회)")
-            
-            # 실행
-            result = backtester.backtest_fixed_mode(
-                start_round, end_round, weights, strategy,
-                progress_callback=lambda p: progress_bar.progress(p),
-                best_only=best_only
-            )
-            
-            status_text.empty()
-            progress_bar.empty()
-            
-            # 결과 표시
-            st.success("✅ 분석 완료!")
-            
-            # 메트릭
-            m1, m2, m3, m4 = st.columns(4)
-            m1.metric("총 투자금", f"{result['total_cost']:,}원")
-            m2.metric("총 당첨금", f"{result['total_prize']:,}원")
-            m3.metric("순수익", f"{result['net_profit']:,}원", 
-                     delta_color="normal" if result['net_profit'] >= 0 else "inverse")
-            m4.metric("수익률 (ROI)", f"{result['roi']:.1f}%")
-            
-            # 누적 수익 차트
-            df_res = pd.DataFrame(result['results'])
-            fig = px.line(df_res, x='round', y='cumulative_profit', 
-                         title='누적 손익 추이', markers=True)
-            fig.add_hline(y=0, line_dash="dash", line_color="red")
-            st.plotly_chart(fig, use_container_width=True)
-            
-            # 상세 내역
-            with st.expander("📄 상세 내역 보기"):
-                st.dataframe(
-                    df_res[['round', 'prediction', 'match_count', 'rank', 'prize', 'profit']],
-                    use_container_width=True
-                )
-                
-        except Exception as e:
-            st.error(f"오류 발생: {str(e)}")
+    job_id = st.session_state.get('fixed_backtest_job')
+    if not job_id:
+        return
+
+    job = display_job_progress(runner, job_id, key="fixed_backtest")
+    if not job or job['status'] != DONE:
+        return
+
+    result = job['result']
+
+    # 결과 표시
+    st.success("✅ 분석 완료!")
+
+    # 메트릭
+    m1, m2, m3, m4 = st.columns(4)
+    m1.metric("총 투자금", f"{result['total_cost']:,}원")
+    m2.metric("총 당첨금", f"{result['total_prize']:,}원")
+    m3.metric("순수익", f"{result['net_profit']:,}원",
+             delta_color="normal" if result['net_profit'] >= 0 else "inverse")
+    m4.metric("수익률 (ROI)", f"{result['roi']:.1f}%")
+
+    # 누적 수익 차트 (회차별 실제 당첨금 기준 수익 곡선)
+    curve = result['curve']
+    fig = px.line(x=curve['round'], y=curve['cumulative_profit'],
+                 labels={'x': 'round', 'y': 'cumulative_profit'},
+                 title='누적 손익 추이', markers=True)
+    fig.add_hline(y=0, line_dash="dash", line_color="red")
+    st.plotly_chart(fig, use_container_width=True)
+
+    # 상세 내역
+    with st.expander("📄 상세 내역 보기"):
+        df_res = pd.DataFrame(result['results'])
+        st.dataframe(
+            df_res[['round', 'prediction', 'match_count', 'rank', 'prize', 'profit']],
+            use_container_width=True
+        )
 
 
 # 백테스팅 결과 페이지
@@ -2720,11 +2672,7 @@ def backtesting_page(loader):
 
 # 가중치 최적화 UI 함수 (재사용)
 def display_optimization_ui(loader, match_threshold, cache_dir, project_root):
-    """가중치 최적화 UI (재사용 가능한 함수)"""
-    import json
-    from backtesting_system import BacktestingSystem
-    from weight_optimizer import WeightOptimizer
-    
+    """가중치 최적화 UI (재사용 가능한 함수, 백그라운드 작업)"""
     if match_threshold == 3:
         st.info("""
         💡 **3개 기준 최적화 프로세스** (5등 당첨 기준):
@@ -2785,118 +2733,58 @@ def display_optimization_ui(loader, match_threshold, cache_dir, project_root):
 
     st.warning(f"⏱️ 예상 소요 시간: 약 {n_trials * n_test_rounds * 3 // 60}분 ~ {n_trials * n_test_rounds * 5 // 60}분")
 
-    if st.button("🚀 백테스팅 시작", type="primary", key=f"start_backtest_{match_threshold}"):
-        try:
-            # 진행 상황 표시 영역
-            status_text = st.empty()
-            progress_bar = st.progress(0)
-            log_area = st.empty()
-
-            status_text.info("⏳ 백테스팅 시스템 초기화 중...")
-            progress_bar.progress(10)
+    runner = get_job_runner(str(cache_dir))
+    job_key = f"optimization_job_{match_threshold}"
 
-            # 백테스팅 시스템 초기화
-            data_path = os.path.join(project_root, "Data", "645_251227.csv")
-            backtester = BacktestingSystem(data_path, cache_dir=str(cache_dir), match_threshold=match_threshold)
-
-            # 학습 회차 범위 결정
-            trainable_rounds = backtester.get_trainable_rounds(min_train_rounds=min_train_rounds)
-
-            # 최근 n_test_rounds 회차만 사용
-            if len(trainable_rounds) > n_test_rounds:
-                train_rounds = trainable_rounds[-n_test_rounds:]
-            else:
-                train_rounds = trainable_rounds
-
-            status_text.info(f"📚 학습 회차: {len(train_rounds)}회 ({train_rounds[0]}회 ~ {train_rounds[-1]}회)")
-            progress_bar.progress(20)
-
-            # 최적화 실행
-            status_text.info(f"🔍 Random Search 시작 ({n_trials}회 시도)...")
-            progress_bar.progress(30)
-
-            optimizer = WeightOptimizer(backtester, strategy='score', match_threshold=match_threshold)
-
-            # Random Search
-            import random
-            best_weights = None
-            best_score = 0.0
-            logs = []
-
-            for trial in range(n_trials):
-                # 무작위 가중치 생성
-                weights = optimizer.random_weights()
-
-                # 평가
-                score = optimizer.evaluate_weights(weights, train_rounds, n_combinations=10)
-
-                # 진행 상황 업데이트
-                progress = 30 + int((trial + 1) / n_trials * 40)
-                progress_bar.progress(progress)
+    if st.button("🚀 백테스팅 시작", type="primary", key=f"start_backtest_{match_threshold}"):
+        # 백그라운드 작업 제출 (같은 조건의 작업이 있으면 그 결과를 공유)
+        st.session_state[job_key] = runner.submit('optimize', {
+            'data_path': os.path.join(project_root, "Data", "645_251227.csv"),
+            'cache_dir': str(cache_dir),
+            'match_threshold': match_threshold,
+            'min_train_rounds': min_train_rounds,
+            'n_test_rounds': n_test_rounds,
+            'n_trials': n_trials,
+            'refine': refine,
+            'halving': True,
+        })
 
-                log_msg = f"[{trial+1}/{n_trials}] 점수: {score:.2f}% (freq={weights['freq_weight']:.1f}, trend={weights['trend_weight']:.1f}, absence={weights['absence_weight']:.1f}, hotness={weights['hotness_weight']:.1f})"
-                logs.append(log_msg)
+    job_id = st.session_state.get(job_key)
+    if not job_id:
+        return
 
-                if score > best_score:
-                    best_score = score
-                    best_weights = weights.copy()
-                    log_msg += " ✨ 신기록!"
-                    logs[-1] = log_msg
+    def show_partial(partial):
+        st.metric("현재 최고 점수", f"{partial['best_score']:.2f}%", help=f"{partial['trial']}/{n_trials} 시도")
+        st.text("\n".join(partial['logs']))
 
-                status_text.info(f"🔍 Random Search: {trial+1}/{n_trials} 시도 (현재 최고: {best_score:.2f}%)")
-                log_area.text("\n".join(logs[-5:]))  # 최근 5개만 표시
+    job = display_job_progress(runner, job_id, key=job_key, partial_renderer=show_partial)
+    if not job or job['status'] != DONE:
+        return
 
-            # 정밀 Grid Search (옵션)
-            if refine:
-                status_text.info(f"🔬 정밀 Grid Search 시작...")
-                progress_bar.progress(70)
+    result = job['result']
+    best_weights = result['best_weights']
+    best_score = result['best_score']
 
-                refined_weights, refined_score = optimizer.grid_search_refined(
-                    best_weights, train_rounds, step=2.0, n_combinations=10
-                )
+    st.success(f"✅ 최적화 완료! {match_threshold}개 이상 일치율: {best_score:.2f}%")
+    first_round, last_round, n_rounds = result['train_rounds']
+    st.caption(f"📚 학습 회차: {n_rounds}회 ({first_round}회 ~ {last_round}회)")
 
-                if refined_score > best_score:
-                    best_weights = refined_weights
-                    best_score = refined_score
-                    logs.append(f"정밀 탐색으로 개선: {best_score:.2f}% ✨")
-                    log_area.text("\n".join(logs[-5:]))
-
-            progress_bar.progress(90)
-
-            # 저장
-            status_text.info("💾 최적 가중치 저장 중...")
-            optimizer.optimization_history = [{
-                'trial': i+1,
-                'weights': optimizer.random_weights() if i < n_trials else best_weights,
-                'score': random.uniform(0, best_score) if i < n_trials-1 else best_score
-            } for i in range(n_trials)]
-            optimizer.save_optimal_weights(best_weights, best_score)
-
-            progress_bar.progress(100)
-            status_text.empty()
-            progress_bar.empty()
-            log_area.empty()
-
-            st.success(f"✅ 최적화 완료! {match_threshold}개 이상 일치율: {best_score:.2f}%")
-            st.balloons()
-
-            # 결과 표시
-            st.subheader("🎯 최적 가중치")
-            col1, col2, col3, col4 = st.columns(4)
-            with col1:
-                st.metric("빈도", f"{best_weights['freq_weight']:.1f}")
-            with col2:
-                st.metric("트렌드", f"{best_weights['trend_weight']:.1f}")
-            with col3:
-                st.metric("부재기간", f"{best_weights['absence_weight']:.1f}")
-            with col4:
-                st.metric("핫넘버", f"{best_weights['hotness_weight']:.1f}")
+    # 결과 표시
+    st.subheader("🎯 최적 가중치")
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        st.metric("빈도", f"{best_weights['freq_weight']:.1f}")
+    with col2:
+        st.metric("트렌드", f"{best_weights['trend_weight']:.1f}")
+    with col3:
+        st.metric("부재기간", f"{best_weights['absence_weight']:.1f}")
+    with col4:
+        st.metric("핫넘버", f"{best_weights['hotness_weight']:.1f}")
 
-            st.info("💡 '📊 백테스팅 결과' 탭에서 상세 결과를 확인하세요.")
+    with st.expander("📄 최근 로그"):
+        st.text("\n".join(result['logs']))
 
-        except Exception as e:
-            st.error(f"❌ 오류 발생: {str(e)}")
-            st.exception(e)
+    st.info("💡 '📊 백테스팅 결과' 탭에서 상세 결과를 확인하세요.")
 
 # 실시간 재학습 UI 함수 (재사용)
 def display_retraining_ui(loader, match_threshold, cache_dir):
@@ -2937,9 +2825,12 @@ def display_retraining_ui(loader, match_threshold, cache_dir):
 
         n_recommendations = st.slider("추천 개수", min_value=1, max_value=10, value=5, key=f"n_recommendations_{match_threshold}")
 
+        runner = get_job_runner(str(cache_dir))
+        job_key = f"retrain_job_{match_threshold}"
+
         if st.button("🔄 재학습 & 추천 생성", type="primary", key=f"retrain_{match_threshold}"):
             # Phase 1: 스마트 데이터 동기화 및 재학습 프로세스 개선
-            with st.status("🔄 최신 데이터 확인 및 모델 재학습 중...", expanded=True) as status:
+            with st.status("🔄 최신 데이터 확인 중...", expanded=True) as status:
                 
                 # 1. 데이터 동기화
                 status.write("🌐 최신 데이터 확인 중...")
@@ -2972,62 +2863,80 @@ def display_retraining_ui(loader, match_threshold, cache_dir):
                 except Exception as e:
                     status.write(f"⚠️ 데이터 확인 중 오류 발생 (기존 데이터로 진행): {e}")
 
-                # 2. 가중치 미세 조정 (Phase 3)
-                status.write("⚙️ 가중치 미세 조정 중 (Auto Fine-tuning)...")
-                
-                from backtesting_system import BacktestingSystem
-                from weight_optimizer import WeightOptimizer
-                
-                # 데이터 경로 설정
+                # 2. 가중치 미세 조정 (Phase 3, 백그라운드 작업)
+                # 최근 50회차 데이터로 미세 조정 (10회 시도, Successive Halving으로 유망 후보만 전체 평가)
+                status.write("⚙️ 가중치 미세 조정 작업 제출 (Auto Fine-tuning)...")
                 current_dir = os.path.dirname(os.path.abspath(__file__))
                 project_root = os.path.dirname(current_dir)
-                csv_path = os.path.join(project_root, "Data", "645_251227.csv")
-                
-                # 백테스팅 시스템 및 최적화기 초기화
-                backtester = BacktestingSystem(csv_path, cache_dir=str(cache_dir), match_threshold=match_threshold)
-                optimizer = WeightOptimizer(backtester, strategy='score', match_threshold=match_threshold)
-                
-                # 최근 50회차 데이터로 미세 조정 (10회 시도)
-                trainable_rounds = backtester.get_trainable_rounds(min_train_rounds=50)
-                tuning_rounds = trainable_rounds[-50:] if len(trainable_rounds) > 50 else trainable_rounds
-                refined_weights, _ = optimizer.fine_tune_weights(weights, tuning_rounds, n_trials=10)
-
-                # 3. 모델 재학습 (조정된 가중치 사용)
-                status.write("🤖 모델 재학습 중...")
-                model = LottoPredictionModel(loader, weights=refined_weights)
-                model.train_all_patterns()
-
-                # 성능 검증 (Phase 2)
-                status.write("📊 모델 성능 검증 중...")
-                perf = model.evaluate_recent_performance(10)
+                st.session_state[job_key] = runner.submit('fine_tune', {
+                    'data_path': os.path.join(project_root, "Data", "645_251227.csv"),
+                    'cache_dir': str(cache_dir),
+                    'match_threshold': match_threshold,
+                    'weights': weights,
+                    'n_rounds': 50,
+                    'n_trials': 10,
+                })
 
-                # 3. 추천 생성
-                status.write("🎯 번호 추천 생성 중...")
-                recommender = LottoRecommendationSystem(model)
-                recommendations = recommender.generate_by_score(n_recommendations, seed=42)
+                status.update(label="✅ 데이터 확인 완료 - 가중치 미세 조정 시작", state="complete", expanded=False)
+
+        job_id = st.session_state.get(job_key)
+        job = display_job_progress(runner, job_id, key=job_key) if job_id else None
+
+        if job and job['status'] == DONE:
+            refined_weights = job['result']['weights']
+
+            # 재학습/성능 검증/추천 결과는 작업(job_id)과 데이터 버전별로 세션에 보관
+            # (추천 개수 슬라이더 등으로 다시 실행될 때 재학습하지 않음, 추천은 개수별로 한 번만 생성)
+            result_key = f"retrain_result_{match_threshold}"
+            cached = st.session_state.get(result_key)
+            if (cached is None or cached['job_id'] != job_id or cached['weights'] != refined_weights
+                    or cached['fingerprint'] != loader.data_fingerprint()):
+                with st.spinner("🤖 조정된 가중치로 모델 재학습 중..."):
+                    # 3. 모델 재학습 (조정된 가중치 사용)
+                    model = LottoPredictionModel(loader, weights=refined_weights)
+                    model.train_all_patterns()
+
+                    # 성능 검증 (Phase 2)
+                    perf = model.evaluate_recent_performance(10)
+
+                cached = {
+                    'job_id': job_id,
+                    'weights': refined_weights,
+                    'fingerprint': loader.data_fingerprint(),
+                    'recommender': LottoRecommendationSystem(model),
+                    'perf': perf,
+                    'recommendations': {},
+                }
+                st.session_state[result_key] = cached
 
-                status.update(label="✅ 재학습 및 추천 완료!", state="complete", expanded=False)
+            perf = cached['perf']
+            if n_recommendations not in cached['recommendations']:
+                with st.spinner("🤖 추천 생성 중..."):
+                    # 4. 추천 생성
+                    cached['recommendations'][n_recommendations] = cached['recommender'].generate_by_score(
+                        n_recommendations, seed=42)
+            recommendations = cached['recommendations'][n_recommendations]
 
             st.success("✅ 추천 완료!")
-            
+        
             # 모델 성능 검증 대시보드 (Phase 2)
             st.markdown("---")
             st.subheader("📊 모델 성능 검증 (최근 10회차 적합도)")
             st.caption("현재 모델의 Top 6 번호가 최근 10회차 결과와 얼마나 일치하는지 분석한 결과입니다.")
-            
+        
             m1, m2, m3 = st.columns(3)
             m1.metric("평균 당첨 개수", f"{perf['avg_match']:.1f}개")
             m2.metric("가상 수익률 (ROI)", f"{perf['roi']:.1f}%", 
                      delta_color="normal" if perf['roi'] >= 0 else "inverse")
             m3.metric("총 당첨금 (가상)", f"{perf['total_prize']:,}원")
-            
+        
             # 상세 차트
             perf_df = pd.DataFrame(perf['details'])
-            
+        
             fig = go.Figure()
             fig.add_trace(go.Bar(x=perf_df['round'], y=perf_df['matched'], name='매칭 개수', marker_color='#667eea'))
             fig.add_trace(go.Scatter(x=perf_df['round'], y=perf_df['avg_score'], name='모델 확신도(점수)', yaxis='y2', line=dict(color='#FF6B6B', width=3)))
-            
+        
             fig.update_layout(
                 title='회차별 매칭 개수 및 모델 확신도',
                 yaxis=dict(title='매칭 개수', range=[0, 6.5]),
@@ -2,12 +2,17 @@
 로또 645 가중치 최적화기
 Random Search + 정밀 Grid Search로 최적 가중치 탐색
 """
+import os
 import random
 import json
 from datetime import datetime
 from pathlib import Path
 
 
+# 병렬/Successive Halving 미세 조정의 최소 묶음 수 (묶음마다 현재 최적 가중치로 탐색 중심 이동)
+FINE_TUNE_BATCHES = 4
+
+
 class WeightOptimizer:
     """가중치 최적화기"""
 
@@ -59,13 +64,93 @@ class WeightOptimizer:
         rate_key = f'rate_{self.match_threshold}plus'
         return metrics[rate_key]
 
-    def random_search(self, rounds, n_trials=30, n_combinations=10):
+    def evaluate_many(self, weights_list, rounds, n_combinations=10, n_jobs=1, progress_callback=None):
+        """여러 가중치를 같은 회차들로 평가 (n_jobs > 1이면 프로세스 병렬)
+
+        progress_callback: 진행률 콜백 함수 (0.0 ~ 1.0, 옵션)
+
+        Returns:
+            list: 가중치별 {threshold}개 이상 일치율 (%) (입력 순서)
+        """
+        all_results = self.backtester.backtest_weight_trials(
+            weights_list, rounds, self.strategy, n_combinations,
+            seed=42, use_cache=True, n_jobs=n_jobs, progress_callback=progress_callback
+        )
+
+        rate_key = f'rate_{self.match_threshold}plus'
+        return [self.backtester.calculate_metrics(results)[rate_key] for results in all_results]
+
+    def successive_halving(self, weights_list, rounds, n_combinations=10, n_jobs=1, eta=3, min_rounds=10,
+                           progress_callback=None):
+        """Successive Halving: 적은 회차로 전체 후보를 평가한 뒤 상위 1/eta만 다음 단계로
+
+        단계별 회차는 rounds[::eta^k] (k = 큰 값부터 0까지)로, 앞 단계 회차가 다음 단계에
+        모두 포함되므로 앞 단계 결과는 캐시에서 그대로 재사용된다.
+
+        Args:
+            weights_list: 가중치 후보 리스트
+            rounds: 전체 평가 회차 리스트
+            n_combinations: 추천 조합 개수
+            n_jobs: 병렬 프로세스 수
+            eta: 단계별 축소 비율 (기본 3)
+            min_rounds: 첫 단계 최소 회차 수
+            progress_callback: 진행률 콜백 함수 (0.0 ~ 1.0, 단계별로 균등 분할, 옵션)
+
+        Returns:
+            list: 후보별 (점수, 평가 회차 수) - 회차 수가 len(rounds)인 후보만 전체 평가됨
+        """
+        evaluated = [None] * len(weights_list)
+        alive = list(range(len(weights_list)))
+
+        stride = 1
+        n_stages = 1
+        while len(rounds[::stride * eta]) >= min_rounds:
+            stride *= eta
+            n_stages += 1
+
+        stage = 0
+        while alive:
+            subset = rounds[::stride]
+            callback = None
+            if progress_callback:
+                callback = lambda p, stage=stage: progress_callback((stage + p) / n_stages)
+            scores = self.evaluate_many([weights_list[i] for i in alive], subset, n_combinations, n_jobs, callback)
+            stage += 1
+            for i, score in zip(alive, scores):
+                evaluated[i] = (score, len(subset))
+
+            if stride == 1:
+                break
+
+            n_keep = max(1, -(-len(alive) // eta))
+            print(f"  ⏩ {len(subset)}회 평가: {len(alive)}개 후보 중 상위 {n_keep}개 진출")
+            alive = sorted(alive, key=lambda i: -evaluated[i][0])[:n_keep]
+            stride //= eta
+
+        return evaluated
+
+    def _evaluate_candidates(self, weights_list, rounds, n_combinations=10, n_jobs=1, halving=False,
+                             progress_callback=None):
+        """후보 평가 (병렬 / Successive Halving 선택) -> 후보별 (점수, 평가 회차 수)"""
+        if halving:
+            return self.successive_halving(weights_list, rounds, n_combinations, n_jobs,
+                                           progress_callback=progress_callback)
+        scores = self.evaluate_many(weights_list, rounds, n_combinations, n_jobs, progress_callback)
+        return [(score, len(rounds)) for score in scores]
+
+    def random_search(self, rounds, n_trials=30, n_combinations=10, n_jobs=1, halving=False,
+                      progress_callback=None):
         """Random Search 최적화
 
         Args:
             rounds: 백테스팅할 회차 리스트
             n_trials: 시도 횟수 (기본 30)
             n_combinations: 추천 조합 개수
+            n_jobs: 병렬 프로세스 수 (1: 순차, None/-1: CPU 코어 수)
+            halving: Successive Halving 사용 여부 (유망한 후보만 전체 회차 평가)
+            progress_callback: 진행 콜백 함수 (옵션) - progress_callback(진행률, trial=None)
+                평가 중에는 진행률(0.0 ~ 1.0)만, 평가 후에는 시도마다 trial 정보
+                ({'trial', 'n_trials', 'weights', 'score', 'evaluated', 'best_score', 'best_weights', 'improved'})를 함께 전달
 
         Returns:
             (best_weights, best_score): 최적 가중치 및 점수
@@ -76,8 +161,13 @@ class WeightOptimizer:
         best_weights = None
         best_score = 0.0
 
+        # 후보를 먼저 모두 생성한 뒤 회차별로 한 번에 평가 (병렬/조기 종료 선택)
+        candidates = [self.random_weights() for _ in range(n_trials)]
+        evaluated = self._evaluate_candidates(candidates, rounds, n_combinations, n_jobs, halving,
+                                              progress_callback)
+
         for trial in range(n_trials):
-            weights = self.random_weights()
+            weights = candidates[trial]
 
             print(f"\n[{trial+1}/{n_trials}] 평가 중...")
             print(f"  가중치: freq={weights['freq_weight']:.1f}, "
@@ -85,14 +175,20 @@ class WeightOptimizer:
                   f"absence={weights['absence_weight']:.1f}, "
                   f"hotness={weights['hotness_weight']:.1f}")
 
-            score = self.evaluate_weights(weights, rounds, n_combinations)
+            score, n_evaluated = evaluated[trial]
+            improved = False
 
-            print(f"  → {self.match_threshold}개 이상 일치율: {score:.2f}%")
+            if n_evaluated < len(rounds):
+                print(f"  → 조기 탈락 ({n_evaluated}회 평가): {score:.2f}%")
+            else:
+                print(f"  → {self.match_threshold}개 이상 일치율: {score:.2f}%")
 
-            if score > best_score:
-                best_score = score
-                best_weights = weights.copy()
-                print(f"  ✨ 신기록! {best_score:.2f}%")
+                # 모든 점수가 0이어도 첫 후보를 최적 가중치로 유지
+                if best_weights is None or score > best_score:
+                    improved = True
+                    best_score = score
+                    best_weights = weights.copy()
+                    print(f"  ✨ 신기록! {best_score:.2f}%")
 
             self.optimization_history.append({
                 'trial': trial + 1,
@@ -100,6 +196,13 @@ class WeightOptimizer:
                 'score': score
             })
 
+            if progress_callback:
+                progress_callback(1.0, trial={
+                    'trial': trial + 1, 'n_trials': n_trials, 'weights': weights, 'score': score,
+                    'evaluated': n_evaluated == len(rounds), 'best_score': best_score,
+                    'best_weights': best_weights, 'improved': improved
+                })
+
         print(f"\n" + "="*70)
         print(f"✅ Random Search 완료")
         print(f"최고 점수: {best_score:.2f}%")
@@ -110,14 +213,21 @@ class WeightOptimizer:
 
         return best_weights, best_score
 
-    def grid_search_refined(self, base_weights, rounds, step=2.0, n_combinations=10):
+    def grid_search_refined(self, base_weights, rounds, step=2.0, n_combinations=10, n_jobs=1, halving=False,
+                            progress_callback=None):
         """정밀 Grid Search (기준 가중치 주변 탐색)
 
+        후보는 모두 기준 가중치에서 한 항목씩 조정한 값이므로 서로 독립적이며,
+        병렬로 평가해도 순차 평가와 같은 결과를 선택한다.
+
         Args:
             base_weights: 기준 가중치
             rounds: 백테스팅할 회차 리스트
             step: 탐색 간격 (기본 2.0)
             n_combinations: 추천 조합 개수
+            n_jobs: 병렬 프로세스 수 (1: 순차, None/-1: CPU 코어 수)
+            halving: Successive Halving 사용 여부
+            progress_callback: 진행률 콜백 함수 (0.0 ~ 1.0, 옵션)
 
         Returns:
             (best_weights, best_score): 최적 가중치 및 점수
@@ -130,10 +240,9 @@ class WeightOptimizer:
 
         print(f"기준 점수: {best_score:.2f}%\n")
 
-        # 각 가중치를 개별적으로 조정
+        # 각 가중치를 개별적으로 조정한 후보 목록
+        candidates = []
         for key in base_weights.keys():
-            print(f"\n{key} 최적화...")
-
             for delta in [-step*2, -step, step, step*2]:
                 test_weights = base_weights.copy()
                 test_weights[key] += delta
@@ -143,15 +252,31 @@ class WeightOptimizer:
                 if not (min_val <= test_weights[key] <= max_val):
                     continue
 
-                score = self.evaluate_weights(test_weights, rounds, n_combinations)
-                print(f"  {key}={test_weights[key]:.1f}: {score:.2f}%", end="")
+                candidates.append((key, test_weights))
 
-                if score > best_score:
-                    best_score = score
-                    best_weights = test_weights.copy()
-                    print(f"  ✨ 개선!")
-                else:
-                    print()
+        evaluated = self._evaluate_candidates([w for _, w in candidates], rounds, n_combinations, n_jobs, halving,
+                                              progress_callback)
+
+        current_key = None
+        for i, (key, test_weights) in enumerate(candidates):
+            if key != current_key:
+                print(f"\n{key} 최적화...")
+                current_key = key
+
+            score, n_evaluated = evaluated[i]
+
+            if n_evaluated < len(rounds):
+                print(f"  {key}={test_weights[key]:.1f}: {score:.2f}% (조기 탈락, {n_evaluated}회 평가)")
+                continue
+
+            print(f"  {key}={test_weights[key]:.1f}: {score:.2f}%", end="")
+
+            if score > best_score:
+                best_score = score
+                best_weights = test_weights.copy()
+                print(f"  ✨ 개선!")
+            else:
+                print()
 
         print(f"\n" + "="*70)
         print(f"✅ 정밀 탐색 완료")
@@ -163,17 +288,23 @@ class WeightOptimizer:
 
         return best_weights, best_score
 
-    def fine_tune_weights(self, base_weights, rounds, n_trials=20, n_combinations=10, step=3.0):
+    def fine_tune_weights(self, base_weights, rounds, n_trials=20, n_combinations=10, step=3.0,
+                          n_jobs=1, halving=False):
         """가중치 미세 조정 (Fine-tuning) - Phase 3
 
-        기존 가중치 주변을 무작위로 탐색하여 최적값 보정
-        
+        기존 가중치 주변을 무작위로 탐색하여 최적값 보정.
+        병렬/Successive Halving 모드에서는 현재 최적 가중치 주변 후보를 묶음으로 만들어
+        한 번에 평가하고, 묶음이 끝날 때마다 최적 가중치를 중심으로 다음 묶음을 만든다
+        (묶음 크기: 시도 횟수 / FINE_TUNE_BATCHES, 병렬이면 프로세스 수 이하).
+
         Args:
             base_weights: 기준 가중치
             rounds: 백테스팅할 회차 리스트
             n_trials: 시도 횟수 (기본 20)
             n_combinations: 추천 조합 개수
             step: 변동 범위 (±step)
+            n_jobs: 병렬 프로세스 수 (1: 순차, None/-1: CPU 코어 수)
+            halving: Successive Halving 사용 여부
 
         Returns:
             (best_weights, best_score): 최적 가중치 및 점수
@@ -185,29 +316,50 @@ class WeightOptimizer:
         best_score = self.evaluate_weights(base_weights, rounds, n_combinations)
         
         print(f"기준 점수: {best_score:.2f}%")
-        
-        for i in range(n_trials):
-            # 현재 최적 가중치 주변에서 무작위 변동
-            test_weights = best_weights.copy()
-            
+
+        def perturb(weights):
             # 모든 가중치를 소폭 조정 (Local Perturbation)
+            test_weights = weights.copy()
             for key in test_weights.keys():
                 delta = random.uniform(-step, step)
                 test_weights[key] += delta
-                
+
                 # 범위 체크
                 min_val, max_val = self.weight_ranges[key]
                 test_weights[key] = max(min_val, min(test_weights[key], max_val))
-            
-            score = self.evaluate_weights(test_weights, rounds, n_combinations)
-            
-            if score > best_score:
-                print(f"[{i+1}/{n_trials}] {score:.2f}% (개선됨!)")
-                best_score = score
-                best_weights = test_weights
-            else:
-                if (i+1) % 5 == 0:
-                    print(f"[{i+1}/{n_trials}] {score:.2f}%")
+            return test_weights
+
+        if n_jobs != 1 or halving:
+            batch_size = max(1, -(-n_trials // FINE_TUNE_BATCHES))
+            if not halving:
+                batch_size = min(batch_size, n_jobs if n_jobs and n_jobs > 0 else (os.cpu_count() or 1))
+            i = 0
+            while i < n_trials:
+                batch = [perturb(best_weights) for _ in range(min(batch_size, n_trials - i))]
+                evaluated = self._evaluate_candidates(batch, rounds, n_combinations, n_jobs, halving)
+
+                for test_weights, (score, n_evaluated) in zip(batch, evaluated):
+                    i += 1
+                    if n_evaluated == len(rounds) and score > best_score:
+                        print(f"[{i}/{n_trials}] {score:.2f}% (개선됨!)")
+                        best_score = score
+                        best_weights = test_weights
+                    elif i % 5 == 0:
+                        print(f"[{i}/{n_trials}] {score:.2f}%")
+        else:
+            for i in range(n_trials):
+                # 현재 최적 가중치 주변에서 무작위 변동
+                test_weights = perturb(best_weights)
+
+                score = self.evaluate_weights(test_weights, rounds, n_combinations)
+
+                if score > best_score:
+                    print(f"[{i+1}/{n_trials}] {score:.2f}% (개선됨!)")
+                    best_score = score
+                    best_weights = test_weights
+                else:
+                    if (i+1) % 5 == 0:
+                        print(f"[{i+1}/{n_trials}] {score:.2f}%")
                     
         print(f"\n" + "="*70)
         print(f"✅ 미세 조정 완료")
@@ -215,7 +367,8 @@ class WeightOptimizer:
         
         return best_weights, best_score
 
-    def optimize(self, rounds, n_random_trials=30, refine=True, n_combinations=10):
+    def optimize(self, rounds, n_random_trials=30, refine=True, n_combinations=10, n_jobs=1, halving=False,
+                 progress_callback=None):
         """전체 최적화 프로세스
 
         Args:
@@ -223,6 +376,10 @@ class WeightOptimizer:
             n_random_trials: Random Search 시도 횟수
             refine: 정밀 Grid Search 수행 여부
             n_combinations: 추천 조합 개수
+            n_jobs: 병렬 프로세스 수 (1: 순차, None/-1: CPU 코어 수)
+            halving: Successive Halving 사용 여부
+            progress_callback: 진행 콜백 함수 (옵션) - progress_callback(진행률, trial=None)
+                Random Search는 전체 진행률의 80% (정밀 탐색 없으면 100%), trial은 random_search 참고
 
         Returns:
             (best_weights, best_score): 최적 가중치 및 점수
@@ -235,15 +392,23 @@ class WeightOptimizer:
         print(f"Random Search: {n_random_trials}회")
         print(f"정밀 탐색: {'Yes' if refine else 'No'}")
 
+        search_share = 0.8 if refine else 1.0
+        search_callback = refine_callback = None
+        if progress_callback:
+            search_callback = lambda p, trial=None: progress_callback(p * search_share, trial=trial)
+            refine_callback = lambda p: progress_callback(search_share + p * (1 - search_share))
+
         # 1단계: Random Search
         best_weights, best_score = self.random_search(
-            rounds, n_random_trials, n_combinations
+            rounds, n_random_trials, n_combinations, n_jobs=n_jobs, halving=halving,
+            progress_callback=search_callback
         )
 
         # 2단계: 정밀 Grid Search (옵션)
         if refine:
             best_weights, best_score = self.grid_search_refined(
-                best_weights, rounds, step=2.0, n_combinations=n_combinations
+                best_weights, rounds, step=2.0, n_combinations=n_combinations, n_jobs=n_jobs, halving=halving,
+                progress_callback=refine_callback
             )
 
         # 저장